@@ -0,0 +1,86 @@
+"""Configurable checksum algorithm for /predict response checksums.
+
+SHA-256 is the default. ``blake2b`` (256-bit digest, stdlib) only wins on
+CPUs without SHA instructions; with them OpenSSL's SHA-256 is about twice as
+fast (``python -m benchmarks.bench_checksum``). ``blake3`` and ``xxh3``
+(128-bit, not cryptographic) are used when the ``blake3`` or ``xxhash``
+package is installed. Audit records name the algorithm next to the digest,
+so verification tools pick the matching one.
+
+Artifact checksums stay SHA-256: ``CHECKSUMS.json`` is written in that
+algorithm and ``artifact_checksum_sha256`` is part of the API.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+from typing import Any, Callable
+
+from app.config import RESPONSE_CHECKSUM_ALG
+
+try:
+    import blake3
+except ImportError:  # pragma: no cover - exercised when blake3 is installed
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - exercised when xxhash is installed
+    xxhash = None
+
+_FACTORIES: dict[str, Callable[[], Any]] = {
+    "sha256": hashlib.sha256,
+    "blake2b": lambda: hashlib.blake2b(digest_size=32),
+}
+if blake3 is not None:
+    _FACTORIES["blake3"] = blake3.blake3
+if xxhash is not None:
+    _FACTORIES["xxh3"] = xxhash.xxh3_128
+
+ALGORITHMS = ("sha256", "blake2b", "blake3", "xxh3")
+
+_algorithm = "sha256"
+
+
+def available() -> list[str]:
+    """Algorithms usable in this environment."""
+    return [name for name in ALGORITHMS if name in _FACTORIES]
+
+
+def set_algorithm(name: str) -> str:
+    """Select the response checksum algorithm; returns it."""
+    global _algorithm
+    if name not in ALGORITHMS:
+        raise ValueError(f"Unknown checksum algorithm {name!r}")
+    if name not in _FACTORIES:
+        raise ValueError(f"Checksum algorithm {name!r} requested but its package is not installed")
+    _algorithm = name
+    return name
+
+
+def algorithm() -> str:
+    return _algorithm
+
+
+def new_hasher(name: str | None = None) -> Any:
+    """A hashlib-style object (``update``/``hexdigest``) for streamed bodies."""
+    return _FACTORIES[name or _algorithm]()
+
+
+def digest(data: bytes, name: str | None = None) -> str:
+    """Hex digest of ``data``."""
+    hasher = new_hasher(name)
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def digest_chunks(chunks: Iterable[bytes], name: str | None = None) -> str:
+    """Hex digest of the concatenated chunks, without joining them."""
+    hasher = new_hasher(name)
+    for chunk in chunks:
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+set_algorithm(RESPONSE_CHECKSUM_ALG)
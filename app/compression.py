@@ -0,0 +1,153 @@
+"""Response compression negotiated from ``Accept-Encoding``: zstd and gzip.
+
+Only bodies of at least ``COMPRESSION_MIN_BYTES`` are compressed; below that
+the headers and the CPU cost more than the bytes saved. Levels default to
+the fast end (gzip 1, zstd 3): a 50-item /predict body shrinks 8-12x in
+~20 µs (gzip) or ~15 µs (zstd), while gzip 6 takes twice as long for a few
+percent fewer bytes (``python -m benchmarks.bench_compression``). Bodies of
+``COMPRESSION_OFFLOAD_BYTES`` or more are compressed in the thread pool so
+the event loop keeps serving; below that, compressing inline costs less
+than the ~80 µs thread hand-off.
+
+Checksums and audit records are always computed over the uncompressed body
+before it reaches this module.
+"""
+
+from __future__ import annotations
+
+import gzip
+import threading
+import time
+from typing import Any, Callable
+
+import anyio.to_thread
+from fastapi import Request, Response
+
+from app.config import (
+    COMPRESSION_MIN_BYTES,
+    COMPRESSION_OFFLOAD_BYTES,
+    GZIP_LEVEL,
+    RESPONSE_COMPRESSION,
+    ZSTD_LEVEL,
+)
+from app.observability.metrics import response_compression_ratio, response_compression_seconds
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised when zstandard is installed
+    zstandard = None
+
+ENCODINGS = ("zstd", "gzip")
+
+# zstd compressors are not safe to share between threads; one per thread
+_local = threading.local()
+
+
+def _zstd(body: bytes) -> bytes:
+    compressor = getattr(_local, "zstd", None)
+    if compressor is None:
+        compressor = _local.zstd = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return compressor.compress(body)
+
+
+def _gzip(body: bytes) -> bytes:
+    # mtime=0 keeps the output a pure function of the body
+    return gzip.compress(body, GZIP_LEVEL, mtime=0)
+
+
+_COMPRESSORS: dict[str, Callable[[bytes], bytes]] = {"gzip": _gzip}
+if zstandard is not None:
+    _COMPRESSORS["zstd"] = _zstd
+
+_encodings: tuple[str, ...] = ()
+
+
+def available() -> list[str]:
+    """Encodings usable in this environment, in default preference order."""
+    return [name for name in ENCODINGS if name in _COMPRESSORS]
+
+
+def set_encodings(spec: str) -> tuple[str, ...]:
+    """Select the offered encodings ("auto", "off" or a preference list); returns them."""
+    global _encodings
+    if spec == "auto":
+        _encodings = tuple(available())
+        return _encodings
+    names = () if spec == "off" else tuple(name.strip() for name in spec.split(",") if name.strip())
+    for name in names:
+        if name not in ENCODINGS:
+            raise ValueError(f"Unknown response encoding {name!r}")
+        if name not in _COMPRESSORS:
+            raise ValueError(f"Response encoding {name!r} requested but its package is not installed")
+    _encodings = names
+    return _encodings
+
+
+def encodings() -> tuple[str, ...]:
+    return _encodings
+
+
+def negotiate(accept_encoding: str) -> str:
+    """
+    Encoding for an ``Accept-Encoding`` header, or "" for none.
+
+    Takes the offered encoding with the highest q-value (``*`` stands for
+    any encoding not listed); ties go to the server's preference order.
+    """
+    if not _encodings or not accept_encoding:
+        return ""
+    qualities: dict[str, float] = {}
+    for entry in accept_encoding.split(","):
+        name, *params = entry.split(";")
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[name.strip().lower()] = q
+    wildcard = qualities.get("*", 0.0)
+    best, best_q = "", 0.0
+    for name in _encodings:
+        q = qualities.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress ``body`` and record the ratio and time."""
+    start = time.perf_counter()
+    compressed = _COMPRESSORS[encoding](body)
+    response_compression_seconds.labels(encoding=encoding).observe(time.perf_counter() - start)
+    response_compression_ratio.labels(encoding=encoding).observe(len(body) / max(len(compressed), 1))
+    return compressed
+
+
+async def compressed_response(
+    request: Request,
+    body: bytes,
+    *,
+    media_type: str,
+    headers: dict[str, Any] | None = None,
+) -> Response:
+    """A ``Response`` with ``body`` compressed as the client accepts, if it is large enough."""
+    headers = dict(headers or {})
+    if _encodings:
+        vary = headers.get("Vary")
+        headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+    encoding = ""
+    if len(body) >= COMPRESSION_MIN_BYTES:
+        encoding = negotiate(request.headers.get("accept-encoding", ""))
+    if encoding:
+        if len(body) >= COMPRESSION_OFFLOAD_BYTES:
+            body = await anyio.to_thread.run_sync(compress, body, encoding)
+        else:
+            body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+set_encodings(RESPONSE_COMPRESSION)
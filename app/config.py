@@ -16,5 +16,100 @@ AUDIT_LOG_DIR = Path(
 
 AUDIT_LOG_FILE = AUDIT_LOG_DIR / "audit.jsonl"
 
-# Ensure audit log directory exists
-AUDIT_LOG_DIR.mkdir(parents=True, exist_ok=True)
+# With several worker processes, each appends to its own shard
+# (audit.<worker>.jsonl) instead of sharing one file; read the merged,
+# timestamp-ordered view with app.observability.audit.read_audit_records.
+# The worker id is AUDIT_WORKER_ID if set, otherwise the process id.
+AUDIT_SHARDING = os.getenv("AUDIT_SHARDING", "0") == "1"
+AUDIT_WORKER_ID = os.getenv("AUDIT_WORKER_ID", "")
+
+# Synthetic warm-up rounds run on each model version before it serves traffic
+MODEL_WARMUP_ROUNDS = int(os.getenv("MODEL_WARMUP_ROUNDS", "1"))
+
+# Cap on precomputed decision-table entries per model version (0 disables the
+# table and always uses the interpreted scorer)
+DECISION_TABLE_MAX_ENTRIES = int(os.getenv("DECISION_TABLE_MAX_ENTRIES", "65536"))
+
+# Identity hashing: optional HMAC key and size of the per-process hash cache
+IDENTITY_HMAC_SECRET = os.getenv("IDENTITY_HMAC_SECRET", "")
+IDENTITY_HASH_CACHE_SIZE = int(os.getenv("IDENTITY_HASH_CACHE_SIZE", "1024"))
+
+# Secret scan of /predict texts for API keys, tokens and emails: "flag" reports
+# them in guardrails_triggered and scores the text as sent, "redact" replaces
+# them before scoring, "block" rejects the request with a 400, "off" skips it
+SECRET_SCAN_MODE = os.getenv("SECRET_SCAN_MODE", "flag")
+
+# JSON encoder for responses, audit records and logs: auto (orjson if
+# installed), orjson or json. Checksummed bytes are identical either way.
+JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")
+
+# Algorithm of the response checksum in audit records: sha256, blake2b, or
+# blake3 / xxh3 when their packages are installed
+RESPONSE_CHECKSUM_ALG = os.getenv("RESPONSE_CHECKSUM_ALG", "sha256")
+
+# Response compression negotiated from Accept-Encoding: "auto" (zstd when the
+# zstandard package is installed, then gzip), a comma-separated preference
+# list ("gzip", "zstd,gzip") or "off". Bodies under COMPRESSION_MIN_BYTES are
+# sent as is; from COMPRESSION_OFFLOAD_BYTES on they are compressed in the
+# thread pool instead of on the event loop. Levels favour latency over ratio.
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "auto")
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_OFFLOAD_BYTES = int(os.getenv("COMPRESSION_OFFLOAD_BYTES", "65536"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "1"))
+ZSTD_LEVEL = int(os.getenv("ZSTD_LEVEL", "3"))
+
+# Logging runs on a background thread behind a bounded queue (0 = write
+# synchronously). When the queue is full records are dropped ("drop") or the
+# caller waits ("block"). The per-request "Prediction served" line is kept with
+# probability LOG_PREDICTION_SAMPLE_RATE.
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_QUEUE_POLICY = os.getenv("LOG_QUEUE_POLICY", "drop")
+LOG_PREDICTION_SAMPLE_RATE = float(os.getenv("LOG_PREDICTION_SAMPLE_RATE", "1.0"))
+
+# Opt-in capture of redacted /predict traffic for app.tools.replay: the
+# capture file (empty disables) and the fraction of requests recorded
+CAPTURE_FILE = os.getenv("CAPTURE_FILE", "")
+CAPTURE_SAMPLE_RATE = float(os.getenv("CAPTURE_SAMPLE_RATE", "1.0"))
+
+# Share scoring between concurrent identical /predict payloads (single-flight)
+PREDICT_COALESCING = os.getenv("PREDICT_COALESCING", "0") == "1"
+
+# Cross-request micro-batching of scoring: flush after WINDOW_MS or MAX_ITEMS
+PREDICT_BATCHING = os.getenv("PREDICT_BATCHING", "0") == "1"
+PREDICT_BATCH_WINDOW_MS = float(os.getenv("PREDICT_BATCH_WINDOW_MS", "1.0"))
+PREDICT_BATCH_MAX_ITEMS = int(os.getenv("PREDICT_BATCH_MAX_ITEMS", "64"))
+
+# Event-loop monitor: how often it samples loop lag and thread-pool usage
+# (0 disables it), and the stall after which a watchdog thread logs the loop
+# thread's stack (0 = never)
+LOOP_MONITOR_INTERVAL_MS = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100"))
+LOOP_STALL_THRESHOLD_MS = float(os.getenv("LOOP_STALL_THRESHOLD_MS", "0"))
+
+# Load-aware readiness: /readyz answers 503 while any enabled signal is above
+# its limit (0 disables a limit) and only recovers once the signal is back at
+# or below READY_RECOVERY_RATIO of the limit. In-flight requests exclude the
+# probe itself; loop lag is the monitor's moving average; the log queue is the
+# background writer's backlog.
+READY_MAX_IN_FLIGHT = float(os.getenv("READY_MAX_IN_FLIGHT", "0"))
+READY_MAX_LOOP_LAG_MS = float(os.getenv("READY_MAX_LOOP_LAG_MS", "0"))
+READY_MAX_LOG_QUEUE = float(os.getenv("READY_MAX_LOG_QUEUE", "0"))
+READY_RECOVERY_RATIO = float(os.getenv("READY_RECOVERY_RATIO", "0.8"))
+# Report not ready while a model reload compiles and warms up new versions
+READY_UNREADY_WHILE_RELOADING = os.getenv("READY_UNREADY_WHILE_RELOADING", "0") == "1"
+
+# Admin memory diagnostics (/admin/memory/*): off unless enabled, and then
+# only with the X-Admin-Token header matching ADMIN_TOKEN
+ADMIN_DIAGNOSTICS = os.getenv("ADMIN_DIAGNOSTICS", "0") == "1"
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# /predict/ws: audit records are buffered per connection and appended every
+# WS_AUDIT_BATCH_RECORDS records or WS_AUDIT_FLUSH_MS, whichever comes first
+WS_AUDIT_BATCH_RECORDS = int(os.getenv("WS_AUDIT_BATCH_RECORDS", "64"))
+WS_AUDIT_FLUSH_MS = float(os.getenv("WS_AUDIT_FLUSH_MS", "100"))
+
+# Pre-fork launcher (python -m app.serve): worker processes (0 = one per CPU
+# the launcher may run on), whether to pin each worker to one of those CPUs,
+# and how long a coordinated /model/reload waits for every worker
+SERVE_WORKERS = int(os.getenv("SERVE_WORKERS", "0"))
+SERVE_PIN_CPUS = os.getenv("SERVE_PIN_CPUS", "0") == "1"
+SERVE_RELOAD_TIMEOUT_S = float(os.getenv("SERVE_RELOAD_TIMEOUT_S", "30"))
@@ -2,7 +2,56 @@
 
 from __future__ import annotations
 
+import functools
 import hashlib
+import hmac
+from typing import Any
+
+from app.config import IDENTITY_HASH_CACHE_SIZE, IDENTITY_HMAC_SECRET
+from app.observability.metrics import register_lru_cache
+
+
+class IdentityHasher:
+    """
+    Hashes user emails with a bounded LRU cache keyed on the raw header value.
+
+    The cache key is the header exactly as received, so whitespace/case
+    variants occupy separate slots but always map to the same digest. The
+    cache is ``functools.lru_cache``: a hit (~0.2 µs) is cheaper than even
+    plain SHA-256 of a short email (~1.2 µs), and far cheaper than HMAC.
+    """
+
+    def __init__(self, secret: str = "", maxsize: int = 1024) -> None:
+        self._secret = secret.encode("utf-8")
+        self._cached = functools.lru_cache(maxsize=max(maxsize, 0))(self._digest)
+
+    @property
+    def keyed(self) -> bool:
+        return bool(self._secret)
+
+    def _digest(self, email: str) -> str:
+        """Hex digest of the normalized email (HMAC-SHA256 when keyed)."""
+        data = email.strip().lower().encode("utf-8")
+        if self._secret:
+            return hmac.new(self._secret, data, hashlib.sha256).hexdigest()
+        return hashlib.sha256(data).hexdigest()
+
+    def hash(self, email: str) -> str:
+        return self._cached(email)
+
+    def cache_info(self) -> Any:
+        """``functools`` cache statistics: hits, misses, maxsize, currsize."""
+        return self._cached.cache_info()
+
+    def clear(self) -> None:
+        self._cached.cache_clear()
+
+    def __len__(self) -> int:
+        return self._cached.cache_info().currsize
+
+
+_hasher = IdentityHasher(IDENTITY_HMAC_SECRET, IDENTITY_HASH_CACHE_SIZE)
+register_lru_cache("identity_hash_cache", "Email hash lookups", _hasher.cache_info)
 
 
 def hash_email(email: str) -> str:
@@ -11,7 +60,6 @@ def hash_email(email: str) -> str:
 
     - Strips whitespace
     - Lowercases
-    - Returns SHA-256 hex digest
+    - Returns SHA-256 hex digest (HMAC-SHA256 if IDENTITY_HMAC_SECRET is set)
     """
-    normalized = email.strip().lower()
-    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    return _hasher.hash(email)
@@ -0,0 +1,176 @@
+"""Secret scanning of request texts: API keys, bearer tokens and emails."""
+
+from __future__ import annotations
+
+import re
+
+from app.guardrails.redaction import _EMAIL_RE
+from app.observability.metrics import secret_scan_findings_total
+
+# Credential patterns, tried in order at a candidate position. Each one starts
+# with a literal (matched case-insensitively) that locates its candidates.
+SECRET_PATTERNS: dict[str, str] = {
+    "bearer": r"\b(?i:bearer)\s+[A-Za-z0-9._~+/\-]{16,}=*",
+    "aws_access_key": r"AKIA[0-9A-Z]{16}",
+    "github_token": r"gh[pousr]_[A-Za-z0-9]{36}",
+    "slack_token": r"xox[abposr]-[A-Za-z0-9\-]{10,}",
+    "jwt": r"eyJ[A-Za-z0-9_\-]{8,}\.[A-Za-z0-9_\-]{8,}\.[A-Za-z0-9_\-]{8,}",
+    # A whole word starting with a key prefix, up to two short qualifiers
+    # ("sk_live_", "sk-ant-api03-") and a 16+ character body mixing letters
+    # and digits. Ordinary words that merely contain a prefix ("risk_...",
+    # "task_...", "monkey...") or run on in plain words do not match.
+    "token": (
+        r"\b(?i:sk|api[_\-]?key|token|secret)[_\-](?:[A-Za-z0-9]{2,8}[_\-]){0,2}"
+        r"(?=[A-Za-z]*[0-9])(?=[0-9]*[A-Za-z])[A-Za-z0-9]{16,}(?![A-Za-z0-9])"
+    ),
+}
+_LITERALS = ("bearer", "akia", "gh", "xox", "eyj", "sk", "api", "token", "secret")
+
+# Emails are located by their "@": the domain is matched forwards from it and
+# the local part backwards, over the reversed text
+_EMAIL_LOCAL, _, _EMAIL_DOMAIN = _EMAIL_RE.pattern.partition("@")
+_EMAIL_LOCAL_RE = re.compile(_EMAIL_LOCAL)
+_EMAIL_DOMAIN_RE = re.compile(_EMAIL_DOMAIN)
+
+_PLACEHOLDERS = {"email": "[EMAIL_REDACTED]"}
+
+SCAN_MODES = ("flag", "redact", "block", "off")
+
+
+class SecretScanner:
+    """
+    Multi-pattern secret scanner driven by a literal prefilter.
+
+    Every pattern contains a literal ("@" for emails, a prefix such as "sk",
+    "bearer" or "akia" for credentials). The text is case-folded once and
+    searched for the literals with ``str.find``; a text without any is clean
+    and never reaches the regex engine. Otherwise the combined credential
+    regex is only tried at each literal hit and the email halves are matched
+    outwards from each "@", so cost grows with the number of hits rather than
+    with a full regex pass over the text for every pattern. Matches are the
+    same as a left-to-right scan with all patterns in one alternation.
+    """
+
+    def __init__(self) -> None:
+        self._credentials = re.compile(
+            "|".join(f"(?P<{kind}>{pattern})" for kind, pattern in SECRET_PATTERNS.items())
+        )
+        # Whole-text fallback: the same patterns as a single alternation
+        self._full_scan = re.compile(
+            f"{self._credentials.pattern}|(?P<email>{_EMAIL_RE.pattern})"
+        )
+
+    def may_contain_secret(self, text: str) -> bool:
+        """False only if the text holds none of the literals every secret contains."""
+        return "@" in text or _has_literal(text.lower())
+
+    def _credential_matches(self, text: str, folded: str) -> list[tuple[int, int, str]]:
+        hits = sorted({i for literal in _LITERALS for i in _find_all(folded, literal)})
+        found = []
+        end = 0
+        for hit in hits:
+            if hit < end:
+                continue
+            match = self._credentials.match(text, hit)
+            if match:
+                found.append((hit, match.end(), match.lastgroup))
+                end = match.end()
+        return found
+
+    def _email_matches(self, text: str) -> list[tuple[int, int, str]]:
+        # Anchoring both halves at the "@" keeps the work linear; an unanchored
+        # search would retry every start position inside long word runs
+        found = []
+        reversed_text = ""
+        for at in _find_all(text, "@"):
+            domain = _EMAIL_DOMAIN_RE.match(text, at + 1)
+            if not domain:
+                continue  # most stray "@"s end here
+            reversed_text = reversed_text or text[::-1]
+            local = _EMAIL_LOCAL_RE.match(reversed_text, len(text) - at)
+            if local:
+                found.append((at - (local.end() - local.start()), domain.end(), "email"))
+        return found
+
+    def matches(self, text: str) -> list[tuple[int, int, str]]:
+        """(start, end, kind) of every secret in ``text``, non-overlapping, in order."""
+        has_at = "@" in text
+        folded = text.lower()
+        if not has_at and not _has_literal(folded):
+            return []
+        if len(folded) != len(text):
+            # Case folding moved offsets (rare non-ASCII); scan the whole text
+            return [(m.start(), m.end(), m.lastgroup) for m in self._full_scan.finditer(text)]
+
+        # Leftmost match wins; on a tie credentials go first, as in the alternation
+        candidates = self._credential_matches(text, folded)
+        if has_at:
+            candidates = sorted(
+                candidates + self._email_matches(text), key=lambda m: (m[0], m[2] == "email")
+            )
+        found: list[tuple[int, int, str]] = []
+        end = 0
+        for match in candidates:
+            if match[0] >= end:
+                found.append(match)
+                end = match[1]
+        return found
+
+    def findings(self, text: str) -> list[str]:
+        """Kinds of the secrets in ``text``, in order of appearance."""
+        return [kind for _, _, kind in self.matches(text)]
+
+    def redact(self, text: str) -> tuple[str, list[str]]:
+        """``text`` with every secret replaced by a placeholder, and the kinds found."""
+        found = self.matches(text)
+        if not found:
+            return text, []
+        parts = []
+        end = 0
+        for start, stop, kind in found:
+            parts += (text[end:start], _PLACEHOLDERS.get(kind, "[TOKEN_REDACTED]"))
+            end = stop
+        parts.append(text[end:])
+        return "".join(parts), [kind for _, _, kind in found]
+
+
+def _has_literal(folded: str) -> bool:
+    return any(literal in folded for literal in _LITERALS)
+
+
+def _find_all(text: str, literal: str) -> list[int]:
+    positions = []
+    i = text.find(literal)
+    while i != -1:
+        positions.append(i)
+        i = text.find(literal, i + 1)
+    return positions
+
+
+_scanner = SecretScanner()
+
+
+def scan_texts(texts: list[str], mode: str) -> tuple[list[str], bool]:
+    """
+    Apply the secret scan to request texts.
+
+    Returns the texts to score (redacted in "redact" mode, otherwise the
+    same objects, unchanged) and whether any secret was found. "flag" and
+    "block" only report findings; "off" skips scanning.
+    """
+    if mode not in SCAN_MODES:
+        raise ValueError(f"Unknown secret scan mode {mode!r}")
+    if mode == "off":
+        return texts, False
+    found = False
+    out = []
+    for text in texts:
+        if mode == "redact":
+            text, kinds = _scanner.redact(text)
+        else:
+            kinds = _scanner.findings(text)
+        for kind in kinds:
+            secret_scan_findings_total.labels(kind=kind).inc()
+        found = found or bool(kinds)
+        out.append(text)
+    return out, found
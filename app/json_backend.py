@@ -0,0 +1,107 @@
+"""Pluggable JSON encoding: orjson when available, the stdlib otherwise.
+
+Every function here produces exactly the bytes of the encoder it replaces,
+so audit and response checksums do not depend on which backend is active:
+
+- ``dumps_str``: a JSON string literal as pydantic writes it (UTF-8 kept,
+  control characters escaped), used by the /predict response encoder.
+- ``dumps_record``: ``json.dumps(obj, separators=(",", ":"))`` (ASCII-only
+  output), used for audit records. orjson is only trusted when its output is
+  ASCII without DEL and the record holds no floats, whose formatting differs;
+  anything else is re-encoded by the stdlib.
+- ``dumps``: compact UTF-8 bytes for everything whose exact formatting is not
+  checksummed (other response bodies, log lines).
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+from fastapi.responses import JSONResponse
+
+from app.config import JSON_BACKEND
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    orjson = None
+
+_orjson: Any = None
+
+
+def set_backend(name: str) -> str:
+    """Select "orjson", "json" or "auto" (orjson if installed); returns the one in use."""
+    global _orjson
+    if name not in ("auto", "orjson", "json"):
+        raise ValueError(f"Unknown JSON backend {name!r}")
+    if name == "orjson" and orjson is None:
+        raise ValueError("JSON backend 'orjson' requested but orjson is not installed")
+    _orjson = orjson if name != "json" else None
+    return backend()
+
+
+def backend() -> str:
+    return "orjson" if _orjson is not None else "json"
+
+
+def dumps(obj: Any, *, default: Callable[[Any], Any] | None = None) -> bytes:
+    """Compact UTF-8 JSON."""
+    if _orjson is not None:
+        return _orjson.dumps(obj, default=default, option=_orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        obj, default=default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps_str(value: str) -> str:
+    """A JSON string literal, byte-identical to pydantic's."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(value).decode("utf-8")
+        except TypeError:  # lone surrogates; let the stdlib decide
+            pass
+    return json.dumps(value, ensure_ascii=False)
+
+
+_SCALARS = frozenset((str, int, bool, type(None)))
+
+
+def _only_scalars(values: Any) -> bool:
+    """True if no float occurs (containers are checked recursively)."""
+    for value in values:
+        kind = type(value)
+        if kind in _SCALARS:
+            continue
+        if kind is dict:
+            if not _only_scalars(value.values()):
+                return False
+        elif kind is list or kind is tuple:
+            if not _only_scalars(value):
+                return False
+        else:
+            return False
+    return True
+
+
+def dumps_record(record: dict[str, Any]) -> str:
+    """Byte-identical to ``json.dumps(record, separators=(",", ":"))``."""
+    if _orjson is not None and _only_scalars(record.values()):
+        try:
+            encoded = _orjson.dumps(record)
+        except TypeError:  # ints beyond 64 bits, non-str keys, ...
+            pass
+        else:
+            if encoded.isascii() and b"\x7f" not in encoded:
+                return encoded.decode("ascii")
+    return json.dumps(record, separators=(",", ":"))
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered through the active backend."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+set_backend(JSON_BACKEND)
@@ -6,79 +6,134 @@ import logging
 import time
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from typing import Any
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
 
-from app.config import MODEL_ARTIFACTS_DIR
+from app.config import (
+    AUDIT_LOG_DIR,
+    LOOP_MONITOR_INTERVAL_MS,
+    LOOP_STALL_THRESHOLD_MS,
+    MODEL_ARTIFACTS_DIR,
+    MODEL_WARMUP_ROUNDS,
+)
+from app.json_backend import FastJSONResponse
 from app.models.loader import ModelRegistry
-from app.observability.logging import setup_logging
-from app.observability.metrics import http_request_latency_ms, http_requests_total
-from app.routes import health, metrics, model, predict
+from app.observability.logging import setup_logging, shutdown_logging
+from app.observability.loop_monitor import LoopMonitor
+from app.observability.metrics import (
+    http_request_latency_ms,
+    http_requests_in_flight,
+    http_requests_total,
+)
+from app.observability.startup import StartupTimer
+from app.routes import admin, health, metrics, model, predict, predict_ws
 
 logger = logging.getLogger(__name__)
 
 # Global model registry
-registry = ModelRegistry(MODEL_ARTIFACTS_DIR)
+registry = ModelRegistry(
+    MODEL_ARTIFACTS_DIR,
+    warmup_rounds=MODEL_WARMUP_ROUNDS,
+)
+
+loop_monitor = LoopMonitor(
+    interval_s=LOOP_MONITOR_INTERVAL_MS / 1000,
+    stall_threshold_s=LOOP_STALL_THRESHOLD_MS / 1000,
+)
+http_requests_in_flight.set_function(lambda: loop_monitor.in_flight)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Application lifespan: load model on startup."""
+    timer = StartupTimer()
     setup_logging()
+    AUDIT_LOG_DIR.mkdir(parents=True, exist_ok=True)
+    timer.mark("setup")
     logger.info("Starting ML Inference API")
     try:
-        registry.load()
+        # The pre-fork launcher (app.serve) loads the model before forking,
+        # so workers share its pages instead of loading their own copy
+        if not registry.is_loaded:
+            registry.load()
+        timer.mark("model_load")
         logger.info(
             "Model loaded successfully",
-            extra={"model_version": registry.active_version},
+            extra={
+                "model_version": registry.active_version,
+                "startup_phases": timer.phases,
+                "time_to_ready_s": round(timer.ready(), 3),
+            },
         )
     except Exception:
         logger.exception("Failed to load model on startup")
+    if LOOP_MONITOR_INTERVAL_MS > 0:
+        loop_monitor.start()
     yield
     logger.info("Shutting down ML Inference API")
+    await loop_monitor.stop()
+    shutdown_logging()
 
 
 app = FastAPI(
     title="Mock ML Inference API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Wire registry into route modules
 health.set_registry(registry)
+health.set_monitor(loop_monitor)
 model.set_registry(registry)
 predict.set_registry(registry)
+predict_ws.set_registry(registry)
 
 # Register routers
+app.include_router(admin.router)
 app.include_router(health.router)
 app.include_router(model.router)
 app.include_router(predict.router)
+app.include_router(predict_ws.router)
 app.include_router(metrics.router)
 
 
+# Labelled metric children per (route, method, status): labels() costs more
+# than the update itself
+_request_metrics: dict[tuple[str, str, str], tuple[Any, Any]] = {}
+
+
 @app.middleware("http")
 async def metrics_middleware(request: Request, call_next):  # type: ignore[no-untyped-def]
     """Track request latency and count for all routes."""
-    start = time.monotonic()
-    response = await call_next(request)
-    elapsed_ms = (time.monotonic() - start) * 1000
-
-    route = request.url.path
-    method = request.method
-    status = str(response.status_code)
-
-    http_requests_total.labels(route=route, method=method, status=status).inc()
-    http_request_latency_ms.labels(route=route).observe(elapsed_ms)
+    start = time.perf_counter_ns()
+    loop_monitor.in_flight += 1
+    try:
+        response = await call_next(request)
+    finally:
+        loop_monitor.in_flight -= 1
+    elapsed_ms = (time.perf_counter_ns() - start) / 1e6
+
+    key = (request.url.path, request.method, str(response.status_code))
+    children = _request_metrics.get(key)
+    if children is None:
+        route, method, status = key
+        children = _request_metrics[key] = (
+            http_requests_total.labels(route=route, method=method, status=status),
+            http_request_latency_ms.labels(route=route),
+        )
+    children[0].inc()
+    children[1].observe(elapsed_ms)
 
     return response
 
 
 @app.exception_handler(Exception)
-async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def global_exception_handler(request: Request, exc: Exception) -> FastJSONResponse:
     """Consistent JSON error responses."""
     logger.exception("Unhandled exception")
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={
             "error": "internal_server_error",
@@ -0,0 +1,118 @@
+"""Dynamic cross-request micro-batching of scoring work."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+
+from app.models.compiled import CompiledModel
+from app.models.results import ScoredItem, input_features
+from app.models.schemas import InputItem
+from app.observability.metrics import (
+    predict_batch_flushes_total,
+    predict_batch_queue_wait_seconds,
+    predict_batch_size_items,
+)
+
+
+class _Job:
+    __slots__ = ("inputs", "user_hash", "future", "enqueued_at")
+
+    def __init__(
+        self, inputs: list[InputItem], user_hash: str, future: asyncio.Future, enqueued_at: float
+    ) -> None:
+        self.inputs = inputs
+        self.user_hash = user_hash
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+
+class MicroBatcher:
+    """
+    Collect inputs from concurrent requests and score them in one batched call.
+
+    A batch is flushed when it holds ``max_items`` inputs or ``window_ms`` after
+    its first request arrived, whichever comes first. At flush time each
+    request is routed with ``get_model(user_hash)``; requests routed to the
+    same model are scored in one call, and each request gets its model back so
+    its response and audit record name the version that actually scored it.
+    """
+
+    def __init__(
+        self,
+        get_model: Callable[[str], CompiledModel | None],
+        window_ms: float = 1.0,
+        max_items: int = 64,
+    ) -> None:
+        self._get_model = get_model
+        self._window = window_ms / 1000
+        self._max_items = max_items
+        self._jobs: list[_Job] = []
+        self._items = 0
+        self._timer: asyncio.TimerHandle | None = None
+
+    @property
+    def pending_items(self) -> int:
+        return self._items
+
+    async def submit(
+        self, inputs: list[InputItem], user_hash: str = ""
+    ) -> tuple[CompiledModel, list[ScoredItem]]:
+        loop = asyncio.get_running_loop()
+        job = _Job(inputs, user_hash, loop.create_future(), time.monotonic())
+        self._jobs.append(job)
+        self._items += len(inputs)
+        if self._items >= self._max_items:
+            self._flush("size")
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush, "window")
+        return await job.future
+
+    def _flush(self, reason: str) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        jobs, self._jobs, self._items = self._jobs, [], 0
+        jobs = [job for job in jobs if not job.future.done()]
+        if not jobs:
+            return
+
+        now = time.monotonic()
+        for job in jobs:
+            predict_batch_queue_wait_seconds.observe(now - job.enqueued_at)
+        predict_batch_size_items.observe(sum(len(job.inputs) for job in jobs))
+        predict_batch_flushes_total.labels(reason=reason).inc()
+
+        try:
+            # Group by routed model; without a canary there is a single group
+            groups: dict[int, tuple[CompiledModel, list[_Job]]] = {}
+            for job in jobs:
+                model = self._get_model(job.user_hash)
+                if model is None:
+                    raise RuntimeError("Model not loaded")
+                groups.setdefault(id(model), (model, []))[1].append(job)
+
+            for model, group in groups.values():
+                items = [input_features(inp) for job in group for inp in job.inputs]
+                outcomes = model.score_batch(items)
+                if len(outcomes) != len(items):
+                    raise RuntimeError(f"Batch scored {len(outcomes)} of {len(items)} inputs")
+
+                offset = 0
+                for job in group:
+                    scored = [
+                        ScoredItem(inp.id, score, label, codes)
+                        for inp, (score, label, codes) in zip(
+                            job.inputs, outcomes[offset : offset + len(job.inputs)]
+                        )
+                    ]
+                    offset += len(job.inputs)
+                    if not job.future.done():
+                        job.future.set_result((model, scored))
+        except Exception as exc:
+            # Fail every request still waiting; an error escaping this timer
+            # callback would otherwise leave them pending forever
+            for job in jobs:
+                if not job.future.done():
+                    job.future.set_exception(exc)
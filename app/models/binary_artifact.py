@@ -0,0 +1,331 @@
+"""Compact binary model artifact format with memory-mapped loading.
+
+Layout (little-endian, every section 8-byte aligned)::
+
+    header        magic "RTCB", format version, flags, scalar config values
+                  and section sizes
+    metadata      UTF-8 JSON of the artifact's non-rule fields
+    string pool   interned NUL-separated UTF-8 strings; the matcher keywords
+                  come first so keyword i is string i
+    channels      (name_id u32, pad u32, weight f64)
+    price rules   (op u8, pad[3], reason_id u32, threshold f64, add f64)
+    units rules   same layout as price rules
+    text rules    (reason_id u32, kw_start u32, kw_count u32, pad u32, add f64)
+    rule keywords u32 string ids of each text rule's keywords, in rule order
+    matcher       per distinct keyword, a bitmask of the text rules it fires,
+                  stored as ``mask_words`` u64 words
+
+All numbers are stored as float64. The prebuilt matcher deduplicates keywords
+across text rules, so a text is searched for each distinct keyword once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import struct
+from array import array
+from pathlib import Path
+from typing import Any
+
+from app.models.scorer import THRESHOLD_KEYS, rule_conditions
+
+MAGIC = b"RTCB"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHddd9I")
+_CHANNEL = struct.Struct("<IId")
+_NUMERIC_RULE = struct.Struct("<B3xIdd")
+_TEXT_RULE = struct.Struct("<IIIId")
+
+# Numeric rule operators
+OP_NEVER, OP_GTE, OP_GT, OP_LT, OP_LTE, OP_EQ = range(6)
+_OPERATOR_OPS = {">=": OP_GTE, ">": OP_GT, "<": OP_LT, "<=": OP_LTE, "==": OP_EQ}
+_OP_KEYS = {_OPERATOR_OPS[operator]: key for key, operator in THRESHOLD_KEYS.items()}
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def is_binary_artifact(filepath: Path) -> bool:
+    """True if the file starts with the binary artifact magic."""
+    with open(filepath, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+# ── Writer ───────────────────────────────────────────────────────────
+
+
+class _StringPool:
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        if "\0" in value:
+            raise ValueError(f"NUL byte in artifact string {value!r}")
+        return self.ids.setdefault(value, len(self.ids))
+
+    def encode(self) -> bytes:
+        return "\0".join(self.ids).encode("utf-8")
+
+
+def _numeric_rule(rule: dict[str, Any], feature: str) -> tuple[int, float]:
+    """Map a price/units rule of either format to (op, threshold)."""
+    conditions = rule_conditions(rule, feature)
+    if not conditions:
+        return OP_NEVER, 0.0
+    if len(conditions) > 1:
+        raise ValueError(f"{feature} rule {rule.get('reason')!r} has several conditions")
+    operator, threshold = conditions[0]
+    return _OPERATOR_OPS.get(operator, OP_NEVER), float(threshold)
+
+
+def encode_artifact(artifact: dict[str, Any]) -> bytes:
+    """Encode a JSON artifact (old ``config`` or new ``rule_config`` format)."""
+    config = artifact.get("config") or artifact.get("rule_config")
+    if not config:
+        raise ValueError("Artifact has no rule config")
+    thresholds = config.get("risk_thresholds") or config.get("thresholds")
+    meta = {k: v for k, v in artifact.items() if k not in ("config", "rule_config")}
+    meta_bytes = json.dumps(meta, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    strings = _StringPool()
+
+    # Intern keywords first so matcher entry i describes string id i
+    rule_keyword_lists: list[list[str]] = []
+    for rule in config["text_rules"]:
+        if "keyword" in rule:
+            keywords = [rule["keyword"].lower()]
+        else:
+            keywords = [kw.lower() for kw in rule.get("keywords_any", [])]
+        for keyword in keywords:
+            strings.intern(keyword)
+        rule_keyword_lists.append(keywords)
+    n_keywords = len(strings.ids)
+
+    channels = b"".join(
+        _CHANNEL.pack(strings.intern(name), 0, float(weight))
+        for name, weight in config["channel_weights"].items()
+    )
+
+    def numeric_rules(feature: str) -> bytes:
+        out = bytearray()
+        for rule in config[f"{feature}_rules"]:
+            op, threshold = _numeric_rule(rule, feature)
+            add = rule["contribution"] if "condition" in rule else rule["add"]
+            out += _NUMERIC_RULE.pack(op, strings.intern(rule["reason"]), threshold, float(add))
+        return bytes(out)
+
+    price_rules = numeric_rules("price")
+    units_rules = numeric_rules("units")
+
+    text_rules = bytearray()
+    rule_keywords = array("I")
+    masks = [0] * n_keywords
+    for index, (rule, keywords) in enumerate(zip(config["text_rules"], rule_keyword_lists)):
+        if "keyword" in rule:
+            add = rule["contribution"]
+        else:
+            add = rule.get("add", 0.0)
+        text_rules += _TEXT_RULE.pack(
+            strings.intern(rule["reason"]), len(rule_keywords), len(keywords), 0, float(add)
+        )
+        for keyword in keywords:
+            kw_id = strings.ids[keyword]
+            rule_keywords.append(kw_id)
+            masks[kw_id] |= 1 << index
+
+    mask_words = max(1, (len(config["text_rules"]) + 63) // 64)
+    matcher = b"".join(mask.to_bytes(8 * mask_words, "little") for mask in masks)
+
+    pool = strings.encode()
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        0,
+        float(config["base_score"]),
+        float(thresholds["low_risk_max"]),
+        float(thresholds["medium_risk_max"]),
+        len(meta_bytes),
+        len(pool),
+        len(config["channel_weights"]),
+        len(config["price_rules"]),
+        len(config["units_rules"]),
+        len(config["text_rules"]),
+        len(rule_keywords),
+        n_keywords,
+        mask_words,
+    )
+    sections = [
+        header,
+        meta_bytes,
+        pool,
+        channels,
+        price_rules,
+        units_rules,
+        bytes(text_rules),
+        rule_keywords.tobytes(),
+        matcher,
+    ]
+    return b"".join(s + b"\0" * (_align(len(s)) - len(s)) for s in sections)
+
+
+def convert_json_artifact(src: Path, dst: Path) -> str:
+    """Convert a JSON artifact file to the binary format; returns its SHA-256."""
+    with open(src) as f:
+        data = encode_artifact(json.load(f))
+    dst.write_bytes(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+# ── Reader ───────────────────────────────────────────────────────────
+
+
+class BinaryArtifact:
+    """
+    Read-only view over a memory-mapped binary artifact.
+
+    The file is mapped once; the checksum is computed in a single streaming
+    pass over the mapping and tables are decoded straight from it. Decoded
+    tables are ordinary Python objects owned by the caller, so the mapping
+    can be closed once they are built and memory use follows the rule set.
+    """
+
+    def __init__(self, filepath: Path) -> None:
+        self.path = filepath
+        with open(filepath, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.checksum = hashlib.sha256(self._mm).hexdigest()
+        if len(self._mm) < _HEADER.size:
+            raise ValueError(f"Truncated binary artifact {filepath}")
+
+        (
+            magic,
+            version,
+            _flags,
+            self.base_score,
+            self.low_risk_max,
+            self.medium_risk_max,
+            meta_len,
+            pool_len,
+            n_channels,
+            n_price,
+            n_units,
+            n_text,
+            n_rule_keywords,
+            self._n_keywords,
+            self._mask_words,
+        ) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{filepath} is not a binary model artifact")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary artifact version {version}")
+
+        self._sections: dict[str, tuple[int, int]] = {}
+        offset = _align(_HEADER.size)
+        for name, size in (
+            ("metadata", meta_len),
+            ("pool", pool_len),
+            ("channels", n_channels * _CHANNEL.size),
+            ("price_rules", n_price * _NUMERIC_RULE.size),
+            ("units_rules", n_units * _NUMERIC_RULE.size),
+            ("text_rules", n_text * _TEXT_RULE.size),
+            ("rule_keywords", n_rule_keywords * 4),
+            ("matcher", self._n_keywords * self._mask_words * 8),
+        ):
+            self._sections[name] = (offset, size)
+            offset += _align(size)
+        if offset > len(self._mm):
+            raise ValueError(f"Truncated binary artifact {filepath}")
+        self._strings: list[str] | None = None
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> BinaryArtifact:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _section(self, name: str) -> bytes:
+        offset, size = self._sections[name]
+        return self._mm[offset : offset + size]
+
+    def _rows(self, table: str, layout: struct.Struct) -> list[tuple[Any, ...]]:
+        return list(layout.iter_unpack(self._section(table)))
+
+    @property
+    def strings(self) -> list[str]:
+        """The interned string pool, decoded in one pass on first use."""
+        if self._strings is None:
+            self._strings = self._section("pool").decode("utf-8").split("\0")
+        return self._strings
+
+    def metadata(self) -> dict[str, Any]:
+        return json.loads(self._section("metadata"))
+
+    def keyword_matcher(self) -> tuple[tuple[str, ...], tuple[int, ...]]:
+        """Prebuilt matcher: (lowercased keywords, bitmask of text rules each fires)."""
+        raw = self._section("matcher")
+        if self._mask_words == 1:
+            words = array("Q")
+            words.frombytes(raw)
+            masks = tuple(words)
+        else:
+            width = 8 * self._mask_words
+            masks = tuple(
+                int.from_bytes(raw[i : i + width], "little") for i in range(0, len(raw), width)
+            )
+        return tuple(self.strings[: self._n_keywords]), masks
+
+    def _numeric_rules(self, feature: str) -> list[dict[str, Any]]:
+        strings = self.strings
+        rules: list[dict[str, Any]] = []
+        for op, reason_id, threshold, add in self._rows(f"{feature}_rules", _NUMERIC_RULE):
+            rule: dict[str, Any] = {"reason": strings[reason_id]}
+            if op == OP_EQ:
+                # The JSON rule format has no equality key; use a condition
+                value = int(threshold) if feature == "units" else threshold
+                rule.update(condition=f"{feature} == {value!r}", contribution=add)
+            else:
+                if op != OP_NEVER:
+                    rule[f"if_{feature}_{_OP_KEYS[op]}"] = threshold
+                rule["add"] = add
+            rules.append(rule)
+        return rules
+
+    def rule_config(self) -> dict[str, Any]:
+        """Decode the rule tables into the ``rule_config`` JSON format."""
+        strings = self.strings
+        ids = array("I")
+        ids.frombytes(self._section("rule_keywords"))
+        keywords = [strings[i] for i in ids]
+        text_rules = [
+            {
+                "reason": strings[reason_id],
+                "keywords_any": keywords[start : start + count],
+                "add": add,
+            }
+            for reason_id, start, count, _, add in self._rows("text_rules", _TEXT_RULE)
+        ]
+        return {
+            "base_score": self.base_score,
+            "channel_weights": {
+                strings[name_id]: weight
+                for name_id, _, weight in self._rows("channels", _CHANNEL)
+            },
+            "price_rules": self._numeric_rules("price"),
+            "units_rules": self._numeric_rules("units"),
+            "text_rules": text_rules,
+            "thresholds": {
+                "low_risk_max": self.low_risk_max,
+                "medium_risk_max": self.medium_risk_max,
+            },
+        }
+
+    def to_artifact(self) -> dict[str, Any]:
+        """Metadata plus decoded ``rule_config``, shaped like a JSON artifact."""
+        return {**self.metadata(), "rule_config": self.rule_config()}
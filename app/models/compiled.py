@@ -0,0 +1,193 @@
+"""Compiled (validated, ready-to-score) form of a model artifact."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from app.config import DECISION_TABLE_MAX_ENTRIES
+from app.json_backend import dumps
+from app.models.decision_table import DecisionTable, Outcome, build_decision_table
+from app.models.schemas import ModelBlock
+from app.models.scorer import score_input
+
+# (distinct lowercased keywords, bitmask of text rules each keyword fires)
+KeywordMatcher = tuple[tuple[str, ...], tuple[int, ...]]
+
+_REQUIRED_CONFIG_KEYS = (
+    "base_score",
+    "channel_weights",
+    "price_rules",
+    "units_rules",
+    "text_rules",
+)
+
+
+def build_keyword_matcher(text_rules: list[dict[str, Any]]) -> KeywordMatcher:
+    """Map each distinct lowercased keyword to the bitmask of text rules it fires."""
+    masks: dict[str, int] = {}
+    for index, rule in enumerate(text_rules):
+        # Support old format (keyword) and new format (keywords_any)
+        if "keyword" in rule:
+            keywords = [rule["keyword"]]
+        elif "keywords_any" in rule:
+            keywords = rule["keywords_any"]
+        else:
+            continue
+        for keyword in keywords:
+            keyword = keyword.lower()
+            masks[keyword] = masks.get(keyword, 0) | (1 << index)
+    return tuple(masks), tuple(masks.values())
+
+
+def build_reason_vocabulary(config: dict[str, Any]) -> tuple[str, ...]:
+    """
+    Every reason string the scorer can emit for a config, in a stable order.
+
+    Channel reasons only fire for lowercase channel keys with a non-zero
+    weight, and every rule contributes its own reason.
+    """
+    names = [
+        f"channel_{name}"
+        for name, weight in config["channel_weights"].items()
+        if name == name.lower() and weight != 0.0
+    ]
+    for rules in ("price_rules", "units_rules", "text_rules"):
+        names.extend(rule["reason"] for rule in config[rules])
+    return tuple(dict.fromkeys(names))
+
+
+class CompiledModel:
+    """
+    Immutable snapshot of one loaded model version.
+
+    Everything a request needs (version, checksum, rule config) lives on one
+    object, so swapping the registry's reference publishes a new version
+    atomically. Reasons are interned: scoring returns tuples of integer codes
+    into ``reasons``, and strings are only produced when a response is encoded.
+    """
+
+    def __init__(
+        self,
+        *,
+        version: str,
+        checksum: str,
+        artifact_path: str,
+        artifact: dict[str, Any],
+        config: dict[str, Any],
+        keyword_matcher: KeywordMatcher,
+        reasons: tuple[str, ...],
+        decision_table: DecisionTable | None = None,
+    ) -> None:
+        self.version = version
+        self.checksum = checksum
+        self.artifact_path = artifact_path
+        self.artifact = artifact
+        self.config = config
+        self.keyword_matcher = keyword_matcher
+        self.decision_table = decision_table
+        self.reasons = reasons
+        self.reason_codes = {name: code for code, name in enumerate(reasons)}
+        self.model_block_json = ModelBlock(
+            model_version=version, artifact_checksum_sha256=checksum
+        ).model_dump_json()
+        self._all_text_rules = (1 << len(config["text_rules"])) - 1
+        self._reasons_json: dict[tuple[int, ...], str] = {}
+
+    @classmethod
+    def compile(
+        cls,
+        artifact: dict[str, Any],
+        *,
+        version: str,
+        checksum: str,
+        artifact_path: str,
+        keyword_matcher: KeywordMatcher | None = None,
+        decision_table_max_entries: int = DECISION_TABLE_MAX_ENTRIES,
+    ) -> CompiledModel:
+        """
+        Validate an artifact and build its compiled form.
+
+        Binary artifacts pass their prebuilt ``keyword_matcher``; otherwise it
+        is built from the text rules. A decision table is precomputed unless it
+        would exceed ``decision_table_max_entries`` (0 disables it).
+        """
+        # Support both "config" (old format) and "rule_config" (new format)
+        config = artifact.get("config") or artifact.get("rule_config")
+        if not config:
+            raise ValueError(f"Model {version} has no rule config")
+        missing = [key for key in _REQUIRED_CONFIG_KEYS if key not in config]
+        if not (config.get("risk_thresholds") or config.get("thresholds")):
+            missing.append("thresholds")
+        if missing:
+            raise ValueError(f"Model {version} config is missing {', '.join(missing)}")
+        reasons = build_reason_vocabulary(config)
+        reason_codes = {name: code for code, name in enumerate(reasons)}
+        return cls(
+            version=version,
+            checksum=checksum,
+            artifact_path=artifact_path,
+            artifact=artifact,
+            config=config,
+            keyword_matcher=(
+                keyword_matcher
+                if keyword_matcher is not None
+                else build_keyword_matcher(config["text_rules"])
+            ),
+            reasons=reasons,
+            decision_table=build_decision_table(
+                config, decision_table_max_entries, reason_codes.__getitem__
+            ),
+        )
+
+    def text_rule_mask(self, text: str) -> int:
+        """Bitmask of the text rules whose keywords occur in ``text``."""
+        text_lower = text.lower()
+        mask = 0
+        for keyword, rules in zip(*self.keyword_matcher):
+            if rules & ~mask and keyword in text_lower:
+                mask |= rules
+                if mask == self._all_text_rules:
+                    break
+        return mask
+
+    def score_codes(self, text: str, price: float, units: int, channel: str) -> Outcome:
+        """Score a single input. Returns: (score, label, reason codes)"""
+        if self.decision_table is not None:
+            outcome = self.decision_table.lookup(
+                self.text_rule_mask(text), price, units, channel
+            )
+            if outcome is not None:
+                return outcome
+        score, label, reasons = score_input(
+            text=text,
+            price=price,
+            units=units,
+            channel=channel,
+            config=self.config,
+        )
+        reason_codes = self.reason_codes
+        return score, label, tuple([reason_codes[reason] for reason in reasons])
+
+    def score_batch(self, items: list[tuple[str, float, int, str]]) -> list[Outcome]:
+        """Score (text, price, units, channel) items in one call."""
+        score_codes = self.score_codes
+        return [
+            score_codes(text, price, units, channel) for text, price, units, channel in items
+        ]
+
+    def score(
+        self, text: str, price: float, units: int, channel: str
+    ) -> tuple[float, str, list[str]]:
+        """Score a single input. Returns: (score, label, reasons)"""
+        score, label, codes = self.score_codes(text, price, units, channel)
+        names = self.reasons
+        return score, label, [names[code] for code in codes]
+
+    def reasons_json(self, codes: tuple[int, ...]) -> str:
+        """JSON array of the reason strings for ``codes``, cached per distinct tuple."""
+        encoded = self._reasons_json.get(codes)
+        if encoded is None:
+            names = self.reasons
+            encoded = dumps([names[code] for code in codes]).decode("utf-8")
+            self._reasons_json[codes] = encoded
+        return encoded
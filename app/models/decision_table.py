@@ -0,0 +1,194 @@
+"""Precomputed decision table for the piecewise-constant scoring rules.
+
+With first-match-wins, price and units rules only compare the feature against
+a handful of thresholds, so each axis splits into intervals on which the rule
+outcome is constant. Channel is a small categorical and text rules reduce to
+a bitmask of fired rules. ``score_input`` is therefore a pure function of
+(price cell, units cell, channel id, text mask), and the whole output can be
+tabulated once per model version. Reasons are stored as the model's interned
+reason codes, and identical code tuples are shared between entries.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from typing import Any, Callable
+
+from app.models.scorer import (
+    evaluate_price_rules,
+    evaluate_units_rules,
+    finalize_score,
+    rule_thresholds,
+)
+
+Outcome = tuple[float, str, tuple[int, ...]]
+
+
+def _thresholds(rules: list[dict[str, Any]], feature: str) -> list[float]:
+    """Rule thresholds, rejecting values the table cannot order."""
+    thresholds = rule_thresholds(rules, feature)
+    for value in thresholds:
+        if not isinstance(value, (int, float)) or value != value:
+            raise ValueError(f"Unsupported {feature} threshold {value!r}")
+    return thresholds
+
+
+def cell_representatives(thresholds: list[float]) -> list[float | None]:
+    """
+    One value inside each cell of a numeric axis split at sorted ``thresholds``.
+
+    The cells are (-inf, t0), {t0}, (t0, t1), ..., {tn-1}, (tn-1, inf) and a
+    final NaN cell. An open interval holding no float (adjacent thresholds)
+    yields None.
+    """
+    reps: list[float | None] = []
+    for i in range(len(thresholds) + 1):
+        lo = thresholds[i - 1] if i > 0 else -math.inf
+        hi = thresholds[i] if i < len(thresholds) else math.inf
+        # Smallest float strictly above lo, if it is still below hi
+        rep = -math.inf if i == 0 else math.nextafter(float(lo), math.inf)
+        if float(lo) > lo:
+            rep = float(lo)
+        reps.append(rep if lo < rep < hi or (i == 0 and rep < hi) else None)
+        if i < len(thresholds):
+            reps.append(thresholds[i])
+    reps.append(math.nan)
+    return reps
+
+
+class _Axis:
+    """
+    Cells of one numeric axis (see ``cell_representatives``) and the rule
+    outcome on each. A cell with no representative maps to None and is scored
+    by the interpreter.
+    """
+
+    def __init__(
+        self,
+        rules: list[dict[str, Any]],
+        feature: str,
+        evaluate: Callable[[Any, list[dict[str, Any]]], tuple[float, list[str]]],
+    ) -> None:
+        self.thresholds = _thresholds(rules, feature)
+        outcome_ids: dict[tuple[str, tuple[str, ...]], int] = {}
+        self.outcomes: list[tuple[float, tuple[str, ...]]] = []
+        self.cells: list[int | None] = []
+        for rep in cell_representatives(self.thresholds):
+            if rep is None:
+                self.cells.append(None)
+                continue
+            contribution, reasons = evaluate(rep, rules)
+            key = (float(contribution).hex(), tuple(reasons))
+            if key not in outcome_ids:
+                outcome_ids[key] = len(self.outcomes)
+                self.outcomes.append((contribution, tuple(reasons)))
+            self.cells.append(outcome_ids[key])
+
+    def cell(self, x: float) -> int | None:
+        if x != x:
+            return self.cells[-1]
+        ts = self.thresholds
+        i = bisect_left(ts, x)
+        if i < len(ts) and ts[i] == x:
+            return self.cells[2 * i + 1]
+        return self.cells[2 * i]
+
+
+class DecisionTable:
+    """(score, label, reasons) for every (price, units, channel, text mask) cell."""
+
+    def __init__(
+        self, config: dict[str, Any], max_entries: int, intern: Callable[[str], int]
+    ) -> None:
+        text_rules = config["text_rules"]
+        self.price = _Axis(config["price_rules"], "price", evaluate_price_rules)
+        self.units = _Axis(config["units_rules"], "units", evaluate_units_rules)
+
+        # Only lowercase keys can match, since the scorer lowercases the channel
+        channels = [
+            (name, weight)
+            for name, weight in config["channel_weights"].items()
+            if name == name.lower()
+        ]
+        self.channel_ids = {name: i for i, (name, _) in enumerate(channels)}
+        self.unknown_channel = len(channels)
+        channel_outcomes = [
+            (weight, (f"channel_{name}",) if weight != 0.0 else ()) for name, weight in channels
+        ]
+        channel_outcomes.append((0.0, ()))
+
+        n_masks = 1 << len(text_rules)
+        self.size = len(self.price.outcomes) * len(self.units.outcomes) * len(channel_outcomes)
+        if len(text_rules) > 30 or self.size * n_masks > max_entries:
+            raise ValueError("Decision table exceeds the size cap")
+        self.size *= n_masks
+
+        text_outcomes = []
+        for mask in range(n_masks):
+            contribution = 0.0
+            reasons: list[str] = []
+            for index, rule in enumerate(text_rules):
+                if not mask >> index & 1:
+                    continue
+                # Rules without keywords never fire, so their masks are unreachable
+                if "keyword" in rule:
+                    contribution += rule["contribution"]
+                elif "keywords_any" in rule:
+                    contribution += rule["add"]
+                else:
+                    continue
+                reasons.append(rule["reason"])
+            text_outcomes.append((contribution, tuple(reasons)))
+
+        base_score = config["base_score"]
+        thresholds = config.get("risk_thresholds") or config.get("thresholds")
+        self._strides = (
+            len(self.units.outcomes) * len(channel_outcomes) * n_masks,
+            len(channel_outcomes) * n_masks,
+            n_masks,
+        )
+        self.entries: list[Outcome] = []
+        shared_codes: dict[tuple[int, ...], tuple[int, ...]] = {}
+        for price_contrib, price_reasons in self.price.outcomes:
+            for units_contrib, units_reasons in self.units.outcomes:
+                for channel_contrib, channel_reasons in channel_outcomes:
+                    for text_contrib, text_reasons in text_outcomes:
+                        # Same operand order as score_input, so the sums are bit-identical
+                        score = (
+                            base_score
+                            + channel_contrib
+                            + price_contrib
+                            + units_contrib
+                            + text_contrib
+                        )
+                        score, label = finalize_score(score, thresholds)
+                        codes = tuple(
+                            map(
+                                intern,
+                                channel_reasons + price_reasons + units_reasons + text_reasons,
+                            )
+                        )
+                        self.entries.append((score, label, shared_codes.setdefault(codes, codes)))
+
+    def lookup(self, text_mask: int, price: float, units: int, channel: str) -> Outcome | None:
+        """Return the tabulated outcome, or None if a cell must be interpreted."""
+        p = self.price.cell(price)
+        u = self.units.cell(units)
+        if p is None or u is None:
+            return None
+        c = self.channel_ids.get(channel.lower(), self.unknown_channel)
+        price_stride, units_stride, channel_stride = self._strides
+        return self.entries[p * price_stride + u * units_stride + c * channel_stride + text_mask]
+
+
+def build_decision_table(
+    config: dict[str, Any], max_entries: int, intern: Callable[[str], int]
+) -> DecisionTable | None:
+    """Build the table, or return None if it is too large or the rules are not tabulable."""
+    if max_entries <= 0:
+        return None
+    try:
+        return DecisionTable(config, max_entries, intern)
+    except Exception:
+        return None
@@ -5,9 +5,15 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import threading
 from pathlib import Path
 from typing import Any
 
+from app.models.binary_artifact import BinaryArtifact, is_binary_artifact
+from app.models.compiled import CompiledModel, KeywordMatcher
+from app.models.routing import TrafficSplit, parse_traffic_split
+from app.models.warmup import run_warmup
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,23 +32,51 @@ def load_json(filepath: Path) -> dict[str, Any]:
         return json.load(f)
 
 
+def read_artifact(filepath: Path) -> tuple[dict[str, Any], str, KeywordMatcher | None]:
+    """
+    Read an artifact once, returning its content, SHA-256 checksum and, for
+    binary artifacts, the prebuilt keyword matcher.
+
+    JSON artifacts are hashed and parsed from the same buffer; binary ones are
+    memory-mapped and hashed in one streaming pass over the mapping.
+    """
+    if is_binary_artifact(filepath):
+        with BinaryArtifact(filepath) as binary:
+            return binary.to_artifact(), binary.checksum, binary.keyword_matcher()
+    data = filepath.read_bytes()
+    return json.loads(data), hashlib.sha256(data).hexdigest(), None
+
+
 class ModelRegistry:
     """Manages model artifact loading, validation, and hot-reload."""
 
-    def __init__(self, artifacts_dir: Path) -> None:
+    def __init__(
+        self,
+        artifacts_dir: Path,
+        warmup_rounds: int = 0,
+    ) -> None:
         self.artifacts_dir = artifacts_dir
+        self.warmup_rounds = warmup_rounds
         self.manifest: dict[str, Any] = {}
         self.checksums: dict[str, str] = {}
+        self.compiled: CompiledModel | None = None
+        self.split: TrafficSplit | None = None
         self.active_model: dict[str, Any] | None = None
         self.active_version: str = ""
         self.active_checksum: str = ""
         self.active_artifact_path: str = ""
         self._loaded = False
+        self._reload_lock = threading.Lock()
 
     @property
     def is_loaded(self) -> bool:
         return self._loaded
 
+    @property
+    def reloading(self) -> bool:
+        """True while a reload is compiling and warming up new versions."""
+        return self._reload_lock.locked()
+
     def load(self) -> None:
         """Load the manifest, checksums, and the active model artifact."""
         manifest_path = self.artifacts_dir / "model_manifest.json"
@@ -51,15 +85,23 @@ class ModelRegistry:
         self.manifest = load_json(manifest_path)
         self.checksums = load_json(checksums_path)
 
-        active_version = self.manifest["active_model_version"]
-        self._load_version(active_version)
+        self._load_versions()
         logger.info(
             "Model registry loaded",
-            extra={"model_version": self.active_version},
+            extra={"model_version": self.active_version, "traffic_split": self.split.weights},
+        )
+
+    def _load_versions(self) -> None:
+        """Compile every version in the manifest's traffic split and publish them together."""
+        available = self.manifest.get("versions") or self.manifest.get("available_versions", [])
+        weights = parse_traffic_split(self.manifest, list(available))
+        models = {version: self._load_version(version) for version in weights}
+        self._publish(
+            models[self.manifest["active_model_version"]], TrafficSplit(models, weights)
         )
 
-    def _load_version(self, version: str) -> None:
-        """Load a specific model version by name."""
+    def _load_version(self, version: str) -> CompiledModel:
+        """Compile and warm up a specific model version by name."""
         # Support both old format (versions) and new format (available_versions + paths)
         versions = self.manifest.get("versions")
         if versions:
@@ -75,9 +117,19 @@ class ModelRegistry:
                 raise ValueError(f"Model version {version} not found in manifest")
             artifact_file = paths[version]
         artifact_path = self.artifacts_dir / artifact_file
+        compiled = self._compile_version(version, artifact_file, artifact_path)
+
+        # Prime lazy code paths before the version takes real traffic
+        if self.warmup_rounds > 0:
+            run_warmup(compiled, self.warmup_rounds)
+        return compiled
 
+    def _compile_version(
+        self, version: str, artifact_file: str, artifact_path: Path
+    ) -> CompiledModel:
+        """Read, checksum-validate and compile an artifact."""
         # Compute and validate checksum
-        actual_checksum = compute_checksum(artifact_path)
+        artifact, actual_checksum, keyword_matcher = read_artifact(artifact_path)
         expected_checksum = self.checksums.get(artifact_file)
         if expected_checksum and actual_checksum != expected_checksum:
             raise ValueError(
@@ -85,21 +137,44 @@ class ModelRegistry:
                 f"expected {expected_checksum}, got {actual_checksum}"
             )
 
-        self.active_model = load_json(artifact_path)
-        self.active_version = version
-        self.active_checksum = actual_checksum
-        self.active_artifact_path = str(artifact_path)
+        return CompiledModel.compile(
+            artifact,
+            version=version,
+            checksum=actual_checksum,
+            artifact_path=str(artifact_path),
+            keyword_matcher=keyword_matcher,
+        )
+
+    def _publish(self, compiled: CompiledModel, split: TrafficSplit) -> None:
+        """Make a traffic split (and its active model) the one served to new requests."""
+        self.split = split
+        self.compiled = compiled
+        self.active_model = compiled.artifact
+        self.active_version = compiled.version
+        self.active_checksum = compiled.checksum
+        self.active_artifact_path = compiled.artifact_path
         self._loaded = True
 
+    def route(self, user_hash: str) -> CompiledModel | None:
+        """The compiled model that serves this user, or None before the first load."""
+        split = self.split
+        return split.route(user_hash) if split is not None else None
+
     def reload(self) -> None:
-        """Reload the manifest and switch to the (possibly new) active version."""
-        manifest_path = self.artifacts_dir / "model_manifest.json"
-        self.manifest = load_json(manifest_path)
-        new_version = self.manifest["active_model_version"]
-        self._load_version(new_version)
+        """
+        Reload the manifest and switch to the (possibly new) active version
+        and traffic split.
+
+        Safe to call from worker threads; concurrent reloads are serialized.
+        Requests already routed keep the model they were given.
+        """
+        with self._reload_lock:
+            manifest_path = self.artifacts_dir / "model_manifest.json"
+            self.manifest = load_json(manifest_path)
+            self._load_versions()
         logger.info(
             "Model reloaded",
-            extra={"model_version": self.active_version},
+            extra={"model_version": self.active_version, "traffic_split": self.split.weights},
         )
 
     def get_model_info(self) -> dict[str, Any]:
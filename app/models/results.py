@@ -0,0 +1,109 @@
+"""Compact scored results and their final JSON encoding."""
+
+from __future__ import annotations
+
+import math
+
+from app.json_backend import dumps, dumps_str
+from app.models.compiled import CompiledModel
+from app.models.schemas import InputItem
+
+
+class ScoredItem:
+    """One scored input; reasons stay interned codes into the model's vocabulary."""
+
+    __slots__ = ("id", "score", "label", "reason_codes")
+
+    def __init__(self, id: str, score: float, label: str, reason_codes: tuple[int, ...]) -> None:
+        self.id = id
+        self.score = score
+        self.label = label
+        self.reason_codes = reason_codes
+
+
+def input_features(inp: InputItem) -> tuple[str, float, int, str]:
+    """(text, price, units, channel) of an input, with the default features."""
+    features = inp.features
+    if features is None:
+        return inp.text, 0.0, 0, "direct"
+    return inp.text, features.price, features.units, features.channel
+
+
+def score_inputs(inputs: list[InputItem], model: CompiledModel) -> list[ScoredItem]:
+    """Score every input against a compiled model."""
+    outcomes = model.score_batch([input_features(inp) for inp in inputs])
+    return [
+        ScoredItem(inp.id, score, label, codes)
+        for inp, (score, label, codes) in zip(inputs, outcomes)
+    ]
+
+
+# Labels come from a fixed set, so their JSON is cached
+_label_json: dict[str, str] = {}
+
+
+def json_float(value: float) -> str:
+    """
+    Format a float exactly as pydantic's JSON serializer does.
+
+    Both print the shortest round-tripping digits; they differ only in when
+    scientific notation is used and how the exponent is written (pydantic:
+    ``0.00001``, ``1e-6``, ``1e16``; repr: ``1e-05``, ``1e-06``, ``1e+16``).
+    Non-finite values serialize as null.
+    """
+    if not math.isfinite(value):
+        return "null"
+    text = repr(value)
+    mantissa, _, exponent = text.partition("e")
+    if not exponent:
+        return text
+    exp = int(exponent)
+    if exp == -5:
+        negative = mantissa.startswith("-")
+        digits = mantissa.lstrip("-").replace(".", "")
+        return f"{'-' if negative else ''}0.0000{digits}"
+    return f"{mantissa}e{exp}"
+
+
+def encode_predict_response(
+    *,
+    request_id: str,
+    model: CompiledModel,
+    items: list[ScoredItem],
+    guardrails_triggered: list[str],
+    latency_ms: int,
+) -> bytes:
+    """
+    Encode a /predict response body.
+
+    The bytes are identical to ``PredictResponse(...).model_dump_json()``, so
+    the response checksum is unchanged, but no per-item model is built: the
+    model block and each distinct reason list are encoded once per model
+    version and reused.
+    """
+    reasons_json = model.reasons_json
+    label_json = _label_json
+    parts = ['{"request_id":', dumps_str(request_id), ',"model":', model.model_block_json]
+    parts.append(',"predictions":[')
+    for index, item in enumerate(items):
+        if index:
+            parts.append(",")
+        parts += (
+            '{"id":',
+            dumps_str(item.id),
+            ',"label":',
+            label_json.get(item.label) or label_json.setdefault(item.label, dumps_str(item.label)),
+            ',"score":',
+            json_float(item.score),
+            ',"reasons":',
+            reasons_json(item.reason_codes),
+            "}",
+        )
+    parts += (
+        '],"guardrails_triggered":',
+        dumps(guardrails_triggered).decode("utf-8"),
+        ',"latency_ms":',
+        str(latency_ms),
+        "}",
+    )
+    return "".join(parts).encode("utf-8")
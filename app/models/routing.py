@@ -0,0 +1,73 @@
+"""Weighted, sticky assignment of users to model versions (canary rollouts)."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+from app.models.compiled import CompiledModel
+
+# Resolution of a traffic split: weights are rounded to 0.01%
+BUCKETS = 10_000
+
+
+def parse_traffic_split(
+    manifest: Mapping[str, object], available_versions: list[str]
+) -> dict[str, float]:
+    """
+    The manifest's ``traffic_split`` as {version: weight}, validated.
+
+    Without a split all traffic goes to ``active_model_version``, which must be
+    part of any split given (it is the version ``/model`` reports).
+    """
+    active = manifest["active_model_version"]
+    split = manifest.get("traffic_split")
+    if split is None:
+        return {active: 1.0}
+    if not isinstance(split, dict) or not split:
+        raise ValueError("traffic_split must be a non-empty object of version: weight")
+    weights: dict[str, float] = {}
+    for version, weight in split.items():
+        if version not in available_versions:
+            raise ValueError(f"Model version {version} not found in manifest")
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight < 0:
+            raise ValueError(f"Invalid traffic_split weight for {version}: {weight!r}")
+        weights[version] = float(weight)
+    if active not in weights:
+        raise ValueError(f"active_model_version {active} must be part of traffic_split")
+    if sum(weights.values()) <= 0:
+        raise ValueError("traffic_split weights must not all be zero")
+    return weights
+
+
+def bucket_counts(weights: Mapping[str, float]) -> dict[str, int]:
+    """Whole buckets per version, by largest remainder so they sum to BUCKETS."""
+    total = sum(weights.values())
+    exact = {version: weight * BUCKETS / total for version, weight in weights.items()}
+    counts = {version: int(share) for version, share in exact.items()}
+    spare = BUCKETS - sum(counts.values())
+    for version in sorted(exact, key=lambda v: counts[v] - exact[v])[:spare]:
+        counts[version] += 1
+    return counts
+
+
+class TrafficSplit:
+    """
+    Maps a user hash to one compiled model.
+
+    The first 32 bits of the (hex) user hash pick one of ``BUCKETS`` buckets
+    and a precomputed table maps buckets to models, so routing is one slice,
+    one ``int()`` and one index. Buckets are handed out in split order: while
+    the versions keep their order, growing the last entry's weight keeps every
+    user it already had.
+    """
+
+    def __init__(self, models: Mapping[str, CompiledModel], weights: Mapping[str, float]) -> None:
+        self.weights = dict(weights)
+        self.models = {version: models[version] for version in weights}
+        table: list[CompiledModel] = []
+        for version, count in bucket_counts(weights).items():
+            table.extend([self.models[version]] * count)
+        self._table = tuple(table)
+
+    def route(self, user_hash: str) -> CompiledModel:
+        return self._table[int(user_hash[:8], 16) % BUCKETS]
@@ -5,7 +5,38 @@ from __future__ import annotations
 from typing import Any
 
 
-def _evaluate_price_rules(
+# New-format rule key suffix -> comparison operator, in evaluation order
+THRESHOLD_KEYS = {"gte": ">=", "gt": ">", "lt": "<", "lte": "<="}
+
+
+def rule_conditions(rule: dict[str, Any], feature: str) -> list[tuple[str, float]]:
+    """
+    Return the (operator, threshold) conditions of a price or units rule.
+
+    ``feature`` is "price" or "units". An old-format ``condition`` string gives
+    one condition (units thresholds parse as int, exactly as the evaluator
+    reads them) or none if malformed. A new-format rule gives one condition per
+    ``if_<feature>_<op>`` key present; the rule matches if any of them holds.
+    """
+    if "condition" in rule:
+        parts = rule["condition"].split()
+        if len(parts) != 3:
+            return []
+        threshold = int(parts[2]) if feature == "units" else float(parts[2])
+        return [(parts[1], threshold)]
+    return [
+        (operator, rule[f"if_{feature}_{key}"])
+        for key, operator in THRESHOLD_KEYS.items()
+        if f"if_{feature}_{key}" in rule
+    ]
+
+
+def rule_thresholds(rules: list[dict[str, Any]], feature: str) -> list[float]:
+    """Return the sorted distinct thresholds referenced by price or units rules."""
+    return sorted({threshold for rule in rules for _, threshold in rule_conditions(rule, feature)})
+
+
+def evaluate_price_rules(
     price: float, rules: list[dict[str, Any]]
 ) -> tuple[float, list[str]]:
     """Evaluate price rules and return contribution + reasons."""
@@ -54,7 +85,7 @@ def _evaluate_price_rules(
     return contribution, reasons
 
 
-def _evaluate_units_rules(
+def evaluate_units_rules(
     units: int, rules: list[dict[str, Any]]
 ) -> tuple[float, list[str]]:
     """Evaluate units rules and return contribution + reasons."""
@@ -103,7 +134,7 @@ def _evaluate_units_rules(
     return contribution, reasons
 
 
-def _evaluate_text_rules(
+def evaluate_text_rules(
     text: str, rules: list[dict[str, Any]]
 ) -> tuple[float, list[str]]:
     """Evaluate text keyword rules. All matching rules contribute."""
@@ -155,20 +186,26 @@ def score_input(
         reasons.append(f"channel_{channel.lower()}")
 
     # Price rules
-    price_contrib, price_reasons = _evaluate_price_rules(price, price_rules)
+    price_contrib, price_reasons = evaluate_price_rules(price, price_rules)
     reasons.extend(price_reasons)
 
     # Units rules
-    units_contrib, units_reasons = _evaluate_units_rules(units, units_rules)
+    units_contrib, units_reasons = evaluate_units_rules(units, units_rules)
     reasons.extend(units_reasons)
 
     # Text rules
-    text_contrib, text_reasons = _evaluate_text_rules(text, text_rules)
+    text_contrib, text_reasons = evaluate_text_rules(text, text_rules)
     reasons.extend(text_reasons)
 
     # Compute final score
     score = base_score + channel_contrib + price_contrib + units_contrib + text_contrib
+    score, label = finalize_score(score, thresholds)
+
+    return score, label, reasons
+
 
+def finalize_score(score: float, thresholds: dict[str, float]) -> tuple[float, str]:
+    """Clamp and round a raw score, then assign its label."""
     # Clamp to [0.0, 1.0]
     score = max(0.0, min(1.0, score))
 
@@ -186,4 +223,4 @@ def score_input(
     else:
         label = "high_risk"
 
-    return score, label, reasons
+    return score, label
@@ -0,0 +1,96 @@
+"""Synthetic warm-up pass run on each model version before it is published."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from app import checksums
+from app.models.compiled import CompiledModel
+from app.models.decision_table import cell_representatives
+from app.models.scorer import rule_thresholds
+from app.models.results import ScoredItem, encode_predict_response
+from app.observability.metrics import model_warmup_seconds
+
+logger = logging.getLogger(__name__)
+
+# Units take cell representatives too, so they may be non-integral floats
+WarmupInput = tuple[str, float, float, str]
+
+
+def _axis_values(rules: list[dict[str, Any]], feature: str) -> list[float]:
+    """One value in every cell the feature's thresholds split the axis into."""
+    reps = cell_representatives(rule_thresholds(rules, feature))
+    return [rep for rep in reps if rep is not None]
+
+
+def build_warmup_inputs(config: dict[str, Any]) -> list[WarmupInput]:
+    """
+    Build synthetic inputs that exercise every rule branch of a config.
+
+    Prices and units take one value in every cell between, at and beyond the
+    rule thresholds, every channel (plus an unknown one) is used, and each
+    text keyword appears on its own and alongside the first keyword of every
+    other rule.
+    """
+    prices = _axis_values(config["price_rules"], "price")
+    units = _axis_values(config["units_rules"], "units")
+    channels = [*config["channel_weights"], "unknown_channel"]
+
+    keywords_by_rule = [
+        [rule["keyword"]] if "keyword" in rule else list(rule.get("keywords_any", []))
+        for rule in config["text_rules"]
+    ]
+    texts = ["warm-up input"]
+    texts += [f"warm-up {kw}" for kws in keywords_by_rule for kw in kws]
+    texts.append(" ".join(["warm-up", *(kws[0] for kws in keywords_by_rule if kws)]))
+
+    n = max(len(prices), len(units), len(channels), len(texts))
+    return [
+        (
+            texts[i % len(texts)],
+            prices[i % len(prices)],
+            units[i % len(units)],
+            channels[i % len(channels)],
+        )
+        for i in range(n)
+    ]
+
+
+def run_warmup(model: CompiledModel, rounds: int = 1) -> float:
+    """
+    Push the synthetic inputs through scoring, response building and hashing.
+
+    Returns the warm-up duration in seconds (also recorded as a metric).
+    """
+    inputs = build_warmup_inputs(model.config)
+    ids = [f"warmup-{i}" for i in range(len(inputs))]
+
+    start = time.monotonic()
+    for _ in range(rounds):
+        items = [
+            ScoredItem(item_id, score, label, codes)
+            for item_id, (score, label, codes) in zip(ids, model.score_batch(inputs))
+        ]
+        body = encode_predict_response(
+            request_id="warmup",
+            model=model,
+            items=items,
+            guardrails_triggered=[],
+            latency_ms=0,
+        )
+        checksums.digest(body)
+    elapsed = time.monotonic() - start
+
+    model_warmup_seconds.observe(elapsed)
+    logger.info(
+        "Model warm-up finished",
+        extra={
+            "model_version": model.version,
+            "warmup_inputs": len(inputs),
+            "warmup_rounds": rounds,
+            "warmup_ms": round(elapsed * 1000, 3),
+        },
+    )
+    return elapsed
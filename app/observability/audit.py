@@ -2,19 +2,35 @@
 
 from __future__ import annotations
 
+import heapq
 import json
 import logging
+import os
+from collections.abc import Iterator
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from app.config import AUDIT_SHARDING, AUDIT_WORKER_ID
+from app.json_backend import dumps_record
 from app.observability.metrics import audit_write_errors_total
 
 logger = logging.getLogger(__name__)
 
 
-def write_audit_record(
-    audit_file: Path,
+def shard_path(audit_file: Path, worker_id: str = "") -> Path:
+    """This worker's shard of ``audit_file``: audit.jsonl -> audit.<worker>.jsonl."""
+    worker_id = worker_id or AUDIT_WORKER_ID or str(os.getpid())
+    return audit_file.with_name(f"{audit_file.stem}.{worker_id}{audit_file.suffix}")
+
+
+def audit_files(audit_file: Path) -> list[Path]:
+    """``audit_file`` and all its shards that exist."""
+    shards = sorted(audit_file.parent.glob(f"{audit_file.stem}.*{audit_file.suffix}"))
+    return ([audit_file] if audit_file.exists() else []) + shards
+
+
+def audit_record(
     *,
     request_id: str,
     user_hash: str,
@@ -25,10 +41,21 @@ def write_audit_record(
     guardrails_triggered: list[str],
     status: str,
     latency_ms: int,
-    response_checksum_sha256: str,
-) -> None:
-    """Append a single JSON audit record to the audit log file."""
-    record: dict[str, Any] = {
+    latency_us: int,
+    response_checksum: str,
+    response_checksum_alg: str,
+    response_format: str,
+) -> dict[str, Any]:
+    """
+    One audit record, timestamped now.
+
+    ``response_checksum_sha256`` is kept for existing readers and is only
+    filled when the response checksum algorithm is SHA-256. The checksum is
+    over the response body as sent, in ``response_format`` (its media type,
+    ``application/json`` or ``application/msgpack``). ``latency_ms`` is the
+    legacy truncated value; ``latency_us`` has the resolution.
+    """
+    return {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "request_id": request_id,
         "user_hash": user_hash,
@@ -39,12 +66,78 @@ def write_audit_record(
         "guardrails_triggered": guardrails_triggered,
         "status": status,
         "latency_ms": latency_ms,
-        "response_checksum_sha256": response_checksum_sha256,
+        "latency_us": latency_us,
+        "response_checksum_sha256": response_checksum if response_checksum_alg == "sha256" else "",
+        "response_checksum_alg": response_checksum_alg,
+        "response_checksum": response_checksum,
+        "response_format": response_format,
     }
 
+
+def _append_records(audit_file: Path, records: list[dict[str, Any]]) -> None:
+    # One write per call; with AUDIT_SHARDING it goes to this worker's shard
     try:
-        with open(audit_file, "a") as f:
-            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        with open(shard_path(audit_file) if AUDIT_SHARDING else audit_file, "a") as f:
+            f.write("".join(dumps_record(record) + "\n" for record in records))
     except Exception:
         audit_write_errors_total.inc()
         logger.exception("Failed to write audit record")
+
+
+def write_audit_record(audit_file: Path, **fields: Any) -> None:
+    """Append a single JSON audit record (see ``audit_record``) to the audit log file."""
+    _append_records(audit_file, [audit_record(**fields)])
+
+
+class AuditBuffer:
+    """
+    Audit records collected in memory and appended in one write.
+
+    For high-rate callers (the WebSocket channel) where opening the file per
+    record would dominate. Records are timestamped when added; ``flush`` is
+    called when ``max_records`` are waiting and by the owner on a timer and
+    at close, so a crash loses at most that window.
+    """
+
+    def __init__(self, audit_file: Path, max_records: int = 64) -> None:
+        self.audit_file = audit_file
+        self.max_records = max_records
+        self._records: list[dict[str, Any]] = []
+
+    def add(self, **fields: Any) -> None:
+        self._records.append(audit_record(**fields))
+        if len(self._records) >= self.max_records:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._records:
+            records, self._records = self._records, []
+            _append_records(self.audit_file, records)
+
+
+def _timestamp(line: str) -> datetime:
+    return datetime.fromisoformat(json.loads(line)["timestamp"])
+
+
+def _lines(path: Path) -> Iterator[str]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield line.rstrip("\n")
+
+
+def read_audit_lines(audit_file: Path) -> Iterator[str]:
+    """
+    Audit lines of ``audit_file`` and its shards as one timestamp-ordered stream.
+
+    Each file is already in append order, so a k-way merge holds one line per
+    file in memory. Lines are yielded unchanged (checksummable as written);
+    records with equal timestamps keep file order.
+    """
+    yield from heapq.merge(*(_lines(path) for path in audit_files(audit_file)), key=_timestamp)
+
+
+def read_audit_records(audit_file: Path) -> Iterator[dict[str, Any]]:
+    """Parsed records of the merged view, see ``read_audit_lines``."""
+    for line in read_audit_lines(audit_file):
+        yield json.loads(line)
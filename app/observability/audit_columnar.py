@@ -0,0 +1,293 @@
+"""Incremental columnar export of the audit log, and queries over it.
+
+Audit lines are converted into numbered part files under an export
+directory, as Arrow IPC (``pyarrow``) or, without it, ``.npz`` (``numpy``).
+Each part holds the analytics columns of the records it covers:
+
+- ``timestamp_us``, ``num_inputs``, ``latency_ms``, ``latency_us``: int64
+  (``latency_us`` is ``latency_ms * 1000`` for records written before it)
+- ``user_hash``, ``route``, ``model_version``, ``status``, ``guardrails``
+  (comma-joined ``guardrails_triggered``): dictionary-encoded, int32 codes
+  into the part's own list of distinct values
+
+Request ids and checksums stay in the JSONL, which remains the record of
+truth. ``state.json`` remembers how far each audit file (and shard) has
+been converted, by inode and byte offset, so a run only reads lines
+appended since the last one; a trailing line without its newline is still
+being written and is left for the next run.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from array import array
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from app.observability.audit import audit_files
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is installed
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - exercised when pyarrow is installed
+    pa = None
+
+INT_COLUMNS = ("timestamp_us", "num_inputs", "latency_ms", "latency_us")
+DICTIONARY_COLUMNS = ("user_hash", "route", "model_version", "status", "guardrails")
+FORMATS = {"arrow": ".arrow", "npz": ".npz"}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class ColumnBatch:
+    """Audit records accumulated column by column, dictionary-encoding as they come."""
+
+    __slots__ = ("rows", "ints", "codes", "values", "_lookup")
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.ints = {name: array("q") for name in INT_COLUMNS}
+        self.codes = {name: array("i") for name in DICTIONARY_COLUMNS}
+        self.values: dict[str, list[str]] = {name: [] for name in DICTIONARY_COLUMNS}
+        self._lookup: dict[str, dict[str, int]] = {name: {} for name in DICTIONARY_COLUMNS}
+
+    def add(self, record: dict[str, Any]) -> None:
+        timestamp = datetime.fromisoformat(record["timestamp"]) - _EPOCH
+        self.ints["timestamp_us"].append(
+            (timestamp.days * 86400 + timestamp.seconds) * 1_000_000 + timestamp.microseconds
+        )
+        self.ints["num_inputs"].append(record["num_inputs"])
+        self.ints["latency_ms"].append(record["latency_ms"])
+        self.ints["latency_us"].append(record.get("latency_us", record["latency_ms"] * 1000))
+        row = {
+            "user_hash": record["user_hash"],
+            "route": record["route"],
+            "model_version": record["model_version"],
+            "status": record["status"],
+            "guardrails": ",".join(record["guardrails_triggered"]),
+        }
+        for name, value in row.items():
+            lookup = self._lookup[name]
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(lookup)
+                self.values[name].append(value)
+            self.codes[name].append(code)
+        self.rows += 1
+
+
+def default_format() -> str:
+    """"arrow" if pyarrow is installed, else "npz" if numpy is."""
+    if pa is not None:
+        return "arrow"
+    if np is not None:
+        return "npz"
+    raise ValueError("Columnar audit export needs pyarrow or numpy; install one of them")
+
+
+def _write_arrow(batch: ColumnBatch, path: Path) -> None:
+    columns = {
+        name: pa.Array.from_buffers(pa.int64(), batch.rows, [None, pa.py_buffer(values)])
+        for name, values in batch.ints.items()
+    }
+    for name in DICTIONARY_COLUMNS:
+        codes = pa.Array.from_buffers(
+            pa.int32(), batch.rows, [None, pa.py_buffer(batch.codes[name])]
+        )
+        values = pa.array(batch.values[name], pa.string())
+        columns[name] = pa.DictionaryArray.from_arrays(codes, values)
+    table = pa.table(columns)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _write_npz(batch: ColumnBatch, path: Path) -> None:
+    arrays = {name: np.frombuffer(values, dtype=np.int64) for name, values in batch.ints.items()}
+    for name in DICTIONARY_COLUMNS:
+        arrays[f"{name}__codes"] = np.frombuffer(batch.codes[name], dtype=np.int32)
+        arrays[f"{name}__values"] = np.array(batch.values[name], dtype=str)
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def _write_part(batch: ColumnBatch, out_dir: Path, number: int, fmt: str) -> str:
+    name = f"part-{number:06d}{FORMATS[fmt]}"
+    tmp = out_dir / (name + ".tmp")
+    (_write_arrow if fmt == "arrow" else _write_npz)(batch, tmp)
+    os.replace(tmp, out_dir / name)
+    return name
+
+
+def _load_state(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {"files": {}, "parts": []}
+    return json.loads(path.read_text())
+
+
+def _save_state(path: Path, state: dict[str, Any]) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2) + "\n")
+    os.replace(tmp, path)
+
+
+def export_audit(
+    audit_file: Path,
+    out_dir: Path,
+    fmt: str | None = None,
+    rows_per_part: int = 1_000_000,
+) -> list[str]:
+    """
+    Convert audit lines appended since the last export; returns the new parts.
+
+    Covers ``audit_file`` and its worker shards. A file whose inode changed or
+    that shrank (rotated or truncated) is read again from the start. State is
+    saved after every part, so an interrupted run resumes where it stopped.
+    """
+    fmt = fmt or default_format()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown columnar format {fmt!r}")
+    if (fmt == "arrow" and pa is None) or (fmt == "npz" and np is None):
+        raise ValueError(f"Columnar format {fmt!r} requested but its package is not installed")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    state_path = out_dir / "state.json"
+    state = _load_state(state_path)
+    new_parts: list[str] = []
+
+    for path in audit_files(audit_file):
+        stat = path.stat()
+        done = state["files"].get(path.name, {})
+        offset = done.get("offset", 0)
+        if done.get("inode") != stat.st_ino or offset > stat.st_size:
+            offset = 0
+        batch = ColumnBatch()
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # still being written
+                if line.strip():
+                    batch.add(json.loads(line))
+                offset += len(line)
+                if batch.rows >= rows_per_part:
+                    new_parts.append(_write_part(batch, out_dir, len(state["parts"]) + 1, fmt))
+                    state["parts"].append(new_parts[-1])
+                    state["files"][path.name] = {"inode": stat.st_ino, "offset": offset}
+                    _save_state(state_path, state)
+                    batch = ColumnBatch()
+        if batch.rows:
+            new_parts.append(_write_part(batch, out_dir, len(state["parts"]) + 1, fmt))
+            state["parts"].append(new_parts[-1])
+        state["files"][path.name] = {"inode": stat.st_ino, "offset": offset}
+        _save_state(state_path, state)
+    return new_parts
+
+
+def _read_part(path: Path) -> Iterator[tuple[str, Any, list[str] | None]]:
+    """(column, int64 values or int32 codes, dictionary values or None) per column."""
+    if path.suffix == ".arrow":
+        if pa is None:
+            raise ValueError(f"Reading {path.name} needs pyarrow")
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        for name in INT_COLUMNS:
+            yield name, table.column(name).to_numpy(), None
+        for name in DICTIONARY_COLUMNS:
+            column = table.column(name).combine_chunks()
+            yield name, column.indices.to_numpy(), column.dictionary.to_pylist()
+    else:
+        with np.load(path) as data:
+            for name in INT_COLUMNS:
+                yield name, data[name], None
+            for name in DICTIONARY_COLUMNS:
+                yield name, data[f"{name}__codes"], data[f"{name}__values"].tolist()
+
+
+def read_columns(out_dir: Path) -> dict[str, Any]:
+    """
+    All exported parts as whole columns (needs numpy).
+
+    Integer columns are int64 arrays; a dictionary column is a
+    ``(codes, values)`` pair whose codes index one dictionary shared by all
+    parts.
+    """
+    if np is None:
+        raise ValueError("Querying the columnar audit export needs numpy")
+    parts = _load_state(out_dir / "state.json")["parts"]
+    ints: dict[str, list[Any]] = {name: [] for name in INT_COLUMNS}
+    codes: dict[str, list[Any]] = {name: [] for name in DICTIONARY_COLUMNS}
+    lookups: dict[str, dict[str, int]] = {name: {} for name in DICTIONARY_COLUMNS}
+    for part in parts:
+        for name, data, values in _read_part(out_dir / part):
+            if values is None:
+                ints[name].append(data)
+                continue
+            # Re-map the part's dictionary onto the shared one
+            lookup = lookups[name]
+            remap = np.array([lookup.setdefault(v, len(lookup)) for v in values], dtype=np.int32)
+            codes[name].append(remap[data])
+    columns: dict[str, Any] = {
+        name: np.concatenate(chunks) if chunks else np.empty(0, np.int64)
+        for name, chunks in ints.items()
+    }
+    for name in DICTIONARY_COLUMNS:
+        chunks = codes[name]
+        columns[name] = (
+            np.concatenate(chunks) if chunks else np.empty(0, np.int32),
+            list(lookups[name]),
+        )
+    return columns
+
+
+def _nearest_rank(ordered: Any, pct: float) -> float:
+    if not len(ordered):
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return float(ordered[int(rank) - 1])
+
+
+def version_stats(
+    columns: dict[str, Any], since_us: int | None = None
+) -> list[dict[str, Any]]:
+    """
+    Per model version: requests, block rate and latency percentiles.
+
+    Percentiles are nearest-rank over the microsecond latencies of successful
+    requests, reported in milliseconds; the block rate is
+    blocked requests over all requests recorded for that version.
+    """
+    selected = np.ones(len(columns["timestamp_us"]), dtype=bool)
+    if since_us is not None:
+        selected &= columns["timestamp_us"] >= since_us
+    status_codes, statuses = columns["status"]
+    success = status_codes == statuses.index("success") if "success" in statuses else False
+    blocked = status_codes == statuses.index("blocked") if "blocked" in statuses else False
+    version_codes, versions = columns["model_version"]
+    latency = columns["latency_us"]
+
+    rows = []
+    for code, version in enumerate(versions):
+        mask = selected & (version_codes == code)
+        requests = int(mask.sum())
+        if not requests:
+            continue
+        ordered = np.sort(latency[mask & success]) / 1000
+        n_blocked = int((mask & blocked).sum())
+        rows.append(
+            {
+                "model_version": version,
+                "requests": requests,
+                "blocked": n_blocked,
+                "block_rate": n_blocked / requests,
+                "p50_ms": _nearest_rank(ordered, 50),
+                "p90_ms": _nearest_rank(ordered, 90),
+                "p99_ms": _nearest_rank(ordered, 99),
+            }
+        )
+    return sorted(rows, key=lambda row: row["model_version"])
@@ -0,0 +1,74 @@
+"""Sampled, redacted capture of /predict traffic for replay."""
+
+from __future__ import annotations
+
+import logging
+import random
+from pathlib import Path
+from typing import Any
+
+from app.guardrails.redaction import redact_pii
+from app.json_backend import dumps
+from app.models.schemas import InputItem
+
+logger = logging.getLogger(__name__)
+
+
+def capture_inputs(inputs: list[InputItem]) -> list[dict[str, Any]]:
+    """Request inputs with ids and texts redacted."""
+    return [
+        {
+            "id": redact_pii(inp.id),
+            "text": redact_pii(inp.text),
+            "features": inp.features.model_dump() if inp.features is not None else None,
+        }
+        for inp in inputs
+    ]
+
+
+class TrafficCapture:
+    """
+    Appends one compact JSON line per sampled /predict request.
+
+    Each line holds the wall-clock arrival time ``t``, the user hash, the
+    redacted inputs, the status and latency, and the labels served, which is
+    what ``app.tools.replay`` needs to re-issue the request on the original
+    schedule and diff the answers. Write failures are logged and dropped.
+    """
+
+    def __init__(self, path: Path, sample_rate: float = 1.0) -> None:
+        self.path = path
+        self.sample_rate = sample_rate
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def record(
+        self,
+        *,
+        arrived_at: float,
+        request_id: str,
+        user_hash: str,
+        inputs: list[InputItem],
+        status: str,
+        latency_ms: int,
+        model_version: str,
+        labels: list[str],
+    ) -> None:
+        line = dumps(
+            {
+                "t": arrived_at,
+                "request_id": request_id,
+                "user_hash": user_hash,
+                "inputs": capture_inputs(inputs),
+                "status": status,
+                "latency_ms": latency_ms,
+                "model_version": model_version,
+                "labels": labels,
+            }
+        )
+        try:
+            with open(self.path, "ab") as f:
+                f.write(line + b"\n")
+        except OSError:
+            logger.exception("Failed to write traffic capture")
@@ -3,16 +3,38 @@
 from __future__ import annotations
 
 import logging
+import queue
+import random
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import TextIO
 
 from pythonjsonlogger import json as json_logger
 
+try:
+    from pythonjsonlogger.orjson import orjson_default
+except ImportError:  # orjson not installed
+    orjson_default = None
+
+from app import json_backend
+from app.config import LOG_PREDICTION_SAMPLE_RATE, LOG_QUEUE_POLICY, LOG_QUEUE_SIZE
 from app.guardrails.redaction import redact_pii
+from app.observability.metrics import logs_dropped_total
+
+# Background writer started by setup_logging, stopped by shutdown_logging
+_listener: QueueListener | None = None
 
 
 class RedactingFormatter(json_logger.JsonFormatter):
     """JSON formatter that redacts PII from log messages."""
 
+    def jsonify_log_record(self, log_record: dict) -> str:
+        # Log lines are not checksummed, so the fast backend's compact
+        # UTF-8 output is used as is
+        if orjson_default is not None and json_backend.backend() == "orjson":
+            return json_backend.dumps(log_record, default=orjson_default).decode("utf-8")
+        return super().jsonify_log_record(log_record)
+
     def format(self, record: logging.LogRecord) -> str:
         # Redact the message
         if isinstance(record.msg, str):
@@ -32,14 +54,92 @@ class RedactingFormatter(json_logger.JsonFormatter):
         return super().format(record)
 
 
-def setup_logging(level: int = logging.INFO) -> None:
-    """Configure structured JSON logging to stdout with redaction."""
-    handler = logging.StreamHandler(sys.stdout)
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hands records to a bounded queue without formatting them.
+
+    Formatting, redaction and the write happen on the listener thread; the
+    caller only pays for the enqueue. With ``block=False`` a full queue drops
+    the record and counts it instead of stalling the caller.
+    """
+
+    def __init__(self, log_queue: queue.Queue, block: bool = False) -> None:
+        super().__init__(log_queue)
+        self.block = block
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener's handler formats the record itself
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            logs_dropped_total.labels(reason="queue_full").inc()
+
+
+class DrainingQueueListener(QueueListener):
+    """QueueListener whose stop waits for room for the sentinel, so it drains a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class SampleFilter(logging.Filter):
+    """Keeps records with the given message with probability ``rate``; others pass."""
+
+    def __init__(self, message: str, rate: float) -> None:
+        super().__init__()
+        self.message = message
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.msg != self.message or random.random() < self.rate:
+            return True
+        logs_dropped_total.labels(reason="sampled").inc()
+        return False
+
+
+def start_log_pipeline(
+    handler: logging.Handler, queue_size: int, block: bool = False
+) -> tuple[BoundedQueueHandler, QueueListener]:
+    """Put ``handler`` behind a bounded queue drained by a background thread."""
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    listener = DrainingQueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    return BoundedQueueHandler(log_queue, block=block), listener
+
+
+def setup_logging(
+    level: int = logging.INFO,
+    stream: TextIO | None = None,
+    queue_size: int = LOG_QUEUE_SIZE,
+    policy: str = LOG_QUEUE_POLICY,
+    prediction_sample_rate: float = LOG_PREDICTION_SAMPLE_RATE,
+) -> None:
+    """
+    Configure structured JSON logging to stdout with redaction.
+
+    Records go through a bounded queue to a background writer thread unless
+    ``queue_size`` is 0. ``policy`` decides what a full queue does: "drop"
+    (counted in ``logs_dropped_total``) or "block".
+    """
+    global _listener
+    if policy not in ("drop", "block"):
+        raise ValueError(f"Unknown log queue policy {policy!r}")
+    shutdown_logging()
+
+    handler = logging.StreamHandler(stream if stream is not None else sys.stdout)
     formatter = RedactingFormatter(
         fmt="%(asctime)s %(name)s %(levelname)s %(message)s",
         datefmt="%Y-%m-%dT%H:%M:%S%z",
     )
     handler.setFormatter(formatter)
+    if queue_size > 0:
+        handler, _listener = start_log_pipeline(handler, queue_size, block=policy == "block")
 
     root = logging.getLogger()
     root.handlers.clear()
@@ -48,3 +148,34 @@ def setup_logging(level: int = logging.INFO) -> None:
 
     # Quiet noisy loggers
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+
+    # Sample the per-request success line before it is queued
+    predict_logger = logging.getLogger("app.routes.predict")
+    predict_logger.filters = [f for f in predict_logger.filters if not isinstance(f, SampleFilter)]
+    if prediction_sample_rate < 1.0:
+        predict_logger.addFilter(SampleFilter("Prediction served", prediction_sample_rate))
+
+
+def log_queue_depth() -> int:
+    """Records waiting for the background writer (0 when logging synchronously)."""
+    return _listener.queue.qsize() if _listener is not None else 0
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the background writer after it has written every queued record.
+
+    Its handler is put back on the root logger, so anything logged after
+    shutdown is written synchronously instead of queued with no reader.
+    """
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, BoundedQueueHandler) and handler.queue is listener.queue:
+            root.removeHandler(handler)
+            for target in listener.handlers:
+                root.addHandler(target)
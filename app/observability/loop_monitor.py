@@ -0,0 +1,107 @@
+"""Event-loop lag and saturation monitor."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+import anyio.to_thread
+
+from app.observability.metrics import (
+    event_loop_lag_seconds,
+    event_loop_stalls_total,
+    threadpool_busy_threads,
+    threadpool_waiting_tasks,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """
+    Measures how late the event loop runs a timer, and what is queued behind it.
+
+    A task sleeps ``interval_s`` at a time; how much later than requested it
+    wakes up is the scheduling lag every coroutine sees at that moment. Each
+    wake-up also samples the default thread limiter (threads busy, tasks
+    waiting for one). In-flight requests are counted by the HTTP middleware
+    in ``in_flight``, which the app exports as a gauge read at scrape time,
+    so the request path only pays for an integer add.
+
+    With ``stall_threshold_s`` set, a watchdog thread checks the task's last
+    wake-up; when the loop has not come back for longer than the threshold it
+    logs the loop thread's current stack, which shows the code blocking it.
+    One snapshot is logged per stall.
+
+    ``recent_lag_s`` is a moving average of the lag (each sample weighs 1/4)
+    for readiness decisions, which a single slow tick should not flip.
+    """
+
+    def __init__(self, interval_s: float = 0.1, stall_threshold_s: float = 0.0) -> None:
+        self.interval_s = interval_s
+        self.stall_threshold_s = stall_threshold_s
+        self.in_flight = 0
+        self.recent_lag_s = 0.0
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id = 0
+        self._task: asyncio.Task[None] | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start monitoring the running loop (call from inside it)."""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        if self.stall_threshold_s > 0:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _run(self) -> None:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(self.interval_s)
+            lag = max(0.0, time.perf_counter() - before - self.interval_s)
+            self._heartbeat = time.monotonic()
+            event_loop_lag_seconds.observe(lag)
+            self.recent_lag_s += (lag - self.recent_lag_s) / 4
+            stats = limiter.statistics()
+            threadpool_busy_threads.set(stats.borrowed_tokens)
+            threadpool_waiting_tasks.set(stats.tasks_waiting)
+
+    def _watch(self) -> None:
+        reported = 0.0
+        while not self._stopped.wait(self.stall_threshold_s / 2):
+            heartbeat = self._heartbeat
+            stalled_s = time.monotonic() - heartbeat - self.interval_s
+            if stalled_s < self.stall_threshold_s or heartbeat == reported:
+                continue
+            reported = heartbeat
+            event_loop_stalls_total.inc()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            logger.warning(
+                "Event loop stalled",
+                extra={"stalled_ms": round(stalled_s * 1000, 1), "stack": stack},
+            )
@@ -0,0 +1,113 @@
+"""On-demand memory diagnostics: tracemalloc snapshots and live object counts."""
+
+from __future__ import annotations
+
+import gc
+import threading
+import tracemalloc
+from typing import Any
+
+from app.models.compiled import CompiledModel
+from app.models.schemas import Prediction, PredictResponse
+
+# Snapshots kept for diffing; the oldest is dropped first
+MAX_SNAPSHOTS = 4
+
+
+class MemoryDiagnostics:
+    """
+    Start/stop tracemalloc, keep a few snapshots and diff them by file:line.
+
+    tracemalloc slows every allocation while it runs, so nothing here is
+    active until ``start`` is called, and ``stop`` frees its traces and the
+    kept snapshots. All methods are safe to call from several threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshots: dict[int, tracemalloc.Snapshot] = {}
+        self._next_id = 1
+
+    def status(self) -> dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_bytes": current,
+            "peak_traced_bytes": peak,
+            "snapshots": sorted(self._snapshots),
+        }
+
+    def start(self, frames: int = 1) -> dict[str, Any]:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+            return self.status()
+
+    def stop(self) -> dict[str, Any]:
+        with self._lock:
+            tracemalloc.stop()
+            self._snapshots.clear()
+            return self.status()
+
+    def snapshot(self) -> int:
+        """Take a snapshot and return its id (needs tracing to be on)."""
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                raise ValueError("tracemalloc is not running; start it first")
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                (tracemalloc.Filter(False, tracemalloc.__file__),)
+            )
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = snapshot
+            while len(self._snapshots) > MAX_SNAPSHOTS:
+                del self._snapshots[min(self._snapshots)]
+            return snapshot_id
+
+    def diff(self, before: int, after: int, limit: int = 20) -> list[dict[str, Any]]:
+        """Largest changes between two snapshots, grouped by file:line."""
+        with self._lock:
+            try:
+                old, new = self._snapshots[before], self._snapshots[after]
+            except KeyError as exc:
+                raise ValueError(f"Unknown snapshot {exc.args[0]}") from None
+        stats = new.compare_to(old, "lineno")
+        return [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_bytes": stat.size,
+                "size_diff_bytes": stat.size_diff,
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats[:limit]
+        ]
+
+
+def _is_artifact(obj: Any) -> bool:
+    return "model_version" in obj and ("rule_config" in obj or "config" in obj)
+
+
+def live_objects() -> dict[str, int]:
+    """
+    Live instances of the objects most likely to accumulate.
+
+    Walks every object the garbage collector tracks, so it costs tens of
+    milliseconds on a large heap; artifact dicts are the loaded model
+    artifacts (one per compiled version is expected).
+    """
+    gc.collect()
+    counts = {"Prediction": 0, "PredictResponse": 0, "CompiledModel": 0, "artifact_dicts": 0}
+    for obj in gc.get_objects():
+        kind = type(obj)
+        if kind is dict:
+            if _is_artifact(obj):
+                counts["artifact_dicts"] += 1
+        elif kind is Prediction:
+            counts["Prediction"] += 1
+        elif kind is PredictResponse:
+            counts["PredictResponse"] += 1
+        elif kind is CompiledModel:
+            counts["CompiledModel"] += 1
+    return counts
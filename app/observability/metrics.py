@@ -2,7 +2,31 @@
 
 from __future__ import annotations
 
-from prometheus_client import Counter, Histogram
+import math
+from typing import Any, Callable, Iterator
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.metrics_core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+
+def log_linear_buckets(
+    low: float, high: float, steps: tuple[float, ...] = (1, 2, 5)
+) -> tuple[float, ...]:
+    """
+    Bucket bounds ``step * 10**k`` from ``low`` up to ``high``, both powers of ten.
+
+    Constant relative resolution across decades (HDR-style), so microsecond
+    and second latencies are both resolved; the default gives three bounds
+    per decade.
+    """
+    first, last = round(math.log10(low)), round(math.log10(high))
+    bounds = [round(step * 10.0**k, 12) for k in range(first, last + 1) for step in steps]
+    return tuple(bound for bound in bounds if bound <= high)
+
+
+# Request latencies in milliseconds: 10 us .. 10 s
+LATENCY_BUCKETS_MS = log_linear_buckets(0.01, 10_000)
 
 # HTTP-level metrics
 http_requests_total = Counter(
@@ -15,7 +39,40 @@ http_request_latency_ms = Histogram(
     "http_request_latency_ms",
     "HTTP request latency in milliseconds",
     ["route"],
-    buckets=(5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+    buckets=LATENCY_BUCKETS_MS,
+)
+
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled",
+)
+
+# Event loop saturation, sampled by the loop monitor
+event_loop_lag_seconds = Histogram(
+    "event_loop_lag_seconds",
+    "How much later than scheduled the event loop ran the monitor's timer",
+    buckets=log_linear_buckets(0.0001, 10),
+)
+
+event_loop_stalls_total = Counter(
+    "event_loop_stalls_total",
+    "Times the event loop was blocked for longer than the stall threshold",
+)
+
+threadpool_busy_threads = Gauge(
+    "threadpool_busy_threads",
+    "Worker threads of the default thread limiter in use",
+)
+
+threadpool_waiting_tasks = Gauge(
+    "threadpool_waiting_tasks",
+    "Tasks waiting for a worker thread of the default thread limiter",
+)
+
+readiness_trips_total = Counter(
+    "readiness_trips_total",
+    "Times a load signal took the replica out of readiness, by signal",
+    ["reason"],
 )
 
 # Application-level metrics
@@ -29,7 +86,139 @@ predict_errors_total = Counter(
     "Total prediction errors",
 )
 
+# Per model version, to compare a canary with the stable version
+predict_version_requests_total = Counter(
+    "predict_version_requests_total",
+    "Prediction requests served, by model version",
+    ["model_version"],
+)
+
+predict_version_latency_ms = Histogram(
+    "predict_version_latency_ms",
+    "Prediction latency in milliseconds, by model version",
+    ["model_version"],
+    buckets=LATENCY_BUCKETS_MS,
+)
+
+predict_version_labels_total = Counter(
+    "predict_version_labels_total",
+    "Predicted labels, by model version",
+    ["model_version", "label"],
+)
+
+predict_ws_connections = Gauge(
+    "predict_ws_connections",
+    "Open /predict/ws connections",
+)
+
+predict_ws_messages_total = Counter(
+    "predict_ws_messages_total",
+    "Scoring messages handled on /predict/ws, by outcome",
+    ["status"],
+)
+
+predict_coalesced_requests_total = Counter(
+    "predict_coalesced_requests_total",
+    "Prediction requests that shared an identical in-flight computation",
+)
+
+predict_batch_queue_wait_seconds = Histogram(
+    "predict_batch_queue_wait_seconds",
+    "Time a request waited in the micro-batching queue",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025),
+)
+
+predict_batch_size_items = Histogram(
+    "predict_batch_size_items",
+    "Inputs scored per micro-batch",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+predict_batch_flushes_total = Counter(
+    "predict_batch_flushes_total",
+    "Micro-batches flushed, by trigger",
+    ["reason"],
+)
+
+secret_scan_findings_total = Counter(
+    "secret_scan_findings_total",
+    "Secrets found in request texts by the secret scan, by kind",
+    ["kind"],
+)
+
+# Response compression
+response_compression_ratio = Histogram(
+    "response_compression_ratio",
+    "Uncompressed over compressed size of compressed response bodies",
+    ["encoding"],
+    buckets=(1, 1.5, 2, 3, 4, 6, 8, 12, 16, 24, 32),
+)
+
+response_compression_seconds = Histogram(
+    "response_compression_seconds",
+    "Time spent compressing a response body",
+    ["encoding"],
+    buckets=log_linear_buckets(0.000001, 1),
+)
+
 audit_write_errors_total = Counter(
     "audit_write_errors_total",
     "Total audit log write failures",
 )
+
+logs_dropped_total = Counter(
+    "logs_dropped_total",
+    "Log records not written: queue_full (drop policy) or sampled",
+    ["reason"],
+)
+
+
+class LRUCacheCollector(Collector):
+    """
+    Exports a ``functools.lru_cache``'s own statistics at scrape time.
+
+    Reading ``cache_info()`` on scrape keeps metric updates off the cached
+    call path, where a counter increment would cost more than the hit itself.
+    """
+
+    def __init__(self, prefix: str, description: str, cache_info: Callable[[], Any]) -> None:
+        self._prefix = prefix
+        self._description = description
+        self._cache_info = cache_info
+
+    def collect(self) -> Iterator[CounterMetricFamily | GaugeMetricFamily]:
+        info = self._cache_info()
+        yield CounterMetricFamily(
+            f"{self._prefix}_hits", f"{self._description} served from the cache", value=info.hits
+        )
+        yield CounterMetricFamily(
+            f"{self._prefix}_misses", f"{self._description} that missed the cache", value=info.misses
+        )
+        yield GaugeMetricFamily(
+            f"{self._prefix}_size", "Entries currently held in the cache", value=info.currsize
+        )
+
+
+def register_lru_cache(prefix: str, description: str, cache_info: Callable[[], Any]) -> None:
+    """Expose ``<prefix>_hits_total``, ``<prefix>_misses_total`` and ``<prefix>_size``."""
+    REGISTRY.register(LRUCacheCollector(prefix, description, cache_info))
+
+
+# Model lifecycle
+model_warmup_seconds = Histogram(
+    "model_warmup_seconds",
+    "Duration of the synthetic warm-up pass run before publishing a model",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+
+# Startup
+startup_phase_seconds = Gauge(
+    "startup_phase_seconds",
+    "Duration of each startup phase in seconds",
+    ["phase"],
+)
+
+startup_time_to_ready_seconds = Gauge(
+    "startup_time_to_ready_seconds",
+    "Seconds from process start until the service reported ready",
+)
@@ -0,0 +1,40 @@
+"""Load-aware readiness decisions with hysteresis."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+from app.observability.metrics import readiness_trips_total
+
+
+class ReadinessGate:
+    """
+    Decides which load signals should take a replica out of rotation.
+
+    A signal trips when it rises above its limit and stays tripped until it
+    falls to ``recovery_ratio`` times the limit or below, so a value hovering
+    around the limit does not flip readiness on every probe. Limits of 0
+    disable a signal.
+    """
+
+    def __init__(self, limits: Mapping[str, float], recovery_ratio: float = 0.8) -> None:
+        if not 0 <= recovery_ratio <= 1:
+            raise ValueError(f"recovery_ratio must be between 0 and 1, got {recovery_ratio}")
+        self.limits = {name: limit for name, limit in limits.items() if limit > 0}
+        self.recovery_ratio = recovery_ratio
+        self._tripped: set[str] = set()
+
+    def check(self, signals: Mapping[str, float]) -> dict[str, dict[str, float]]:
+        """Tripped signals with their value and limit; empty means ready."""
+        for name, limit in self.limits.items():
+            value = signals[name]
+            if name in self._tripped:
+                if value <= limit * self.recovery_ratio:
+                    self._tripped.discard(name)
+            elif value > limit:
+                self._tripped.add(name)
+                readiness_trips_total.labels(reason=name).inc()
+        return {
+            name: {"value": signals[name], "limit": self.limits[name]}
+            for name in sorted(self._tripped)
+        }
@@ -0,0 +1,52 @@
+"""Startup timing: per-phase durations and time from process start to ready."""
+
+from __future__ import annotations
+
+import os
+import time
+
+from app.observability.metrics import startup_phase_seconds, startup_time_to_ready_seconds
+
+_MODULE_IMPORTED_AT = time.monotonic()
+
+
+def process_uptime_seconds() -> float:
+    """
+    Seconds since this process was started.
+
+    Uses /proc on Linux so interpreter start-up and imports are included;
+    elsewhere falls back to the time since this module was imported.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 (starttime) follows the parenthesised command name
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return time.monotonic() - _MODULE_IMPORTED_AT
+
+
+class StartupTimer:
+    """Records how long each lifespan startup phase takes."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {"imports": process_uptime_seconds()}
+        self._last = time.monotonic()
+        startup_phase_seconds.labels(phase="imports").set(self.phases["imports"])
+
+    def mark(self, phase: str) -> float:
+        """Close the current phase and return its duration in seconds."""
+        now = time.monotonic()
+        elapsed = now - self._last
+        self._last = now
+        self.phases[phase] = elapsed
+        startup_phase_seconds.labels(phase=phase).set(elapsed)
+        return elapsed
+
+    def ready(self) -> float:
+        """Record the total time from process start until the service is ready."""
+        total = process_uptime_seconds()
+        startup_time_to_ready_seconds.set(total)
+        return total
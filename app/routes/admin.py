@@ -0,0 +1,70 @@
+"""Admin-only memory diagnostics endpoints."""
+
+from __future__ import annotations
+
+import hmac
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import ADMIN_DIAGNOSTICS, ADMIN_TOKEN
+from app.observability.memory import MemoryDiagnostics, live_objects
+
+_diagnostics = MemoryDiagnostics()
+
+
+def require_admin(x_admin_token: str = Header("", alias="X-Admin-Token")) -> None:
+    """404 unless diagnostics are enabled, 403 unless the admin token matches."""
+    if not ADMIN_DIAGNOSTICS:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not ADMIN_TOKEN or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin/memory", dependencies=[Depends(require_admin)])
+
+
+@router.get("")
+async def memory_status() -> dict[str, Any]:
+    """tracemalloc state and the ids of the kept snapshots."""
+    return _diagnostics.status()
+
+
+@router.post("/tracemalloc/start")
+async def start_tracing(frames: int = 1) -> dict[str, Any]:
+    """Start tracing allocations, keeping ``frames`` frames per traceback."""
+    if not 1 <= frames <= 64:
+        raise HTTPException(status_code=422, detail="frames must be between 1 and 64")
+    return _diagnostics.start(frames)
+
+
+@router.post("/tracemalloc/stop")
+async def stop_tracing() -> dict[str, Any]:
+    """Stop tracing and free the traces and snapshots."""
+    return _diagnostics.stop()
+
+
+@router.post("/snapshots")
+async def take_snapshot() -> dict[str, int]:
+    # Snapshotting copies every trace; keep it off the event loop
+    try:
+        return {"id": await run_in_threadpool(_diagnostics.snapshot)}
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+@router.get("/diff")
+async def diff_snapshots(before: int, after: int, limit: int = 20) -> dict[str, Any]:
+    """Largest allocation changes from snapshot ``before`` to ``after``, by file:line."""
+    try:
+        stats = await run_in_threadpool(_diagnostics.diff, before, after, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"before": before, "after": after, "top": stats}
+
+
+@router.get("/objects")
+async def object_counts() -> dict[str, int]:
+    """Live Prediction, PredictResponse, CompiledModel and artifact dict counts."""
+    return await run_in_threadpool(live_objects)
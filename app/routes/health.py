@@ -2,14 +2,36 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from fastapi import APIRouter, Response
 
+from app.config import (
+    READY_MAX_IN_FLIGHT,
+    READY_MAX_LOG_QUEUE,
+    READY_MAX_LOOP_LAG_MS,
+    READY_RECOVERY_RATIO,
+    READY_UNREADY_WHILE_RELOADING,
+)
 from app.models.loader import ModelRegistry
+from app.observability.logging import log_queue_depth
+from app.observability.loop_monitor import LoopMonitor
+from app.observability.readiness import ReadinessGate
 
 router = APIRouter()
 
 # Will be set by main.py at startup
 _registry: ModelRegistry | None = None
+_monitor: LoopMonitor | None = None
+
+_gate = ReadinessGate(
+    {
+        "in_flight": READY_MAX_IN_FLIGHT,
+        "loop_lag_ms": READY_MAX_LOOP_LAG_MS,
+        "log_queue": READY_MAX_LOG_QUEUE,
+    },
+    recovery_ratio=READY_RECOVERY_RATIO,
+)
 
 
 def set_registry(registry: ModelRegistry) -> None:
@@ -17,6 +39,22 @@ def set_registry(registry: ModelRegistry) -> None:
     _registry = registry
 
 
+def set_monitor(monitor: LoopMonitor) -> None:
+    global _monitor
+    _monitor = monitor
+
+
+def _load_signals() -> dict[str, float]:
+    if _monitor is None:
+        return {"in_flight": 0, "loop_lag_ms": 0, "log_queue": log_queue_depth()}
+    return {
+        # The probe itself is one of the requests in flight
+        "in_flight": max(0, _monitor.in_flight - 1),
+        "loop_lag_ms": round(_monitor.recent_lag_s * 1000, 3),
+        "log_queue": log_queue_depth(),
+    }
+
+
 @router.get("/healthz")
 async def healthz() -> dict[str, str]:
     """Liveness probe -- always returns 200."""
@@ -24,9 +62,18 @@ async def healthz() -> dict[str, str]:
 
 
 @router.get("/readyz")
-async def readyz(response: Response) -> dict[str, str]:
-    """Readiness probe -- 200 if model loaded, else 503."""
-    if _registry is not None and _registry.is_loaded:
-        return {"status": "ready"}
-    response.status_code = 503
-    return {"status": "not_ready"}
+async def readyz(response: Response) -> dict[str, Any]:
+    """
+    Readiness probe -- 200 if the model is loaded and no load limit is
+    exceeded, else 503 with the reasons.
+    """
+    if _registry is None or not _registry.is_loaded:
+        response.status_code = 503
+        return {"status": "not_ready", "reasons": {"model_not_loaded": {}}}
+    reasons: dict[str, Any] = _gate.check(_load_signals()) if _gate.limits else {}
+    if READY_UNREADY_WHILE_RELOADING and _registry.reloading:
+        reasons["model_reload"] = {}
+    if reasons:
+        response.status_code = 503
+        return {"status": "not_ready", "reasons": reasons}
+    return {"status": "ready"}
@@ -2,16 +2,15 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Response
+from fastapi import APIRouter, Request, Response
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from app.compression import compressed_response
+
 router = APIRouter()
 
 
 @router.get("/metrics")
-async def metrics() -> Response:
-    """Expose Prometheus metrics in text format."""
-    return Response(
-        content=generate_latest(),
-        media_type=CONTENT_TYPE_LATEST,
-    )
+async def metrics(request: Request) -> Response:
+    """Expose Prometheus metrics in text format (compressed when the scraper accepts it)."""
+    return await compressed_response(request, generate_latest(), media_type=CONTENT_TYPE_LATEST)
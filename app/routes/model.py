@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
 
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 
 from app.models.loader import ModelRegistry
 from app.models.schemas import ModelInfo
@@ -13,6 +16,8 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 _registry: ModelRegistry | None = None
+# Set by the pre-fork launcher: reloads every worker, returns each one's outcome
+_reload_all: Callable[[], Awaitable[dict[str, dict[str, str]]]] | None = None
 
 
 def set_registry(registry: ModelRegistry) -> None:
@@ -20,6 +25,13 @@ def set_registry(registry: ModelRegistry) -> None:
     _registry = registry
 
 
+def set_reload_coordinator(
+    reload_all: Callable[[], Awaitable[dict[str, dict[str, str]]]] | None,
+) -> None:
+    global _reload_all
+    _reload_all = reload_all
+
+
 @router.get("/model", response_model=ModelInfo)
 async def get_model() -> ModelInfo:
     """Return metadata for the currently loaded model."""
@@ -30,11 +42,29 @@ async def get_model() -> ModelInfo:
 
 
 @router.post("/model/reload")
-async def reload_model() -> dict[str, str]:
+async def reload_model() -> dict[str, Any]:
     """Reload model manifest and switch active model without restart."""
     if _registry is None:
         raise RuntimeError("Registry not initialized")
-    _registry.reload()
+    if _reload_all is not None:
+        # Under app.serve every worker reloads, not just the one that got
+        # this request; fail unless they all did
+        workers = await _reload_all()
+        failed = {pid: outcome for pid, outcome in workers.items() if "error" in outcome}
+        if failed:
+            raise RuntimeError(f"Reload failed in workers: {failed}")
+        logger.info(
+            "Model reloaded in all workers via API",
+            extra={"model_version": _registry.active_version, "workers": len(workers)},
+        )
+        return {
+            "status": "reloaded",
+            "model_version": _registry.active_version,
+            "workers": workers,
+        }
+    # Compiling the decision table and warming up take milliseconds of CPU;
+    # keep them off the event loop so in-flight requests are not stalled
+    await run_in_threadpool(_registry.reload)
     logger.info(
         "Model reloaded via API",
         extra={"model_version": _registry.active_version},
@@ -2,35 +2,70 @@
 
 from __future__ import annotations
 
-import hashlib
 import logging
 import time
+from collections import Counter
+from pathlib import Path
 
-from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi import APIRouter, Header, HTTPException, Request, Response
 
-from app.config import AUDIT_LOG_FILE
+from app import checksums, compression, wire_format
+from app.config import (
+    AUDIT_LOG_FILE,
+    CAPTURE_FILE,
+    CAPTURE_SAMPLE_RATE,
+    PREDICT_BATCH_MAX_ITEMS,
+    PREDICT_BATCH_WINDOW_MS,
+    PREDICT_BATCHING,
+    PREDICT_COALESCING,
+    SECRET_SCAN_MODE,
+)
 from app.guardrails.identity import hash_email
 from app.guardrails.policy import check_policy_block
+from app.guardrails.secrets import scan_texts
+from app.models.batching import MicroBatcher
+from app.models.coalescing import SingleFlight
+from app.models.compiled import CompiledModel
 from app.models.loader import ModelRegistry
+from app.models.results import (
+    ScoredItem,
+    encode_predict_response,
+    input_features,
+    score_inputs,
+)
 from app.models.schemas import (
-    ErrorResponse,
-    ModelBlock,
-    Prediction,
+    InputItem,
     PredictRequest,
     PredictResponse,
     generate_request_id,
 )
-from app.models.scorer import score_input
 from app.observability.audit import write_audit_record
+from app.observability.capture import TrafficCapture
 from app.observability.metrics import (
     predict_errors_total,
     predict_requests_total,
+    predict_version_labels_total,
+    predict_version_latency_ms,
+    predict_version_requests_total,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=wire_format.MsgpackRoute)
 logger = logging.getLogger(__name__)
 
 _registry: ModelRegistry | None = None
+_coalescer = SingleFlight()
+_batcher: MicroBatcher | None = (
+    MicroBatcher(
+        lambda user_hash: _registry.route(user_hash) if _registry is not None else None,
+        window_ms=PREDICT_BATCH_WINDOW_MS,
+        max_items=PREDICT_BATCH_MAX_ITEMS,
+    )
+    if PREDICT_BATCHING
+    else None
+)
+_capture: TrafficCapture | None = (
+    TrafficCapture(Path(CAPTURE_FILE), CAPTURE_SAMPLE_RATE) if CAPTURE_FILE else None
+)
 
 
 def set_registry(registry: ModelRegistry) -> None:
@@ -38,14 +73,107 @@ def set_registry(registry: ModelRegistry) -> None:
     _registry = registry
 
 
-@router.post("/predict", response_model=PredictResponse)
+def _canonical_inputs(inputs: list[InputItem]) -> tuple[tuple[object, ...], ...]:
+    """Hashable form of the scoring inputs, used as the coalescing key."""
+    return tuple((inp.id, *input_features(inp)) for inp in inputs)
+
+
+async def _score_request(
+    inputs: list[InputItem], model: CompiledModel, user_hash: str
+) -> tuple[CompiledModel, list[ScoredItem]]:
+    """
+    Score one request's inputs and return them with the model that scored them.
+
+    With micro-batching enabled the inputs join the next batch, which routes
+    the user again against the traffic split current when it is flushed.
+    """
+    if _batcher is not None:
+        return await _batcher.submit(inputs, user_hash)
+    return model, score_inputs(inputs, model)
+
+
+def _blocked(
+    guardrail: str,
+    detail: str,
+    *,
+    start: int,
+    arrived_at: float,
+    request_id: str,
+    user_hash: str,
+    inputs: list[InputItem],
+    capture: TrafficCapture | None,
+) -> HTTPException:
+    """Audit (and capture) a request rejected by a guardrail; returns the 400 to raise."""
+    latency_us = (time.perf_counter_ns() - start) // 1000
+    latency_ms = latency_us // 1000
+    predict_errors_total.inc()
+    model_version = _registry.active_version if _registry else "unknown"
+
+    # Write audit record for blocked request
+    write_audit_record(
+        AUDIT_LOG_FILE,
+        request_id=request_id,
+        user_hash=user_hash,
+        route="/predict",
+        model_version=model_version,
+        artifact_checksum_sha256=_registry.active_checksum if _registry else "",
+        num_inputs=len(inputs),
+        guardrails_triggered=[guardrail],
+        status="blocked",
+        latency_ms=latency_ms,
+        latency_us=latency_us,
+        response_checksum="",
+        response_checksum_alg="",
+        response_format="",
+    )
+    if capture is not None:
+        capture.record(
+            arrived_at=arrived_at,
+            request_id=request_id,
+            user_hash=user_hash,
+            inputs=inputs,
+            status="blocked",
+            latency_ms=latency_ms,
+            model_version=model_version,
+            labels=[],
+        )
+
+    return HTTPException(
+        status_code=400,
+        detail={
+            "error": guardrail,
+            "detail": detail,
+            "request_id": request_id,
+            "guardrails_triggered": [guardrail],
+        },
+    )
+
+
+_MSGPACK_REQUEST_SCHEMA = {"$ref": "#/components/schemas/PredictRequest"}
+_MSGPACK_RESPONSE_SCHEMA = {"$ref": "#/components/schemas/PredictResponse"}
+
+
+@router.post(
+    "/predict",
+    response_model=PredictResponse,
+    openapi_extra={
+        "requestBody": {
+            "content": {wire_format.MSGPACK: {"schema": _MSGPACK_REQUEST_SCHEMA}}
+        },
+        "responses": {
+            "200": {"content": {wire_format.MSGPACK: {"schema": _MSGPACK_RESPONSE_SCHEMA}}}
+        },
+    },
+)
 async def predict(
     body: PredictRequest,
     request: Request,
     x_user_email: str = Header(..., alias="X-User-Email"),
-) -> PredictResponse | ErrorResponse:
-    start = time.monotonic()
+) -> Response:
+    start = time.perf_counter_ns()
+    arrived_at = time.time()
     predict_requests_total.inc()
+    capture = _capture if _capture is not None and _capture.sampled() else None
 
     # Generate or use provided request_id
     request_id = body.request_id or generate_request_id()
@@ -56,90 +184,83 @@ async def predict(
     # Check for policy violations
     input_texts = [inp.text for inp in body.inputs]
     if check_policy_block(input_texts):
-        latency_ms = int((time.monotonic() - start) * 1000)
-        predict_errors_total.inc()
-
-        # Write audit record for blocked request
-        write_audit_record(
-            AUDIT_LOG_FILE,
+        raise _blocked(
+            "policy_block",
+            "Input contains disallowed content",
+            start=start,
+            arrived_at=arrived_at,
             request_id=request_id,
             user_hash=user_hash,
-            route="/predict",
-            model_version=_registry.active_version if _registry else "unknown",
-            artifact_checksum_sha256=_registry.active_checksum if _registry else "",
-            num_inputs=len(body.inputs),
-            guardrails_triggered=["policy_block"],
-            status="blocked",
-            latency_ms=latency_ms,
-            response_checksum_sha256="",
+            inputs=body.inputs,
+            capture=capture,
         )
 
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "error": "policy_block",
-                "detail": "Input contains disallowed content",
-                "request_id": request_id,
-                "guardrails_triggered": ["policy_block"],
-            },
+    # Scan for credentials and emails before anything is scored or audited
+    scanned_texts, secrets_found = scan_texts(input_texts, SECRET_SCAN_MODE)
+    guardrails_triggered = ["secret_scan"] if secrets_found else []
+    if secrets_found and SECRET_SCAN_MODE == "block":
+        raise _blocked(
+            "secret_scan",
+            "Input contains credentials or personal data",
+            start=start,
+            arrived_at=arrived_at,
+            request_id=request_id,
+            user_hash=user_hash,
+            inputs=body.inputs,
+            capture=capture,
         )
+    inputs = body.inputs
+    if secrets_found:
+        inputs = [
+            inp if text is inp.text else inp.model_copy(update={"text": text})
+            for inp, text in zip(inputs, scanned_texts)
+        ]
 
-    if _registry is None or not _registry.is_loaded or _registry.active_model is None:
+    # Route the user to a version of the current traffic split; the snapshot
+    # stays in use for this request even if a reload publishes a new split
+    compiled = _registry.route(user_hash) if _registry is not None else None
+    if compiled is None:
         predict_errors_total.inc()
         raise HTTPException(status_code=503, detail="Model not loaded")
 
-    # Score each input
-    # Support both "config" (old format) and "rule_config" (new format)
-    config = _registry.active_model.get("config") or _registry.active_model.get("rule_config")
-    if not config:
-        predict_errors_total.inc()
-        raise HTTPException(status_code=500, detail="Model config not found")
-    
-    predictions: list[Prediction] = []
     try:
-        for inp in body.inputs:
-            features = inp.features
-            price = features.price if features else 0.0
-            units = features.units if features else 0
-            channel = features.channel if features else "direct"
-
-            score, label, reasons = score_input(
-                text=inp.text,
-                price=price,
-                units=units,
-                channel=channel,
-                config=config,
-            )
-
-            predictions.append(
-                Prediction(
-                    id=inp.id,
-                    label=label,
-                    score=score,
-                    reasons=reasons,
-                )
+        if PREDICT_COALESCING:
+            key = (compiled.checksum, _canonical_inputs(inputs))
+            model, scored = await _coalescer.do(
+                key, lambda: _score_request(inputs, compiled, user_hash)
             )
+        else:
+            model, scored = await _score_request(inputs, compiled, user_hash)
     except Exception as exc:
         predict_errors_total.inc()
         logger.exception("Scoring error")
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-    latency_ms = int((time.monotonic() - start) * 1000)
+    model_version = model.version
+    artifact_checksum = model.checksum
+    elapsed_ns = time.perf_counter_ns() - start
+    latency_us = elapsed_ns // 1000
+    latency_ms = latency_us // 1000
 
-    response = PredictResponse(
+    # JSON: the same bytes as PredictResponse.model_dump_json(); MessagePack
+    # when the client prefers it. Reason strings are only materialized here
+    response_format = wire_format.negotiate(request.headers.get("accept", ""))
+    encode = (
+        wire_format.encode_predict_response
+        if response_format == wire_format.MSGPACK
+        else encode_predict_response
+    )
+    body_bytes = encode(
         request_id=request_id,
-        model=ModelBlock(
-            model_version=_registry.active_version,
-            artifact_checksum_sha256=_registry.active_checksum,
-        ),
-        predictions=predictions,
-        guardrails_triggered=[],
+        model=model,
+        items=scored,
+        guardrails_triggered=guardrails_triggered,
         latency_ms=latency_ms,
     )
 
-    # Compute response checksum for audit
-    response_json = response.model_dump_json()
-    response_checksum = hashlib.sha256(response_json.encode()).hexdigest()
+    # Compute response checksum for audit, over the body bytes as sent
+    checksum_alg = checksums.algorithm()
+    response_checksum = checksums.digest(body_bytes, checksum_alg)
 
     # Write audit record
     write_audit_record(
@@ -147,23 +268,44 @@ async def predict(
         request_id=request_id,
         user_hash=user_hash,
         route="/predict",
-        model_version=_registry.active_version,
-        artifact_checksum_sha256=_registry.active_checksum,
+        model_version=model_version,
+        artifact_checksum_sha256=artifact_checksum,
         num_inputs=len(body.inputs),
-        guardrails_triggered=[],
+        guardrails_triggered=guardrails_triggered,
         status="success",
         latency_ms=latency_ms,
-        response_checksum_sha256=response_checksum,
+        latency_us=latency_us,
+        response_checksum=response_checksum,
+        response_checksum_alg=checksum_alg,
+        response_format=response_format,
     )
+    if capture is not None:
+        capture.record(
+            arrived_at=arrived_at,
+            request_id=request_id,
+            user_hash=user_hash,
+            inputs=inputs,
+            status="success",
+            latency_ms=latency_ms,
+            model_version=model_version,
+            labels=[item.label for item in scored],
+        )
+
+    predict_version_requests_total.labels(model_version=model_version).inc()
+    predict_version_latency_ms.labels(model_version=model_version).observe(elapsed_ns / 1e6)
+    for label, count in Counter(item.label for item in scored).items():
+        predict_version_labels_total.labels(model_version=model_version, label=label).inc(count)
 
     logger.info(
         "Prediction served",
         extra={
             "request_id": request_id,
-            "model_version": _registry.active_version,
+            "model_version": model_version,
             "num_inputs": len(body.inputs),
             "latency_ms": latency_ms,
         },
     )
 
-    return response
+    return await compression.compressed_response(
+        request, body_bytes, media_type=response_format, headers={"Vary": "Accept"}
+    )
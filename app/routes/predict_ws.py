@@ -0,0 +1,179 @@
+"""WebSocket /predict/ws: one-item scoring messages over a persistent connection."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from app import checksums
+from app.config import (
+    AUDIT_LOG_FILE,
+    SECRET_SCAN_MODE,
+    WS_AUDIT_BATCH_RECORDS,
+    WS_AUDIT_FLUSH_MS,
+)
+from app.guardrails.identity import hash_email
+from app.guardrails.policy import check_policy_block
+from app.guardrails.secrets import scan_texts
+from app.json_backend import dumps
+from app.models.loader import ModelRegistry
+from app.models.results import score_inputs
+from app.models.schemas import InputItem, generate_request_id
+from app.observability.audit import AuditBuffer
+from app.observability.metrics import (
+    predict_version_labels_total,
+    predict_version_latency_ms,
+    predict_version_requests_total,
+    predict_ws_connections,
+    predict_ws_messages_total,
+)
+
+router = APIRouter()
+
+_registry: ModelRegistry | None = None
+
+
+def set_registry(registry: ModelRegistry) -> None:
+    global _registry
+    _registry = registry
+
+
+def _message_id(raw: str) -> Any:
+    try:
+        message = json.loads(raw)
+    except ValueError:
+        return None
+    return message.get("id") if isinstance(message, dict) else None
+
+
+def _error(message_id: Any, error: str, detail: str) -> bytes:
+    predict_ws_messages_total.labels(status=error).inc()
+    return dumps({"id": message_id, "error": error, "detail": detail})
+
+
+def _handle(raw: str, user_hash: str, connection_id: str, audit: AuditBuffer) -> bytes:
+    """Score one message and return the reply; guardrails and audit as on /predict."""
+    start = time.perf_counter_ns()
+    try:
+        inp = InputItem.model_validate_json(raw)
+    except ValidationError as exc:
+        detail = "; ".join(
+            f"{'.'.join(map(str, error['loc'])) or 'message'}: {error['msg']}"
+            for error in exc.errors()
+        )
+        return _error(_message_id(raw), "invalid_input", detail)
+
+    compiled = _registry.route(user_hash) if _registry is not None else None
+    if compiled is None:
+        return _error(inp.id, "model_not_loaded", "Model not loaded")
+    fields = {
+        "request_id": f"{connection_id}:{inp.id}",
+        "user_hash": user_hash,
+        "route": "/predict/ws",
+        "model_version": compiled.version,
+        "artifact_checksum_sha256": compiled.checksum,
+        "num_inputs": 1,
+    }
+
+    guardrail = ""
+    guardrails_triggered: list[str] = []
+    if check_policy_block([inp.text]):
+        guardrail, detail = "policy_block", "Input contains disallowed content"
+    else:
+        [text], secrets_found = scan_texts([inp.text], SECRET_SCAN_MODE)
+        if secrets_found:
+            guardrails_triggered = ["secret_scan"]
+            if SECRET_SCAN_MODE == "block":
+                guardrail, detail = "secret_scan", "Input contains credentials or personal data"
+            elif text is not inp.text:
+                inp = inp.model_copy(update={"text": text})
+    if guardrail:
+        latency_us = (time.perf_counter_ns() - start) // 1000
+        audit.add(
+            **fields,
+            guardrails_triggered=[guardrail],
+            status="blocked",
+            latency_ms=latency_us // 1000,
+            latency_us=latency_us,
+            response_checksum="",
+            response_checksum_alg="",
+            response_format="",
+        )
+        return _error(inp.id, guardrail, detail)
+
+    [item] = score_inputs([inp], compiled)
+    elapsed_ns = time.perf_counter_ns() - start
+    latency_us = elapsed_ns // 1000
+    body = dumps(
+        {
+            "id": inp.id,
+            "label": item.label,
+            "score": item.score,
+            "reasons": [compiled.reasons[code] for code in item.reason_codes],
+            "model_version": compiled.version,
+            "guardrails_triggered": guardrails_triggered,
+            "latency_us": latency_us,
+        }
+    )
+    checksum_alg = checksums.algorithm()
+    audit.add(
+        **fields,
+        guardrails_triggered=guardrails_triggered,
+        status="success",
+        latency_ms=latency_us // 1000,
+        latency_us=latency_us,
+        response_checksum=checksums.digest(body, checksum_alg),
+        response_checksum_alg=checksum_alg,
+        response_format="application/json",
+    )
+    predict_ws_messages_total.labels(status="success").inc()
+    predict_version_requests_total.labels(model_version=compiled.version).inc()
+    predict_version_latency_ms.labels(model_version=compiled.version).observe(elapsed_ns / 1e6)
+    predict_version_labels_total.labels(model_version=compiled.version, label=item.label).inc()
+    return body
+
+
+async def _flush_periodically(audit: AuditBuffer) -> None:
+    while True:
+        await asyncio.sleep(WS_AUDIT_FLUSH_MS / 1000)
+        audit.flush()
+
+
+@router.websocket("/predict/ws")
+async def predict_ws(websocket: WebSocket) -> None:
+    """
+    Persistent scoring channel.
+
+    The caller identifies once with the ``X-User-Email`` handshake header,
+    then sends one ``InputItem`` JSON object per text frame and gets one
+    reply per message, in order, carrying the same ``id``: the prediction
+    with its ``model_version``, or ``{"id", "error", "detail"}``. Each
+    message is routed on its own against the current traffic split, so it
+    sees one consistent model version and reloads apply to open connections.
+    """
+    email = websocket.headers.get("x-user-email", "")
+    if not email.strip():
+        await websocket.close(code=1008, reason="X-User-Email header is required")
+        return
+    await websocket.accept()
+    user_hash = hash_email(email)
+    connection_id = generate_request_id()
+    audit = AuditBuffer(AUDIT_LOG_FILE, WS_AUDIT_BATCH_RECORDS)
+    flusher = asyncio.create_task(_flush_periodically(audit))
+    predict_ws_connections.inc()
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            reply = _handle(raw, user_hash, connection_id, audit)
+            await websocket.send_text(reply.decode("utf-8"))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        flusher.cancel()
+        audit.flush()
+        predict_ws_connections.dec()
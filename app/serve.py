@@ -0,0 +1,478 @@
+"""Pre-fork production launcher: one listening socket, N uvicorn workers.
+
+Usage: python -m app.serve [--host 0.0.0.0] [--port 8000] [--workers N]
+                           [--pin-cpus] [--backlog 2048]
+
+The launcher loads and compiles the model registry once, freezes the
+garbage collector's view of it (``gc.freeze``, so collections in the workers
+do not write to those pages) and only then forks, so every worker starts
+with the model in memory shared copy-on-write. Workers accept on the
+inherited socket and run uvicorn with uvloop and httptools when they are
+installed (asyncio and h11 otherwise). With ``--pin-cpus`` worker ``i`` is
+bound to the ``i``-th CPU the launcher may run on, round robin.
+
+Each worker keeps a control channel (a Unix socket pair) to the launcher.
+``POST /model/reload`` on any worker asks the launcher, which reloads its
+own registry first (so workers forked later start on the new version) and
+then has every worker reload; the request returns once all of them have
+answered, with each worker's version or error. ``SIGHUP`` to the launcher
+does the same without a request. Workers that die are forked again, at
+most once a second per slot; ``SIGTERM``/``SIGINT`` shut all of them down
+gracefully.
+
+Prometheus metrics stay per worker: a scrape of ``/metrics`` reports the
+worker that answered it. With more than one worker set ``AUDIT_SHARDING=1``
+so each worker appends to its own audit shard.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import importlib.util
+import itertools
+import json
+import logging
+import os
+import selectors
+import signal
+import socket
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.config import (
+    AUDIT_SHARDING,
+    SERVE_PIN_CPUS,
+    SERVE_RELOAD_TIMEOUT_S,
+    SERVE_WORKERS,
+)
+
+# Named explicitly: under ``python -m`` this module is __main__
+logger = logging.getLogger("app.serve")
+
+# Seconds a stopping worker gets to finish in-flight requests before SIGKILL
+GRACEFUL_SHUTDOWN_S = 30
+# Minimum seconds between two forks of the same worker slot
+RESPAWN_INTERVAL_S = 1.0
+
+
+def event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def usable_cpus() -> list[int]:
+    """CPUs this process may run on (all of them where affinity is unsupported)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _listen(host: str, port: int, backlog: int) -> socket.socket:
+    """An inheritable listening TCP socket."""
+    family, kind, proto, _, address = socket.getaddrinfo(
+        host, port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE
+    )[0]
+    # The protocol is passed explicitly: asyncio only sets TCP_NODELAY on
+    # accepted sockets whose proto is IPPROTO_TCP, and without it every
+    # response waits ~40 ms on Nagle and delayed ACKs
+    sock = socket.socket(family, kind, proto)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(address)
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _send(sock: socket.socket, message: dict[str, Any]) -> None:
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+
+class WorkerControl:
+    """
+    A worker's end of the control channel.
+
+    ``reload_all`` asks the launcher for a coordinated reload and waits for
+    its summary; reload orders from the launcher are carried out on the
+    thread pool while the channel keeps being read.
+    """
+
+    def __init__(self, channel: socket.socket, registry: Any) -> None:
+        self._channel = channel
+        self._registry = registry
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future[dict[str, Any]]] = {}
+        self._writer: asyncio.StreamWriter | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def start(self) -> None:
+        reader, self._writer = await asyncio.open_unix_connection(sock=self._channel)
+        self._spawn(self._read(reader))
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        while line := await reader.readline():
+            try:
+                message = json.loads(line)
+            except ValueError:
+                logger.warning("Malformed control message skipped")
+                continue
+            if message["op"] == "reload":
+                self._spawn(self._reload(message["id"]))
+            elif message["op"] == "reload_done":
+                future = self._pending.pop(message["id"], None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+
+    async def _reload(self, reload_id: int) -> None:
+        from fastapi.concurrency import run_in_threadpool
+
+        reply: dict[str, Any] = {"op": "reloaded", "id": reload_id}
+        try:
+            await run_in_threadpool(self._registry.reload)
+            reply["model_version"] = self._registry.active_version
+        except Exception as exc:
+            logger.exception("Coordinated model reload failed")
+            reply["error"] = str(exc)
+        self._write(reply)
+
+    def _write(self, message: dict[str, Any]) -> None:
+        assert self._writer is not None, "control channel not started"
+        self._writer.write(json.dumps(message).encode() + b"\n")
+
+    async def reload_all(self) -> dict[str, dict[str, str]]:
+        """Reload the model in every worker; outcome per worker pid."""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._write({"op": "reload", "id": request_id})
+        try:
+            done = await asyncio.wait_for(future, SERVE_RELOAD_TIMEOUT_S + 5)
+        finally:
+            self._pending.pop(request_id, None)
+        if "error" in done:
+            raise RuntimeError(done["error"])
+        return done["workers"]
+
+
+@dataclass
+class _Worker:
+    slot: int
+    pid: int
+    channel: socket.socket
+    buffer: bytes = b""
+
+
+@dataclass
+class _Reload:
+    """A coordinated reload in progress."""
+
+    requester: tuple[int, int] | None  # (worker pid, its request id); None for SIGHUP
+    waiting: set[int]
+    deadline: float
+    results: dict[str, dict[str, str]] = field(default_factory=dict)
+
+
+class Launcher:
+    """Forks and supervises the workers and coordinates reloads between them."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        workers: int,
+        pin_cpus: bool = False,
+        backlog: int = 2048,
+    ) -> None:
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if pin_cpus and not hasattr(os, "sched_setaffinity"):
+            raise ValueError("CPU pinning needs os.sched_setaffinity (Linux)")
+        self.workers = workers
+        self.cpus = usable_cpus() if pin_cpus else []
+        self.backlog = backlog
+        self.sock = _listen(host, port, backlog)
+        self.address = self.sock.getsockname()[:2]
+        self._selector = selectors.DefaultSelector()
+        self._workers: dict[int, _Worker] = {}
+        self._respawn: dict[int, float] = {}  # slot -> earliest fork time
+        self._last_fork: dict[int, float] = {}
+        self._reloads: dict[int, _Reload] = {}
+        self._reload_ids = itertools.count(1)
+        self._stopping = False
+        self._reload_requested = False
+        self._registry: Any = None
+
+    # --- parent side -----------------------------------------------------
+
+    def run(self) -> None:
+        from app.main import registry
+
+        self._registry = registry
+        registry.load()
+        gc.collect()
+        gc.freeze()
+        logger.info(
+            "Launcher ready",
+            extra={
+                "host": self.address[0],
+                "port": self.address[1],
+                "workers": self.workers,
+                "model_version": registry.active_version,
+                "loop": event_loop(),
+                "http": http_protocol(),
+                "pinned_cpus": self.cpus,
+            },
+        )
+        if self.workers > 1 and not AUDIT_SHARDING:
+            logger.warning("Several workers share audit.jsonl; set AUDIT_SHARDING=1")
+
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_hup)
+        for slot in range(self.workers):
+            self._fork(slot)
+        try:
+            while not self._stopping:
+                self._tick()
+        finally:
+            self._shutdown()
+
+    def _on_stop(self, signum: int, frame: Any) -> None:
+        self._stopping = True
+
+    def _on_hup(self, signum: int, frame: Any) -> None:
+        self._reload_requested = True
+
+    def _tick(self) -> None:
+        for key, _ in self._selector.select(timeout=0.2):
+            self._read(key.data)
+        self._reap()
+        now = time.monotonic()
+        for slot, at in list(self._respawn.items()):
+            if at <= now and not self._stopping:
+                del self._respawn[slot]
+                self._fork(slot)
+        if self._reload_requested:
+            self._reload_requested = False
+            self._start_reload(None)
+        for reload_id, reload in list(self._reloads.items()):
+            if reload.waiting and now >= reload.deadline:
+                for pid in reload.waiting:
+                    reload.results[str(pid)] = {"error": "timed out"}
+                reload.waiting.clear()
+            if not reload.waiting:
+                self._finish_reload(reload_id)
+
+    def _read(self, worker: _Worker) -> None:
+        try:
+            data = worker.channel.recv(65536)
+        except OSError:
+            data = b""
+        if not data:
+            self._selector.unregister(worker.channel)
+            return
+        worker.buffer += data
+        *lines, worker.buffer = worker.buffer.split(b"\n")
+        for line in lines:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                logger.warning("Malformed control message skipped", extra={"pid": worker.pid})
+                continue
+            if message["op"] == "reload":
+                self._start_reload((worker.pid, message["id"]))
+            elif message["op"] == "reloaded":
+                reload = self._reloads.get(message["id"])
+                if reload is not None:
+                    reload.waiting.discard(worker.pid)
+                    outcome = {
+                        key: message[key] for key in ("model_version", "error") if key in message
+                    }
+                    reload.results[str(worker.pid)] = outcome
+
+    def _start_reload(self, requester: tuple[int, int] | None) -> None:
+        # The launcher reloads first: a bad manifest fails here, before any
+        # worker changes, and workers forked afterwards inherit the new models
+        try:
+            self._registry.reload()
+        except Exception as exc:
+            logger.exception("Coordinated model reload failed in the launcher")
+            self._reply(requester, {"error": f"launcher: {exc}"})
+            return
+        reload_id = next(self._reload_ids)
+        self._reloads[reload_id] = _Reload(
+            requester, set(self._workers), time.monotonic() + SERVE_RELOAD_TIMEOUT_S
+        )
+        for worker in self._workers.values():
+            try:
+                _send(worker.channel, {"op": "reload", "id": reload_id})
+            except OSError:
+                pass  # exiting; _reap drops it from the reload
+
+    def _finish_reload(self, reload_id: int) -> None:
+        reload = self._reloads.pop(reload_id)
+        logger.info(
+            "Coordinated model reload finished",
+            extra={"model_version": self._registry.active_version, "workers": reload.results},
+        )
+        self._reply(reload.requester, {"workers": reload.results})
+
+    def _reply(self, requester: tuple[int, int] | None, message: dict[str, Any]) -> None:
+        if requester is None:
+            return
+        pid, request_id = requester
+        worker = self._workers.get(pid)
+        if worker is not None:
+            try:
+                _send(worker.channel, {"op": "reload_done", "id": request_id, **message})
+            except OSError:
+                pass
+
+    def _reap(self) -> None:
+        while self._workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            worker = self._workers.pop(pid, None)
+            if worker is None:
+                continue
+            try:
+                self._selector.unregister(worker.channel)
+            except (KeyError, ValueError):
+                pass
+            worker.channel.close()
+            for reload in self._reloads.values():
+                if pid in reload.waiting:
+                    reload.waiting.discard(pid)
+                    reload.results[str(pid)] = {"error": "worker exited"}
+            if not self._stopping:
+                logger.warning(
+                    "Worker exited; forking a replacement",
+                    extra={"pid": pid, "slot": worker.slot, "status": status},
+                )
+                earliest = self._last_fork.get(worker.slot, 0.0) + RESPAWN_INTERVAL_S
+                self._respawn[worker.slot] = max(earliest, time.monotonic())
+
+    def _shutdown(self) -> None:
+        logger.info("Launcher stopping workers", extra={"workers": len(self._workers)})
+        for pid in self._workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + GRACEFUL_SHUTDOWN_S
+        while self._workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+        for pid in self._workers:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        while self._workers:
+            pid, _ = os.waitpid(next(iter(self._workers)), 0)
+            self._workers.pop(pid, None)
+        self.sock.close()
+
+    def _fork(self, slot: int) -> None:
+        parent_end, worker_end = socket.socketpair()
+        self._last_fork[slot] = time.monotonic()
+        pid = os.fork()
+        if pid == 0:
+            parent_end.close()
+            code = 1
+            try:
+                self._run_worker(slot, worker_end)
+                code = 0
+            except BaseException:
+                logger.exception("Worker failed")
+            finally:
+                logging.shutdown()
+                os._exit(code)
+        worker_end.close()
+        parent_end.setblocking(False)
+        worker = _Worker(slot, pid, parent_end)
+        self._workers[pid] = worker
+        self._selector.register(parent_end, selectors.EVENT_READ, worker)
+
+    # --- worker side -----------------------------------------------------
+
+    def _run_worker(self, slot: int, channel: socket.socket) -> None:
+        # The launcher's handlers only set its own flags; uvicorn installs
+        # the worker's, and reloads come over the channel, not SIGHUP
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        self._selector.close()
+        for worker in self._workers.values():
+            worker.channel.close()
+        self._workers.clear()
+        if self.cpus:
+            os.sched_setaffinity(0, {self.cpus[slot % len(self.cpus)]})
+
+        import uvicorn
+
+        from app.main import app, registry
+        from app.routes import model
+
+        control = WorkerControl(channel, registry)
+        model.set_reload_coordinator(control.reload_all)
+        config = uvicorn.Config(
+            app,
+            loop=event_loop(),
+            http=http_protocol(),
+            lifespan="on",
+            log_config=None,
+            backlog=self.backlog,
+            timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_S,
+        )
+        server = uvicorn.Server(config)
+        config.setup_event_loop()
+
+        async def serve() -> None:
+            await control.start()
+            await server.serve(sockets=[self.sock])
+
+        asyncio.run(serve())
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=SERVE_WORKERS or len(usable_cpus()),
+        help="worker processes (default: SERVE_WORKERS, else one per usable CPU)",
+    )
+    parser.add_argument("--pin-cpus", action="store_true", default=SERVE_PIN_CPUS)
+    parser.add_argument("--backlog", type=int, default=2048)
+    args = parser.parse_args(argv)
+
+    from app.observability.logging import setup_logging
+
+    # Synchronous logging in the launcher: no writer thread to carry into a fork
+    setup_logging(queue_size=0)
+    try:
+        launcher = Launcher(args.host, args.port, args.workers, args.pin_cpus, args.backlog)
+    except (ValueError, OSError) as exc:
+        parser.error(str(exc))
+    launcher.run()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
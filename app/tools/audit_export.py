@@ -0,0 +1,38 @@
+"""Convert new audit log lines into columnar part files.
+
+Usage: python -m app.tools.audit_export OUT_DIR [--audit-file audit.jsonl]
+       [--format arrow|npz] [--rows-per-part 1000000]
+
+Writes Arrow IPC parts when pyarrow is installed, ``.npz`` parts when only
+numpy is, and only reads what was appended since the previous run (tracked
+in ``OUT_DIR/state.json``); run it from cron as often as needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from app.config import AUDIT_LOG_FILE
+from app.observability.audit_columnar import FORMATS, export_audit
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--audit-file", type=Path, default=AUDIT_LOG_FILE)
+    parser.add_argument("--format", choices=sorted(FORMATS), default=None)
+    parser.add_argument("--rows-per-part", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        parts = export_audit(args.audit_file, args.out_dir, args.format, args.rows_per_part)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    print(f"{len(parts)} new parts in {time.perf_counter() - start:.2f}s: {' '.join(parts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Print the audit log and all its worker shards as one timestamp-ordered stream.
+
+Usage: python -m app.tools.audit_merge [AUDIT_FILE] [--output MERGED.jsonl]
+
+AUDIT_FILE defaults to the configured ``audit_logs/audit.jsonl``; shards are
+the ``audit.<worker>.jsonl`` files next to it. Lines are copied unchanged, so
+the output can be fed to anything that reads a single ``audit.jsonl``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from app.config import AUDIT_LOG_FILE
+from app.observability.audit import read_audit_lines
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("audit_file", type=Path, nargs="?", default=AUDIT_LOG_FILE)
+    parser.add_argument("--output", type=Path, help="write here instead of stdout")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for line in read_audit_lines(args.audit_file):
+            out.write(line + "\n")
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
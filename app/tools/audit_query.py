@@ -0,0 +1,51 @@
+"""Per-version latency percentiles and block rates from a columnar audit export.
+
+Usage: python -m app.tools.audit_query OUT_DIR [--since 2026-01-01T00:00:00+00:00]
+
+OUT_DIR is a directory written by ``app.tools.audit_export``; needs numpy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.observability.audit_columnar import read_columns, version_stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--since", help="ISO timestamp; only records at or after it")
+    args = parser.parse_args(argv)
+
+    since_us = None
+    if args.since:
+        since = datetime.fromisoformat(args.since)
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        since_us = int(since.timestamp() * 1_000_000)
+
+    start = time.perf_counter()
+    try:
+        columns = read_columns(args.out_dir)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    rows = version_stats(columns, since_us)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'version':<12} {'requests':>10} {'blocked':>8} {'block %':>8} "
+          f"{'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+    for row in rows:
+        print(
+            f"{row['model_version']:<12} {row['requests']:>10} {row['blocked']:>8} "
+            f"{row['block_rate'] * 100:>8.2f} {row['p50_ms']:>9.3f} {row['p90_ms']:>9.3f} "
+            f"{row['p99_ms']:>9.3f}"
+        )
+    print(f"{len(columns['timestamp_us'])} records in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Convert a JSON model artifact to the compact binary format.
+
+Usage: python -m app.tools.convert_artifact SRC.json DST.rtcb [--checksums CHECKSUMS.json]
+
+With ``--checksums`` the SHA-256 of the new file is recorded under its file
+name so the registry can validate it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from app.models.binary_artifact import convert_json_artifact
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("src", type=Path)
+    parser.add_argument("dst", type=Path)
+    parser.add_argument("--checksums", type=Path, help="CHECKSUMS.json to update")
+    args = parser.parse_args(argv)
+
+    checksum = convert_json_artifact(args.src, args.dst)
+    print(f"{args.dst}: {args.dst.stat().st_size} bytes, sha256 {checksum}")
+
+    if args.checksums:
+        checksums = json.loads(args.checksums.read_text())
+        checksums[args.dst.name] = checksum
+        args.checksums.write_text(json.dumps(checksums, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
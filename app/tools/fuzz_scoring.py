@@ -0,0 +1,267 @@
+"""Differential fuzzing of every scoring engine against ``score_input``.
+
+Generates random rule configs in both artifact formats (old ``config`` with
+``condition`` strings, new ``rule_config`` with ``if_<feature>_<op>`` keys)
+and inputs clustered on and around every rule threshold, then checks that
+each engine reproduces the reference interpreter exactly:
+
+- ``table``: ``CompiledModel`` with its precomputed decision table
+- ``interpreted``: ``CompiledModel`` with the table disabled
+- ``batch``: ``CompiledModel.score_batch`` against per-item scoring
+- ``binary``: the artifact round-tripped through the binary format
+- ``encoder``: ``encode_predict_response`` against ``PredictResponse`` JSON
+
+Scores are compared by ``repr`` so -0.0 and 0.0 are told apart.
+
+Usage: python -m app.tools.fuzz_scoring [--seconds 60] [--workers N] [--seed 0]
+
+Runs until the time is up, spreading seeds over worker processes, and exits
+non-zero with the failing seed on the first mismatch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from app.models.binary_artifact import BinaryArtifact, encode_artifact
+from app.models.compiled import CompiledModel
+from app.models.results import ScoredItem, encode_predict_response
+from app.models.schemas import ModelBlock, Prediction, PredictResponse
+from app.models.scorer import THRESHOLD_KEYS, rule_conditions, score_input
+
+CHANNELS = ["amazon", "ebay", "shopify", "direct", "walmart", "other", "Mixed"]
+KEYWORDS = ["urgent", "rush", "refund", "fraud", "Chargeback", "launch", "ab", "a", "é"]
+PRICE_THRESHOLDS = [0, 0.1, 9.99, 10, 10.0, 29.999, 30, 80, 500, 1000, 1e-7, 2.5, 1e9]
+UNITS_THRESHOLDS = [0, 1, 4, 5, 99, 100, 500, 10**6]
+OLD_OPERATORS = [">", ">=", "<", "<=", "=="]
+
+Case = tuple[str, float, int, str]
+
+
+def _weight(rng: random.Random) -> float:
+    return rng.choice(
+        [0.0, -0.0, 0.1, 0.35, -0.05, round(rng.uniform(-0.5, 0.6), 2), rng.uniform(-1, 1)]
+    )
+
+
+def _numeric_rules(rng: random.Random, feature: str, old: bool) -> list[dict[str, Any]]:
+    pool = PRICE_THRESHOLDS if feature == "price" else UNITS_THRESHOLDS
+    rules = []
+    for i in range(rng.randint(0, 4)):
+        threshold = rng.choice(pool) if rng.random() < 0.8 else round(rng.uniform(-10, 2000), 2)
+        reason = rng.choice([f"{feature}_{i}", "shared_reason"])
+        if old:
+            if feature == "units":
+                threshold = int(threshold)
+            condition = f"{feature} {rng.choice(OLD_OPERATORS)} {threshold}"
+            if rng.random() < 0.05:
+                condition = f"{feature} >="  # malformed: never matches
+            rules.append({"condition": condition, "contribution": _weight(rng), "reason": reason})
+        else:
+            rule: dict[str, Any] = {"add": _weight(rng), "reason": reason}
+            # Mostly one condition; sometimes several (any one matches)
+            for key in rng.sample(list(THRESHOLD_KEYS), 2 if rng.random() < 0.1 else 1):
+                rule[f"if_{feature}_{key}"] = threshold
+                threshold = rng.choice(pool)
+            rules.append(rule)
+    return rules
+
+
+def random_artifact(rng: random.Random, old: bool) -> dict[str, Any]:
+    """A random artifact in the old (``config``) or new (``rule_config``) format."""
+    low = round(rng.uniform(0.0, 0.6), rng.choice([2, 6]))
+    medium = round(rng.uniform(low, 1.0), rng.choice([2, 6]))
+    text_rules = []
+    for i in range(rng.randint(0, 4)):
+        reason = rng.choice([f"text_{i}", "shared_reason"])
+        if old:
+            keyword = rng.choice(KEYWORDS)
+            text_rules.append({"keyword": keyword, "contribution": _weight(rng), "reason": reason})
+        else:
+            keywords = rng.sample(KEYWORDS, rng.randint(0, 3))
+            text_rules.append({"keywords_any": keywords, "add": _weight(rng), "reason": reason})
+    config = {
+        "base_score": rng.choice([0.0, 0.1, 0.3, round(rng.uniform(-0.2, 0.8), 3)]),
+        "channel_weights": {
+            name: _weight(rng) for name in rng.sample(CHANNELS, rng.randint(0, len(CHANNELS)))
+        },
+        "price_rules": _numeric_rules(rng, "price", old),
+        "units_rules": _numeric_rules(rng, "units", old),
+        "text_rules": text_rules,
+        "risk_thresholds" if old else "thresholds": {
+            "low_risk_max": low,
+            "medium_risk_max": medium,
+        },
+    }
+    return {
+        "model_name": "risk_triad_classifier",
+        "model_version": "fuzz",
+        "config" if old else "rule_config": config,
+    }
+
+
+def _near(value: float) -> list[float]:
+    value = float(value)
+    below, above = math.nextafter(value, -math.inf), math.nextafter(value, math.inf)
+    return [value, below, above, value - 1, value + 1]
+
+
+def random_cases(rng: random.Random, config: dict[str, Any], n: int) -> list[Case]:
+    """Inputs on, just below and just above every threshold, plus odd values."""
+    prices = [0.0, -1.0, 1e12, math.inf, -math.inf, math.nan]
+    units = [0, -1, 10**9]
+    for rule in config["price_rules"]:
+        for _, threshold in rule_conditions(rule, "price"):
+            prices += _near(threshold)
+    for rule in config["units_rules"]:
+        for _, threshold in rule_conditions(rule, "units"):
+            units += [math.floor(threshold) + d for d in (-1, 0, 1)] + [math.ceil(threshold)]
+    channels = [*config["channel_weights"], "AMAZON", "unknown", ""]
+    cases = []
+    for _ in range(n):
+        words = rng.sample(KEYWORDS, rng.randint(0, 3))
+        text = " ".join(w.upper() if rng.random() < 0.3 else w for w in words) or "plain"
+        price = rng.choice(prices) if rng.random() < 0.9 else rng.uniform(-100, 2000)
+        cases.append((text, price, rng.choice(units), rng.choice(channels)))
+    return cases
+
+
+def _canonical(outcome: tuple[float, str, list[str]]) -> tuple[str, str, list[str]]:
+    score, label, reasons = outcome
+    return repr(score), label, list(reasons)
+
+
+def check_artifact(artifact: dict[str, Any], cases: list[Case], workdir: Path) -> list[str]:
+    """Mismatches between the reference scorer and every engine, as readable lines."""
+    config = artifact.get("config") or artifact.get("rule_config")
+    expected = [_canonical(score_input(t, p, u, c, config)) for t, p, u, c in cases]
+    mismatches: list[str] = []
+
+    def compare(engine: str, model: CompiledModel) -> None:
+        for case, want in zip(cases, expected):
+            got = _canonical(model.score(*case))
+            if got != want:
+                mismatches.append(f"{engine}: {case!r} -> {got} (expected {want})")
+
+    compile_args = {"version": "fuzz", "checksum": "0" * 64, "artifact_path": ""}
+    table = CompiledModel.compile(artifact, **compile_args)
+    compare("table", table)
+    interpreted = CompiledModel.compile(artifact, decision_table_max_entries=0, **compile_args)
+    compare("interpreted", interpreted)
+
+    outcomes = table.score_batch(cases)
+    for case, want, (score, label, codes) in zip(cases, expected, outcomes):
+        got = _canonical((score, label, [table.reasons[code] for code in codes]))
+        if got != want:
+            mismatches.append(f"batch: {case!r} -> {got} (expected {want})")
+
+    try:
+        encoded = encode_artifact(artifact)
+    except ValueError:
+        encoded = None  # several conditions on one rule: not representable
+    if encoded is not None:
+        path = workdir / "fuzz.rtcb"
+        path.write_bytes(encoded)
+        with BinaryArtifact(path) as binary:
+            decoded, matcher = binary.to_artifact(), binary.keyword_matcher()
+        compare("binary", CompiledModel.compile(decoded, keyword_matcher=matcher, **compile_args))
+
+    block = ModelBlock(model_version=table.version, artifact_checksum_sha256=table.checksum)
+    for start in range(0, len(cases), 50):
+        items = [
+            ScoredItem(f"item-{start + i}", score, label, codes)
+            for i, (score, label, codes) in enumerate(outcomes[start : start + 50])
+        ]
+        body = encode_predict_response(
+            request_id="fuzz", model=table, items=items, guardrails_triggered=[], latency_ms=0
+        )
+        reference = PredictResponse(
+            request_id="fuzz",
+            model=block,
+            predictions=[
+                Prediction(
+                    id=item.id,
+                    label=item.label,
+                    score=item.score,
+                    reasons=[table.reasons[code] for code in item.reason_codes],
+                )
+                for item in items
+            ],
+            latency_ms=0,
+        ).model_dump_json().encode()
+        if body != reference:
+            mismatches.append(f"encoder: {body[:200]!r} != {reference[:200]!r}")
+    return mismatches
+
+
+def run_seed(seed: int, cases_per_config: int, workdir: Path) -> tuple[int, list[str]]:
+    """Fuzz one config per artifact format from ``seed``; returns (cases, mismatches)."""
+    rng = random.Random(seed)
+    total = 0
+    mismatches: list[str] = []
+    for old in (False, True):
+        artifact = random_artifact(rng, old)
+        config = artifact.get("config") or artifact.get("rule_config")
+        cases = random_cases(rng, config, cases_per_config)
+        total += len(cases)
+        label = f"seed {seed} ({'old' if old else 'new'} format)"
+        mismatches += [f"{label}: {m}" for m in check_artifact(artifact, cases, workdir)]
+    return total, mismatches
+
+
+def _worker(args: tuple[int, int, int, float]) -> tuple[int, int, list[str]]:
+    first_seed, stride, cases_per_config, deadline = args
+    seeds = cases = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        seed = first_seed
+        while time.time() < deadline:
+            n, mismatches = run_seed(seed, cases_per_config, Path(tmp))
+            seeds += 1
+            cases += n
+            if mismatches:
+                return seeds, cases, mismatches
+            seed += stride
+    return seeds, cases, []
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases-per-config", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    deadline = time.time() + args.seconds
+    jobs = [
+        (args.seed + i, args.workers, args.cases_per_config, deadline)
+        for i in range(args.workers)
+    ]
+    start = time.perf_counter()
+    with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+        results = pool.map(_worker, jobs)
+    elapsed = time.perf_counter() - start
+
+    seeds = sum(r[0] for r in results)
+    cases = sum(r[1] for r in results)
+    mismatches = [m for r in results for m in r[2]]
+    print(
+        f"{cases} cases from {seeds} seeds ({2 * seeds} configs) in {elapsed:.1f}s "
+        f"on {args.workers} workers: {cases / elapsed * 60 / 1e6:.2f}M cases/min"
+    )
+    for line in mismatches[:20]:
+        print(line)
+    if mismatches:
+        raise SystemExit(f"{len(mismatches)} mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Report the slowest imports on the service's start-up path.
+
+Runs a fresh interpreter with ``-X importtime`` so the numbers reflect a cold
+process, then prints the top modules by cumulative and self time.
+
+Usage: python -m app.tools.import_profile [--module app.main] [--top 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+
+def profile_imports(module: str) -> list[tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) for every import of ``module``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows: list[tuple[str, int, int]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rows = profile_imports(args.module)
+    total_us = max(cumulative for _, _, cumulative in rows)
+    print(f"import {args.module}: {total_us / 1000:.1f} ms total, {len(rows)} modules\n")
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module (top {args.top} by cumulative)")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: -r[2])[: args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    print(f"\n{'self ms':>9}  module (top {args.top} by self time)")
+    for name, self_us, _ in sorted(rows, key=lambda r: -r[1])[: args.top]:
+        print(f"{self_us / 1000:>9.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Replay captured /predict traffic against a running instance.
+
+Reads a capture written with ``CAPTURE_FILE`` and re-issues every request on
+its original schedule, scaled by ``--speed`` (``1`` = real time, ``10`` = ten
+times faster, ``max`` = all at once). Scheduling is open-loop: each request is
+sent at its scheduled time whether or not earlier ones have completed, and
+response time is measured from that scheduled time, so a slow server shows up
+as queueing in the percentiles instead of silently lowering the offered rate
+(coordinated omission). Service time, measured from the actual send, is
+reported alongside.
+
+Labels in the replayed responses are compared with the captured ones. Captured
+texts are redacted, so inputs whose rules matched an email or token may differ
+for that reason alone.
+
+Usage: python -m app.tools.replay CAPTURE [--url http://127.0.0.1:8000]
+       [--speed 1|N|max] [--max-in-flight N] [--show-diffs 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+
+class ReplayResult:
+    """Outcome of one replayed request."""
+
+    __slots__ = ("record", "status_code", "response_ms", "service_ms", "labels", "error")
+
+    def __init__(
+        self,
+        record: dict[str, Any],
+        status_code: int | None,
+        response_ms: float,
+        service_ms: float,
+        labels: list[str],
+        error: str = "",
+    ) -> None:
+        self.record = record
+        self.status_code = status_code
+        self.response_ms = response_ms
+        self.service_ms = service_ms
+        self.labels = labels
+        self.error = error
+
+
+def load_capture(path: Path) -> list[dict[str, Any]]:
+    """Captured records in arrival order."""
+    with open(path, "rb") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    records.sort(key=lambda r: r["t"])
+    return records
+
+
+def schedule(records: list[dict[str, Any]], speed: float | None) -> list[float]:
+    """Send offsets in seconds from the replay start (``speed=None`` means max)."""
+    if not records or speed is None:
+        return [0.0] * len(records)
+    first = records[0]["t"]
+    return [(r["t"] - first) / speed for r in records]
+
+
+def replay_email(user_hash: str) -> str:
+    """A stable stand-in identity, so one captured user stays one replayed user."""
+    return f"replay-{user_hash[:16]}@replay.invalid"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    record: dict[str, Any],
+    due: float,
+    limiter: asyncio.Semaphore | None,
+) -> ReplayResult:
+    delay = due - time.perf_counter()
+    if delay > 0:
+        await asyncio.sleep(delay)
+    payload = {"request_id": record["request_id"], "inputs": record["inputs"]}
+    headers = {"X-User-Email": replay_email(record["user_hash"])}
+    if limiter is not None:
+        await limiter.acquire()
+    sent = time.perf_counter()
+    try:
+        response = await client.post("/predict", json=payload, headers=headers)
+    except httpx.HTTPError as exc:
+        now = time.perf_counter()
+        return ReplayResult(record, None, (now - due) * 1000, (now - sent) * 1000, [], repr(exc))
+    finally:
+        if limiter is not None:
+            limiter.release()
+    now = time.perf_counter()
+    labels = []
+    if response.status_code == 200:
+        labels = [p["label"] for p in response.json()["predictions"]]
+    return ReplayResult(
+        record, response.status_code, (now - due) * 1000, (now - sent) * 1000, labels
+    )
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    records: list[dict[str, Any]],
+    speed: float | None = 1.0,
+    max_in_flight: int | None = None,
+) -> list[ReplayResult]:
+    """Re-issue ``records`` open-loop and return one result per record, in order."""
+    limiter = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+    start = time.perf_counter()
+    tasks = [
+        asyncio.create_task(_send(client, record, start + offset, limiter))
+        for record, offset in zip(records, schedule(records, speed))
+    ]
+    return list(await asyncio.gather(*tasks))
+
+
+_EXPECTED_STATUS = {"success": 200, "blocked": 400}
+
+
+def diff_labels(results: list[ReplayResult]) -> list[str]:
+    """Human-readable differences between captured and replayed outcomes."""
+    diffs = []
+    for result in results:
+        record = result.record
+        expected = _EXPECTED_STATUS.get(record["status"])
+        if result.status_code != expected:
+            diffs.append(
+                f"{record['request_id']}: status {result.status_code} "
+                f"(captured {record['status']}){' ' + result.error if result.error else ''}"
+            )
+            continue
+        for inp, before, after in zip(record["inputs"], record["labels"], result.labels):
+            if before != after:
+                diffs.append(f"{record['request_id']}/{inp['id']}: {before} -> {after}")
+    return diffs
+
+
+def report(results: list[ReplayResult], elapsed_s: float, show_diffs: int) -> str:
+    lines = [
+        f"requests: {len(results)} in {elapsed_s:.2f}s "
+        f"({len(results) / elapsed_s if elapsed_s else 0:.1f} req/s)"
+    ]
+    statuses: dict[str, int] = {}
+    for result in results:
+        key = str(result.status_code) if result.status_code is not None else "error"
+        statuses[key] = statuses.get(key, 0) + 1
+    lines.append("status: " + ", ".join(f"{k}={v}" for k, v in sorted(statuses.items())))
+    for name, values in (
+        ("response ms", [r.response_ms for r in results]),
+        ("service ms", [r.service_ms for r in results]),
+    ):
+        lines.append(
+            f"{name:<12} p50={percentile(values, 50):.2f} p90={percentile(values, 90):.2f} "
+            f"p99={percentile(values, 99):.2f} max={max(values, default=0.0):.2f}"
+        )
+    diffs = diff_labels(results)
+    lines.append(f"diffs: {len(diffs)}")
+    lines.extend(f"  {d}" for d in diffs[:show_diffs])
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", type=Path)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--speed", default="1", help="time scale: 1, N or max")
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument("--show-diffs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    speed = None if args.speed == "max" else float(args.speed)
+    records = load_capture(args.capture)
+
+    async def run() -> tuple[list[ReplayResult], float]:
+        limits = httpx.Limits(max_connections=args.max_in_flight)
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30) as client:
+            start = time.perf_counter()
+            results = await replay(client, records, speed, args.max_in_flight)
+            return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(run())
+    print(report(results, elapsed, args.show_diffs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""/predict wire formats: JSON and, when the msgpack package is installed, MessagePack.
+
+The request format follows ``Content-Type`` and the response format is
+negotiated from ``Accept``; JSON stays the default on both sides. Routes
+built with ``MsgpackRoute`` unpack a MessagePack body into plain objects and
+hand them to FastAPI's usual body validation, so the request model, its
+error responses and the OpenAPI schema are shared with JSON and no JSON text
+is produced on the way. A MessagePack response is packed from the scored
+items, with the same structure and values as the JSON body.
+"""
+
+from __future__ import annotations
+
+import weakref
+from typing import Any, Callable, Coroutine
+
+from fastapi import HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+
+from app.models.compiled import CompiledModel
+from app.models.results import ScoredItem
+from app.models.schemas import ModelBlock
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised when msgpack is installed
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+# Older clients still send the unregistered x- type
+_MSGPACK_ALIASES = frozenset((MSGPACK, "application/x-msgpack"))
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def media_type(content_type: str) -> str:
+    """The bare, lower-cased media type of a Content-Type header value."""
+    return content_type.partition(";")[0].strip().lower()
+
+
+def is_msgpack(content_type: str) -> bool:
+    return media_type(content_type) in _MSGPACK_ALIASES
+
+
+def is_json(content_type: str) -> bool:
+    kind = media_type(content_type)
+    return not kind or kind == JSON or kind.endswith("+json")
+
+
+def _quality(params: list[str]) -> float:
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def negotiate(accept: str) -> str:
+    """
+    Response media type for an ``Accept`` header: ``MSGPACK`` or ``JSON``.
+
+    MessagePack is chosen only when msgpack is installed and the header ranks
+    it above JSON: a higher q-value, or an equal one with MessagePack named
+    explicitly and listed first. A missing header, wildcards alone or an
+    Accept that names neither get JSON.
+    """
+    if msgpack is None or not accept:
+        return JSON
+    # A range naming the type outranks a wildcard, whatever its q-value
+    explicit: dict[str, tuple[float, int]] = {}
+    wildcard: tuple[float, int] | None = None
+    for position, entry in enumerate(accept.split(",")):
+        kind, *params = entry.split(";")
+        kind = kind.strip().lower()
+        match = (_quality(params), -position)
+        if kind in _MSGPACK_ALIASES:
+            explicit.setdefault(MSGPACK, match)
+        elif kind == JSON:
+            explicit.setdefault(JSON, match)
+        elif kind in ("*/*", "application/*"):
+            wildcard = max(wildcard, match) if wildcard else match
+
+    def rank(offer: str) -> tuple[float, int, int]:
+        if offer in explicit:
+            q, position = explicit[offer]
+            return q, 1, position
+        if wildcard is not None:
+            return wildcard[0], 0, wildcard[1]
+        return 0.0, 0, 0
+
+    if rank(MSGPACK)[0] > 0 and rank(MSGPACK) > rank(JSON):
+        return MSGPACK
+    return JSON
+
+
+def unpack(raw: bytes) -> Any:
+    """Decode a MessagePack body; raises ``ValueError`` if it is malformed."""
+    if msgpack is None:
+        raise ValueError("MessagePack requested but msgpack is not installed")
+    try:
+        return msgpack.unpackb(raw)
+    except (ValueError, TypeError) as exc:  # ExtraData, FormatError, unhashable keys
+        raise ValueError(str(exc) or type(exc).__name__) from exc
+
+
+class MsgpackRoute(APIRoute):
+    """
+    Route accepting ``application/msgpack`` bodies wherever it accepts JSON.
+
+    A MessagePack request is decoded up front and passed on as if it had
+    been a JSON body that parsed to the same objects. Malformed bodies get
+    the 422 FastAPI gives invalid JSON; without msgpack installed they get
+    415.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if is_msgpack(request.headers.get("content-type", "")):
+                request = await _as_json_request(request)
+            return await handler(request)
+
+        return route_handler
+
+
+async def _as_json_request(request: Request) -> Request:
+    if msgpack is None:
+        raise HTTPException(status_code=415, detail="application/msgpack is not supported")
+    raw = await request.body()
+    try:
+        body = unpack(raw) if raw else None
+    except ValueError as exc:
+        raise RequestValidationError(
+            [
+                {
+                    "type": "msgpack_invalid",
+                    "loc": ("body",),
+                    "msg": "MessagePack decode error",
+                    "input": {},
+                    "ctx": {"error": str(exc)},
+                }
+            ]
+        ) from exc
+    headers = [(name, value) for name, value in request.scope["headers"] if name != b"content-type"]
+    scope = {**request.scope, "headers": [*headers, (b"content-type", JSON.encode())]}
+    decoded = Request(scope, request.receive)
+    decoded._body = raw
+    decoded._json = body
+    return decoded
+
+
+# Per model version: its model block and each distinct reason list, reused
+# across responses (weakly keyed, so a retired version drops its cache)
+_model_parts: weakref.WeakKeyDictionary[
+    CompiledModel, tuple[dict[str, str], dict[tuple[int, ...], list[str]]]
+] = weakref.WeakKeyDictionary()
+
+
+def encode_predict_response(
+    *,
+    request_id: str,
+    model: CompiledModel,
+    items: list[ScoredItem],
+    guardrails_triggered: list[str],
+    latency_ms: int,
+) -> bytes:
+    """
+    Encode a /predict response body as MessagePack.
+
+    Unpacks to the same object as the JSON body from
+    ``app.models.results.encode_predict_response`` (maps in the same key
+    order, scores as float64). The encoding is deterministic, so equal
+    responses give equal bytes and checksums.
+    """
+    if msgpack is None:
+        raise ValueError("MessagePack requested but msgpack is not installed")
+    parts = _model_parts.get(model)
+    if parts is None:
+        block = ModelBlock(model_version=model.version, artifact_checksum_sha256=model.checksum)
+        parts = _model_parts.setdefault(model, (block.model_dump(), {}))
+    model_block, reason_lists = parts
+    names = model.reasons
+    predictions = []
+    for item in items:
+        reasons = reason_lists.get(item.reason_codes)
+        if reasons is None:
+            reasons = reason_lists.setdefault(
+                item.reason_codes, [names[code] for code in item.reason_codes]
+            )
+        predictions.append(
+            {"id": item.id, "label": item.label, "score": item.score, "reasons": reasons}
+        )
+    return msgpack.packb(
+        {
+            "request_id": request_id,
+            "model": model_block,
+            "predictions": predictions,
+            "guardrails_triggered": guardrails_triggered,
+            "latency_ms": latency_ms,
+        }
+    )
@@ -0,0 +1,97 @@
+"""Allocations per scored item: pydantic predictions vs interned scored items.
+
+Usage: python -m benchmarks.bench_allocations [--requests 200] [--items 50]
+
+"pydantic" is the previous path: string reasons per item, a Prediction per
+item and PredictResponse.model_dump_json(). "interned" scores to reason-code
+tuples held in ScoredItem and encodes with encode_predict_response. Retained
+blocks/bytes count what the results of one request keep alive; peak bytes is
+tracemalloc's high-water mark while scoring and encoding one request.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+from app.config import MODEL_ARTIFACTS_DIR
+from app.models.compiled import CompiledModel
+from app.models.loader import read_artifact
+from app.models.results import ScoredItem, encode_predict_response
+from app.models.schemas import ModelBlock, Prediction, PredictResponse
+from benchmarks.bench_scoring import make_inputs
+
+
+def pydantic_path(model: CompiledModel, inputs, ids) -> tuple[object, bytes]:
+    predictions = []
+    for item_id, (text, price, units, channel) in zip(ids, inputs):
+        score, label, reasons = model.score(text, price, units, channel)
+        predictions.append(Prediction(id=item_id, label=label, score=score, reasons=reasons))
+    response = PredictResponse(
+        request_id="bench",
+        model=ModelBlock(model_version=model.version, artifact_checksum_sha256=model.checksum),
+        predictions=predictions,
+        latency_ms=0,
+    )
+    return predictions, response.model_dump_json().encode()
+
+
+def interned_path(model: CompiledModel, inputs, ids) -> tuple[object, bytes]:
+    items = [
+        ScoredItem(item_id, score, label, codes)
+        for item_id, (score, label, codes) in zip(ids, model.score_batch(inputs))
+    ]
+    body = encode_predict_response(
+        request_id="bench", model=model, items=items, guardrails_triggered=[], latency_ms=0
+    )
+    return items, body
+
+
+def measure(path, model, inputs, ids, requests: int) -> tuple[float, float, float, float]:
+    path(model, inputs, ids)  # prime caches (reason JSON, pydantic validators)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results, _ = path(model, inputs, ids)
+    after = tracemalloc.take_snapshot()
+    stats = after.compare_to(before, "lineno")
+    blocks = sum(max(s.count_diff, 0) for s in stats)
+    size = sum(max(s.size_diff, 0) for s in stats)
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    path(model, inputs, ids)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        path(model, inputs, ids)
+    elapsed = time.perf_counter() - start
+
+    n = len(inputs)
+    return blocks / n, size / n, (peak - base) / n, elapsed / (requests * n) * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--items", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    artifact, checksum, matcher = read_artifact(MODEL_ARTIFACTS_DIR / "model_v2.json")
+    model = CompiledModel.compile(
+        artifact, version="2.0.0", checksum=checksum, artifact_path="", keyword_matcher=matcher
+    )
+    inputs = make_inputs(args.items)
+    ids = [f"item-{i}" for i in range(args.items)]
+
+    print(f"{'path':<10} {'blocks/item':>12} {'bytes/item':>11} {'peak B/item':>12} {'us/item':>8}")
+    for name, path in (("pydantic", pydantic_path), ("interned", interned_path)):
+        blocks, size, peak, us = measure(path, model, inputs, ids, args.requests)
+        print(f"{name:<10} {blocks:>12.1f} {size:>11.0f} {peak:>12.0f} {us:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Artifact load time, JSON vs binary, as the rule set grows.
+
+Usage: python -m benchmarks.bench_artifact_load [--sizes 100 1000 10000 50000]
+
+Each size is the number of text-rule keywords; price/units rules grow with it.
+Reported times are the best of several read + compile passes, i.e. what the
+registry does before warm-up. RSS is the resident-memory growth of a fresh
+worker process that loads the artifact once and keeps the compiled model
+(Linux only; "-" elsewhere). Both formats decode into Python objects, so RSS
+grows with the rule set either way.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from app.models.binary_artifact import convert_json_artifact
+from app.models.compiled import CompiledModel
+from app.models.loader import read_artifact
+
+
+def synthetic_artifact(n_keywords: int) -> dict:
+    n_numeric = max(3, n_keywords // 100)
+    return {
+        "model_name": "risk_triad_classifier",
+        "model_version": f"bench-{n_keywords}",
+        "rule_config": {
+            "base_score": 0.1,
+            "channel_weights": {"amazon": 0.1, "walmart": 0.08, "other": 0.05},
+            "price_rules": [
+                {"if_price_gte": n_numeric - i, "add": 0.01, "reason": f"price_{i}"}
+                for i in range(n_numeric)
+            ],
+            "units_rules": [
+                {"if_units_gte": n_numeric - i, "add": 0.01, "reason": f"units_{i}"}
+                for i in range(n_numeric)
+            ],
+            "text_rules": [
+                {
+                    "keywords_any": [f"kw{r}_{k}" for k in range(n_keywords // 10)],
+                    "add": 0.02,
+                    "reason": f"text_{r}",
+                }
+                for r in range(10)
+            ],
+            "thresholds": {"low_risk_max": 0.33, "medium_risk_max": 0.66},
+        },
+    }
+
+
+def load(path: Path) -> CompiledModel:
+    artifact, checksum, matcher = read_artifact(path)
+    return CompiledModel.compile(
+        artifact,
+        version=artifact["model_version"],
+        checksum=checksum,
+        artifact_path=str(path),
+        keyword_matcher=matcher,
+    )
+
+
+def _rss_kb() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    raise OSError("VmRSS not reported")
+
+
+def _rss_growth_kb(path: Path) -> int:
+    before = _rss_kb()
+    model = load(path)
+    after = _rss_kb()
+    del model
+    return after - before
+
+
+def rss_growth(path: Path) -> str:
+    """Resident-memory growth (KB) of a fresh process loading ``path``."""
+    try:
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            return str(pool.apply(_rss_growth_kb, (path,)))
+    except OSError:
+        return "-"
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'keywords':>9} {'json KB':>9} {'bin KB':>8} {'json ms':>9} {'bin ms':>8}"
+        f" {'json RSS KB':>12} {'bin RSS KB':>11}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            src = Path(tmp) / f"model_{size}.json"
+            dst = Path(tmp) / f"model_{size}.rtcb"
+            src.write_text(json.dumps(synthetic_artifact(size), indent=2))
+            convert_json_artifact(src, dst)
+            json_s = best_of(lambda: load(src))
+            bin_s = best_of(lambda: load(dst))
+            print(
+                f"{size:>9} {src.stat().st_size / 1024:>9.1f} {dst.stat().st_size / 1024:>8.1f}"
+                f" {json_s * 1000:>9.2f} {bin_s * 1000:>8.2f}"
+                f" {rss_growth(src):>12} {rss_growth(dst):>11}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Response checksum cost per algorithm on real /predict response bodies.
+
+Usage: python -m benchmarks.bench_checksum [--sizes 1,50,1000,10000] [--seconds 0.5]
+
+Bodies are encoded with the /predict response encoder for batches of each
+size; "streamed" hashes the same body in 64 KB chunks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from app import checksums
+from app.config import MODEL_ARTIFACTS_DIR
+from app.models.compiled import CompiledModel
+from app.models.loader import read_artifact
+from app.models.results import ScoredItem, encode_predict_response
+from benchmarks.bench_scoring import make_inputs
+
+
+def per_call_us(fn, seconds: float) -> float:
+    fn()
+    calls = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds:
+        for _ in range(10):
+            fn()
+        calls += 10
+    return elapsed / calls * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1,50,1000,10000", help="items per response")
+    parser.add_argument("--seconds", type=float, default=0.5, help="time per measurement")
+    args = parser.parse_args(argv)
+
+    artifact, checksum, matcher = read_artifact(MODEL_ARTIFACTS_DIR / "model_v2.json")
+    model = CompiledModel.compile(
+        artifact, version="2.0.0", checksum=checksum, artifact_path="", keyword_matcher=matcher
+    )
+    names = checksums.available()
+    print(f"{'items':>6} {'bytes':>9}  " + "  ".join(f"{name:>9}" for name in names)
+          + f"  {'streamed':>9}   (us per response, streamed = {names[0]} in 64 KB chunks)")
+    for size in (int(s) for s in args.sizes.split(",")):
+        inputs = make_inputs(size)
+        items = [
+            ScoredItem(f"item-{i}", *outcome) for i, outcome in enumerate(model.score_batch(inputs))
+        ]
+        body = encode_predict_response(
+            request_id="bench", model=model, items=items, guardrails_triggered=[], latency_ms=3
+        )
+        chunks = [body[i : i + 65536] for i in range(0, len(body), 65536)]
+        row = [per_call_us(lambda n=name: checksums.digest(body, n), args.seconds) for name in names]
+        row.append(per_call_us(lambda: checksums.digest_chunks(chunks, names[0]), args.seconds))
+        print(f"{size:>6} {len(body):>9}  " + "  ".join(f"{us:>9.1f}" for us in row))
+
+
+if __name__ == "__main__":
+    main()
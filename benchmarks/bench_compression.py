@@ -0,0 +1,87 @@
+"""Response compression: bytes saved against CPU time, per encoding and level.
+
+Usage: python -m benchmarks.bench_compression [--repeat 1000]
+
+Bodies are a 1- and a 50-item /predict response and a /metrics scrape from
+an in-process app. Each encoding is timed at its fast default level and at
+the library default. The last line is the cost of handing a no-op to the
+thread pool and back, which is what compressing off the event loop adds per
+body and why only bodies of COMPRESSION_OFFLOAD_BYTES or more are offloaded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import tempfile
+import time
+
+import anyio
+import anyio.to_thread
+
+
+def per_call_us(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+async def thread_hop_us(repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await anyio.to_thread.run_sync(lambda: None)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    os.environ["AUDIT_LOG_DIR"] = tempfile.mkdtemp(prefix="bench_compression_")
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+
+    headers = {"X-User-Email": "bench@example.com", "Accept-Encoding": "identity"}
+    item = {
+        "id": "item-0",
+        "text": "Order for review",
+        "features": {"price": 250.0, "units": 5, "channel": "amazon"},
+    }
+    with TestClient(app) as client:
+        bodies = {
+            f"/predict, {count} items": client.post(
+                "/predict",
+                json={"inputs": [{**item, "id": f"item-{i}"} for i in range(count)]},
+                headers=headers,
+            ).content
+            for count in (1, 50)
+        }
+        bodies["/metrics"] = client.get("/metrics", headers=headers).content
+
+    codecs = [(f"gzip {level}", lambda b, level=level: gzip.compress(b, level, mtime=0))
+              for level in (1, 6)]
+    if zstandard is not None:
+        codecs += [(f"zstd {level}", zstandard.ZstdCompressor(level=level).compress)
+                   for level in (3, 9)]
+    print(f"{'body':<22} {'codec':<8} {'bytes':>7} {'ratio':>6} {'us':>7}")
+    for name, body in bodies.items():
+        print(f"{name:<22} {'none':<8} {len(body):>7}")
+        for codec, fn in codecs:
+            size = len(fn(body))
+            print(f"{'':<22} {codec:<8} {size:>7} {len(body) / size:>6.1f} "
+                  f"{per_call_us(lambda: fn(body), args.repeat):>7.1f}")
+    print(f"\nthread pool hand-off: {anyio.run(thread_hop_us, args.repeat):.1f} us")
+
+
+if __name__ == "__main__":
+    main()
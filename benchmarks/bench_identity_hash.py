@@ -0,0 +1,52 @@
+"""Per-call cost of email hashing: uncached vs the IdentityHasher cache.
+
+Usage: python -m benchmarks.bench_identity_hash [--calls 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import hmac
+import time
+
+from app.guardrails.identity import IdentityHasher
+
+
+def per_call_us(fn, emails: list[str]) -> float:
+    start = time.perf_counter()
+    for email in emails:
+        fn(email)
+    return (time.perf_counter() - start) / len(emails) * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=100, help="distinct emails (cache hit workload)")
+    args = parser.parse_args(argv)
+
+    repeated = [f"user{i % args.users}@example.com" for i in range(args.calls)]
+    unique = [f"user{i}@example.com" for i in range(args.calls)]
+    secret = b"benchmark-secret"
+
+    def sha256(email: str) -> str:
+        return hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()
+
+    def keyed(email: str) -> str:
+        return hmac.new(secret, email.strip().lower().encode("utf-8"), hashlib.sha256).hexdigest()
+
+    rows = [
+        ("sha256, uncached", per_call_us(sha256, repeated)),
+        ("sha256, cache hits", per_call_us(IdentityHasher().hash, repeated)),
+        ("sha256, cache misses", per_call_us(IdentityHasher().hash, unique)),
+        ("hmac, uncached", per_call_us(keyed, repeated)),
+        ("hmac, cache hits", per_call_us(IdentityHasher(secret="benchmark-secret").hash, repeated)),
+        ("hmac, cache misses", per_call_us(IdentityHasher(secret="benchmark-secret").hash, unique)),
+    ]
+    for name, us in rows:
+        print(f"{name:<24} {us:8.3f} us/call")
+
+
+if __name__ == "__main__":
+    main()
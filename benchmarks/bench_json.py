@@ -0,0 +1,100 @@
+"""JSON encode cost per request: response body, audit record and log line.
+
+Usage: python -m benchmarks.bench_json [--items 50] [--repeat 2000]
+
+"pydantic" builds Predictions and a PredictResponse from the scored items
+and calls model_dump_json() (the original path, scoring excluded); the other
+rows use the /predict response encoder, the audit writer's record encoder and
+RedactingFormatter under each backend.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import time
+
+from app import json_backend
+from app.models.results import ScoredItem, encode_predict_response
+from app.models.schemas import ModelBlock, Prediction, PredictResponse
+from app.observability.logging import RedactingFormatter
+from benchmarks.bench_scoring import make_inputs
+
+
+def per_call_us(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    from app.config import MODEL_ARTIFACTS_DIR
+    from app.models.compiled import CompiledModel
+    from app.models.loader import read_artifact
+
+    artifact, checksum, matcher = read_artifact(MODEL_ARTIFACTS_DIR / "model_v2.json")
+    model = CompiledModel.compile(
+        artifact, version="2.0.0", checksum=checksum, artifact_path="", keyword_matcher=matcher
+    )
+    inputs = make_inputs(args.items)
+    ids = [f"item-{i}" for i in range(args.items)]
+    items = [ScoredItem(i, *outcome) for i, outcome in zip(ids, model.score_batch(inputs))]
+    record = {
+        "timestamp": "2026-01-01T00:00:00.000000+00:00",
+        "request_id": "0b4f5f0e-6a59-4a55-9d7c-1c6f0f1e2d3c",
+        "user_hash": "a" * 64,
+        "route": "/predict",
+        "model_version": "2.0.0",
+        "artifact_checksum_sha256": checksum,
+        "num_inputs": args.items,
+        "guardrails_triggered": [],
+        "status": "success",
+        "latency_ms": 3,
+        "response_checksum_sha256": "b" * 64,
+        "response_checksum_alg": "sha256",
+        "response_checksum": "b" * 64,
+    }
+    formatter = RedactingFormatter(fmt="%(asctime)s %(name)s %(levelname)s %(message)s")
+    log_record = logging.LogRecord("app.routes.predict", logging.INFO, __file__, 0,
+                                   "Prediction served", None, None)
+    log_record.__dict__.update(request_id=record["request_id"], model_version="2.0.0",
+                               num_inputs=args.items, latency_ms=3)
+
+    block = ModelBlock(model_version=model.version, artifact_checksum_sha256=checksum)
+
+    def pydantic_response() -> bytes:
+        predictions = [
+            Prediction(id=i.id, label=i.label, score=i.score,
+                       reasons=[model.reasons[c] for c in i.reason_codes])
+            for i in items
+        ]
+        response = PredictResponse(request_id="bench", model=block,
+                                   predictions=predictions, latency_ms=0)
+        return response.model_dump_json().encode()
+
+    print(f"{'path':<34} {'us/call':>8}")
+    print(f"{'response: pydantic':<34} {per_call_us(pydantic_response, args.repeat):>8.2f}")
+    print(f"{'audit: json.dumps':<34} {per_call_us(lambda: json.dumps(record, separators=(',', ':')), args.repeat):>8.2f}")
+    for name in ["json"] + (["orjson"] if json_backend.orjson is not None else []):
+        json_backend.set_backend(name)
+        rows = [
+            (f"response encoder [{name}]", lambda: encode_predict_response(
+                request_id="bench", model=model, items=items,
+                guardrails_triggered=[], latency_ms=0)),
+            (f"audit record [{name}]", lambda: json_backend.dumps_record(record)),
+            (f"log line [{name}]", lambda: formatter.format(log_record)),
+        ]
+        for label, fn in rows:
+            print(f"{label:<34} {per_call_us(fn, args.repeat):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
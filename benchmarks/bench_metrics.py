@@ -0,0 +1,59 @@
+"""Hot-path cost of request timing and latency histogram updates.
+
+Usage: python -m benchmarks.bench_metrics [--calls 200000]
+
+Compares the old 5 ms-first buckets with LATENCY_BUCKETS_MS (10 us .. 10 s,
+1-2-5 per decade) for typical latencies, with and without the labels()
+lookup the middleware does per request, and the clocks themselves.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from prometheus_client import CollectorRegistry, Histogram
+
+from app.observability.metrics import LATENCY_BUCKETS_MS
+
+OLD_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def per_call_ns(fn, calls: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter_ns() - start) / calls
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    registry = CollectorRegistry()
+    histograms = {
+        "old buckets": Histogram("old_ms", "", ["route"], buckets=OLD_BUCKETS_MS, registry=registry),
+        "log-linear": Histogram("new_ms", "", ["route"], buckets=LATENCY_BUCKETS_MS, registry=registry),
+    }
+    empty = per_call_ns(lambda: None, args.calls)
+    print(f"{'clock':<34} {'ns/call':>8}")
+    for name, clock in (
+        ("time.monotonic()", time.monotonic),
+        ("time.perf_counter()", time.perf_counter),
+        ("time.perf_counter_ns()", time.perf_counter_ns),
+    ):
+        print(f"{name:<34} {per_call_ns(clock, args.calls) - empty:>8.0f}")
+    print(f"\n{'histogram update':<34} {'0.05 ms':>8} {'3 ms':>8} {'300 ms':>8}")
+    for name, histogram in histograms.items():
+        child = histogram.labels(route="/predict")
+        for label, fn in (
+            (f"{name}, labels().observe", lambda v: histogram.labels(route="/predict").observe(v)),
+            (f"{name}, bound child", child.observe),
+        ):
+            row = [per_call_ns(lambda v=v: fn(v), args.calls) - empty for v in (0.05, 3, 300)]
+            print(f"{label:<34} " + " ".join(f"{ns:>8.0f}" for ns in row))
+
+
+if __name__ == "__main__":
+    main()
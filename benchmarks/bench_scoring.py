@@ -0,0 +1,83 @@
+"""Per-item scoring cost: interpreted ``score_input`` vs the compiled model.
+
+Usage: python -m benchmarks.bench_scoring [--items 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from app.config import MODEL_ARTIFACTS_DIR
+from app.models.compiled import CompiledModel
+from app.models.loader import read_artifact
+from app.models.scorer import evaluate_price_rules, evaluate_units_rules, score_input
+
+
+def make_inputs(n: int, seed: int = 7) -> list[tuple[str, float, int, str]]:
+    rnd = random.Random(seed)
+    texts = ["Order for review", "refund requested after chargeback", "growth launch plan"]
+    channels = ["amazon", "walmart", "shopify", "direct", "other"]
+    return [
+        (
+            rnd.choice(texts),
+            round(rnd.uniform(0, 200), 2),
+            rnd.randint(0, 1000),
+            rnd.choice(channels),
+        )
+        for _ in range(n)
+    ]
+
+
+def per_item_us(fn, inputs) -> float:
+    start = time.perf_counter()
+    for text, price, units, channel in inputs:
+        fn(text, price, units, channel)
+    return (time.perf_counter() - start) / len(inputs) * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    artifact, checksum, matcher = read_artifact(MODEL_ARTIFACTS_DIR / "model_v2.json")
+    compiled = CompiledModel.compile(
+        artifact, version="2.0.0", checksum=checksum, artifact_path="", keyword_matcher=matcher
+    )
+    interpreted = CompiledModel.compile(
+        artifact,
+        version="2.0.0",
+        checksum=checksum,
+        artifact_path="",
+        decision_table_max_entries=0,
+    )
+    config = compiled.config
+    inputs = make_inputs(args.items)
+
+    rows = [
+        ("score_input", per_item_us(lambda t, p, u, c: score_input(t, p, u, c, config), inputs)),
+        ("compiled, interpreted", per_item_us(interpreted.score, inputs)),
+        ("compiled, decision table", per_item_us(compiled.score, inputs)),
+    ]
+
+    # Numeric part only: price/units rule evaluation vs one table lookup
+    price_rules, units_rules = config["price_rules"], config["units_rules"]
+
+    def numeric_interpreted(text: str, price: float, units: int, channel: str) -> None:
+        evaluate_price_rules(price, price_rules)
+        evaluate_units_rules(units, units_rules)
+
+    table = compiled.decision_table
+    rows.append(("numeric rules, interpreted", per_item_us(numeric_interpreted, inputs)))
+    rows.append(
+        ("numeric rules, table lookup", per_item_us(lambda t, p, u, c: table.lookup(0, p, u, c), inputs))
+    )
+
+    for name, us in rows:
+        print(f"{name:<30} {us:8.3f} us/item")
+
+
+if __name__ == "__main__":
+    main()
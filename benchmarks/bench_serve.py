@@ -0,0 +1,138 @@
+"""Throughput scaling of the pre-fork launcher with worker count.
+
+Usage: python -m benchmarks.bench_serve [--workers 1 2 4] [--clients 8]
+                                        [--seconds 5] [--pin-cpus]
+
+For each worker count, starts ``python -m app.serve`` on a free local port,
+then drives one-item POST /predict requests from ``--clients`` client
+processes over keep-alive connections and reports requests per second and
+the speed-up over the first row. Clients run on the same machine, so on a
+host with fewer CPUs than workers plus clients the numbers are bounded by
+the CPU count, not by the launcher. Where /proc is available it also shows
+each worker's resident memory and the part of it still shared with the
+launcher (the copy-on-write model pages).
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BODY = json.dumps(
+    {
+        "inputs": [
+            {
+                "id": "item-1",
+                "text": "Order for review",
+                "features": {"price": 250.0, "units": 5, "channel": "amazon"},
+            }
+        ]
+    }
+).encode()
+HEADERS = {"Content-Type": "application/json", "X-User-Email": "bench@example.com"}
+
+
+def client(port: int, seconds: float, results: multiprocessing.Queue) -> None:
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    done = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        connection.request("POST", "/predict", body=BODY, headers=HEADERS)
+        response = connection.getresponse()
+        response.read()
+        if response.status == 200:
+            done += 1
+    results.put(done)
+
+
+def start(workers: int, pin_cpus: bool, audit_dir: str) -> tuple[subprocess.Popen, int]:
+    command = [sys.executable, "-m", "app.serve", "--host", "127.0.0.1", "--port", "0",
+               "--workers", str(workers)] + (["--pin-cpus"] if pin_cpus else [])
+    env = {**os.environ, "AUDIT_LOG_DIR": audit_dir, "AUDIT_SHARDING": "1",
+           "LOG_PREDICTION_SAMPLE_RATE": "0"}
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               env=env, text=True)
+    port, started = 0, 0
+    for line in process.stdout:
+        try:
+            message = json.loads(line).get("message")
+        except ValueError:
+            continue
+        if message == "Launcher ready":
+            port = json.loads(line)["port"]
+        elif message == "Application startup complete.":
+            started += 1
+            if started == workers:
+                break
+    # Keep draining the launcher's output so workers never block on it
+    multiprocessing.Process(target=_drain, args=(process.stdout.fileno(),), daemon=True).start()
+    return process, port
+
+
+def _drain(fd: int) -> None:
+    with open(fd, "rb", closefd=False) as stream:
+        for _ in stream:
+            pass
+
+
+def worker_memory_kb(launcher_pid: int) -> list[tuple[int, int]]:
+    """(rss, shared) in KB for each worker of the launcher, if /proc has them."""
+    children = Path(f"/proc/{launcher_pid}/task/{launcher_pid}/children")
+    if not children.exists():
+        return []
+    memory = []
+    for pid in children.read_text().split():
+        fields = {}
+        for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+            name, value, *_ = line.split()
+            fields[name.rstrip(":")] = int(value)
+        memory.append((fields["Rss"], fields["Shared_Clean"] + fields["Shared_Dirty"]))
+    return memory
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--pin-cpus", action="store_true")
+    args = parser.parse_args(argv)
+
+    print(f"CPUs usable: {len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()}")
+    print(f"{'workers':>7} {'req/s':>8} {'speed-up':>9} {'worker RSS / shared (MB)':>26}")
+    baseline = 0.0
+    with tempfile.TemporaryDirectory(prefix="bench_serve_") as audit_dir:
+        for workers in args.workers:
+            process, port = start(workers, args.pin_cpus, audit_dir)
+            try:
+                results: multiprocessing.Queue = multiprocessing.Queue()
+                clients = [
+                    multiprocessing.Process(target=client, args=(port, args.seconds, results))
+                    for _ in range(args.clients)
+                ]
+                for proc in clients:
+                    proc.start()
+                total = sum(results.get() for _ in clients)
+                for proc in clients:
+                    proc.join()
+                memory = worker_memory_kb(process.pid)
+            finally:
+                process.send_signal(signal.SIGTERM)
+                process.wait(timeout=60)
+            rate = total / args.seconds
+            baseline = baseline or rate
+            shown = ", ".join(f"{rss / 1024:.0f}/{shared / 1024:.0f}" for rss, shared in memory)
+            print(f"{workers:>7} {rate:>8.0f} {rate / baseline:>8.2f}x {shown:>26}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""/predict wire cost per request: JSON against MessagePack.
+
+Usage: python -m benchmarks.bench_wire_format [--items 1 50] [--repeat 2000]
+
+For each request size, reports the request and response bytes on the wire
+and the CPU time to decode and validate the request (FastAPI's JSON path is
+json.loads then PredictRequest validation; MessagePack is unpackb then the
+same validation) and to encode the response (the /predict encoders, with
+the active JSON backend). Scoring is excluded. Needs msgpack installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from app import json_backend, wire_format
+from app.models.results import ScoredItem, encode_predict_response
+from app.models.schemas import PredictRequest
+from benchmarks.bench_scoring import make_inputs
+
+
+def per_call_us(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[1, 50])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args(argv)
+    if not wire_format.msgpack_available():
+        parser.error("msgpack is not installed")
+    import msgpack
+
+    from app.config import MODEL_ARTIFACTS_DIR
+    from app.models.compiled import CompiledModel
+    from app.models.loader import read_artifact
+
+    artifact, checksum, matcher = read_artifact(MODEL_ARTIFACTS_DIR / "model_v2.json")
+    model = CompiledModel.compile(
+        artifact, version="2.0.0", checksum=checksum, artifact_path="", keyword_matcher=matcher
+    )
+    print(f"JSON backend: {json_backend.backend()}")
+    print(f"{'items':>5} {'format':<8} {'req B':>7} {'resp B':>7} "
+          f"{'decode us':>10} {'encode us':>10} {'total us':>9}")
+    for count in args.items:
+        inputs = make_inputs(count)
+        payload = {
+            "request_id": "bench",
+            "inputs": [
+                {
+                    "id": f"item-{i}",
+                    "text": text,
+                    "features": {"price": price, "units": units, "channel": channel},
+                }
+                for i, (text, price, units, channel) in enumerate(inputs)
+            ],
+        }
+        items = [
+            ScoredItem(f"item-{i}", *outcome) for i, outcome in enumerate(model.score_batch(inputs))
+        ]
+        response = {
+            "request_id": "bench",
+            "model": model,
+            "items": items,
+            "guardrails_triggered": [],
+            "latency_ms": 3,
+        }
+        json_request = json.dumps(payload).encode()
+        packed_request = msgpack.packb(payload)
+        for name, request, decode, encode in (
+            (
+                "json",
+                json_request,
+                lambda: PredictRequest.model_validate(json.loads(json_request)),
+                lambda: encode_predict_response(**response),
+            ),
+            (
+                "msgpack",
+                packed_request,
+                lambda: PredictRequest.model_validate(msgpack.unpackb(packed_request)),
+                lambda: wire_format.encode_predict_response(**response),
+            ),
+        ):
+            decode_us = per_call_us(decode, args.repeat)
+            encode_us = per_call_us(encode, args.repeat)
+            print(f"{count:>5} {name:<8} {len(request):>7} {len(encode()):>7} "
+                  f"{decode_us:>10.1f} {encode_us:>10.1f} {decode_us + encode_us:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Single-item scoring throughput: HTTP /predict vs the /predict/ws channel.
+
+Usage: python -m benchmarks.bench_ws [--messages 2000] [--window 32]
+
+Runs the app in process through Starlette's TestClient, so transport costs
+(TCP, HTTP/WebSocket framing in uvicorn) are not included and the numbers
+compare the per-request work of the app itself: a one-item POST /predict
+per call, WebSocket messages sent one at a time (send, wait for the reply),
+and WebSocket messages pipelined ``--window`` at a time. Audit records go to
+a temporary directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+
+def item(i: int) -> dict:
+    return {
+        "id": f"item-{i}",
+        "text": "Normal transaction for review",
+        "features": {"price": 250.0, "units": 5, "channel": "web"},
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--window", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    os.environ["AUDIT_LOG_DIR"] = tempfile.mkdtemp(prefix="bench_ws_")
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    headers = {"X-User-Email": "bench@example.com"}
+    messages = [item(i) for i in range(args.messages)]
+    with TestClient(app) as client:
+        start = time.perf_counter()
+        for i, message in enumerate(messages):
+            response = client.post(
+                "/predict", json={"request_id": f"bench-{i}", "inputs": [message]}, headers=headers
+            )
+            response.raise_for_status()
+        http_s = time.perf_counter() - start
+
+        with client.websocket_connect("/predict/ws", headers=headers) as ws:
+            start = time.perf_counter()
+            for message in messages:
+                ws.send_json(message)
+                ws.receive_json()
+            sequential_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for offset in range(0, len(messages), args.window):
+                window = messages[offset : offset + args.window]
+                for message in window:
+                    ws.send_json(message)
+                for _ in window:
+                    ws.receive_json()
+            pipelined_s = time.perf_counter() - start
+
+    print(f"{'path':<28} {'msg/s':>8} {'us/msg':>8}")
+    for name, seconds in (
+        ("HTTP POST /predict", http_s),
+        ("WS, one at a time", sequential_s),
+        (f"WS, window of {args.window}", pipelined_s),
+    ):
+        print(f"{name:<28} {args.messages / seconds:>8.0f} {seconds / args.messages * 1e6:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from app.config import AUDIT_LOG_DIR, AUDIT_LOG_FILE
+from app.observability.audit import audit_files
 
 
 @pytest.fixture(scope="session")
@@ -19,10 +20,10 @@ def client():
 
 @pytest.fixture(autouse=True)
 def clean_audit_log():
-    """Clear the audit log before each test."""
+    """Clear the audit log and its shards before each test."""
     AUDIT_LOG_DIR.mkdir(parents=True, exist_ok=True)
-    if AUDIT_LOG_FILE.exists():
-        AUDIT_LOG_FILE.unlink()
+    for path in audit_files(AUDIT_LOG_FILE):
+        path.unlink()
     yield
 
 
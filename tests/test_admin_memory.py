@@ -0,0 +1,87 @@
+"""Admin memory diagnostics and a reload leak check."""
+
+import gc
+import logging
+import tracemalloc
+
+import pytest
+
+from app.observability.memory import live_objects
+from app.routes import admin
+
+TOKEN = "test-admin-token"
+
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_DIAGNOSTICS", True)
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", TOKEN)
+    yield {"X-Admin-Token": TOKEN}
+    admin._diagnostics.stop()
+
+
+def test_admin_endpoints_are_off_by_default(client):
+    """Without ADMIN_DIAGNOSTICS the endpoints do not exist."""
+    assert client.get("/admin/memory", headers={"X-Admin-Token": TOKEN}).status_code == 404
+
+
+def test_admin_token_required(client, admin_headers):
+    assert client.get("/admin/memory").status_code == 403
+    assert client.get("/admin/memory", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get("/admin/memory", headers=admin_headers).status_code == 200
+
+
+def test_snapshot_diff_and_object_counts(client, admin_headers, predict_payload, predict_headers):
+    """Snapshots taken around traffic diff by file:line; live objects are counted."""
+    assert client.post("/admin/memory/snapshots", headers=admin_headers).status_code == 409
+    started = client.post("/admin/memory/tracemalloc/start?frames=4", headers=admin_headers)
+    assert started.json()["tracing"] and started.json()["frames"] == 4
+
+    before = client.post("/admin/memory/snapshots", headers=admin_headers).json()["id"]
+    retained = [bytearray(1000) for _ in range(100)]
+    for _ in range(5):
+        client.post("/predict", json=predict_payload, headers=predict_headers)
+    after = client.post("/admin/memory/snapshots", headers=admin_headers).json()["id"]
+
+    diff = client.get(
+        f"/admin/memory/diff?before={before}&after={after}&limit=5", headers=admin_headers
+    ).json()
+    assert len(diff["top"]) == 5
+    assert any(
+        entry["location"].endswith("test_admin_memory.py:" + str(line))
+        and entry["size_diff_bytes"] >= 100_000
+        for entry in diff["top"]
+        for line in range(38, 42)
+    )
+    del retained
+    assert client.get("/admin/memory/diff?before=1&after=999", headers=admin_headers).status_code == 404
+
+    counts = client.get("/admin/memory/objects", headers=admin_headers).json()
+    assert counts["CompiledModel"] >= 1
+    assert counts["PredictResponse"] == 0
+
+    stopped = client.post("/admin/memory/tracemalloc/stop", headers=admin_headers).json()
+    assert not stopped["tracing"] and stopped["snapshots"] == []
+
+
+def test_repeated_reloads_do_not_leak(client, caplog):
+    """Old versions are released after a reload: object counts and traced memory stay flat."""
+    # pytest keeps every captured log record, which would look like a leak
+    caplog.set_level(logging.WARNING)
+    tracemalloc.start()
+    try:
+        # Both measurements include exactly one live version, traced
+        for _ in range(5):
+            assert client.post("/model/reload").status_code == 200
+        baseline = live_objects()
+        start, _ = tracemalloc.get_traced_memory()
+        for _ in range(30):
+            assert client.post("/model/reload").status_code == 200
+        gc.collect()
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert live_objects() == baseline
+    # A single leaked version (routing table plus decision table) is > 100 KB
+    assert end - start < 32 * 1024
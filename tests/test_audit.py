@@ -3,6 +3,8 @@
 import json
 
 from app.config import AUDIT_LOG_FILE
+from app.observability import audit
+from app.observability.audit import read_audit_lines, read_audit_records
 
 
 def test_audit_log_entry_appended(client, predict_payload, predict_headers):
@@ -29,7 +31,10 @@ def test_audit_log_entry_appended(client, predict_payload, predict_headers):
         "guardrails_triggered",
         "status",
         "latency_ms",
+        "latency_us",
         "response_checksum_sha256",
+        "response_checksum_alg",
+        "response_checksum",
     ]
     for field in required_fields:
         assert field in record, f"Missing audit field: {field}"
@@ -38,6 +43,9 @@ def test_audit_log_entry_appended(client, predict_payload, predict_headers):
     assert record["route"] == "/predict"
     assert record["status"] == "success"
     assert record["num_inputs"] == 1
+    assert record["response_checksum_alg"] == "sha256"
+    assert record["latency_ms"] == record["latency_us"] // 1000
+    assert record["response_checksum_sha256"] == record["response_checksum"]
 
 
 def test_audit_log_blocked_request(client, predict_headers):
@@ -55,10 +63,45 @@ def test_audit_log_blocked_request(client, predict_headers):
     response = client.post("/predict", json=payload, headers=predict_headers)
     assert response.status_code == 400
 
-    assert AUDIT_LOG_FILE.exists()
-    lines = AUDIT_LOG_FILE.read_text().strip().split("\n")
+    # The merged view reads the same whether or not the log is sharded
+    lines = list(read_audit_lines(AUDIT_LOG_FILE))
     assert len(lines) >= 1
 
     record = json.loads(lines[-1])
     assert record["status"] == "blocked"
     assert "policy_block" in record["guardrails_triggered"]
+
+
+def test_sharded_audit_reads_as_one_ordered_stream(
+    client, predict_payload, predict_headers, monkeypatch
+):
+    """Each worker appends to its own shard; the merged view is timestamp-ordered."""
+    monkeypatch.setattr(audit, "AUDIT_SHARDING", True)
+    for i, worker in enumerate(("1", "2", "1")):
+        monkeypatch.setattr(audit, "AUDIT_WORKER_ID", worker)
+        predict_payload["request_id"] = f"shard-{worker}-{i}"
+        assert client.post("/predict", json=predict_payload, headers=predict_headers).status_code == 200
+
+    assert not AUDIT_LOG_FILE.exists()
+    assert sorted(p.name for p in audit.audit_files(AUDIT_LOG_FILE)) == [
+        "audit.1.jsonl",
+        "audit.2.jsonl",
+    ]
+    records = list(read_audit_records(AUDIT_LOG_FILE))
+    assert [r["request_id"] for r in records] == ["shard-1-0", "shard-2-1", "shard-1-2"]
+
+
+def test_merge_interleaves_shards_by_timestamp(tmp_path):
+    """Shards written out of step are merged by timestamp, lines unchanged."""
+    audit_file = tmp_path / "audit.jsonl"
+    shards = {
+        "audit.a.jsonl": ["2026-01-01T00:00:01+00:00", "2026-01-01T00:00:03.500000+00:00"],
+        "audit.b.jsonl": ["2026-01-01T00:00:00.250000+00:00", "2026-01-01T00:00:02+00:00"],
+    }
+    for name, stamps in shards.items():
+        lines = [json.dumps({"timestamp": t, "shard": name}, separators=(",", ":")) for t in stamps]
+        (tmp_path / name).write_text("\n".join(lines) + "\n")
+
+    merged = list(read_audit_lines(audit_file))
+    assert [json.loads(line)["timestamp"][17:19] for line in merged] == ["00", "01", "02", "03"]
+    assert all(line in (tmp_path / json.loads(line)["shard"]).read_text() for line in merged)
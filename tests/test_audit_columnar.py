@@ -0,0 +1,74 @@
+"""Columnar audit export: dictionary encoding, incremental runs and queries."""
+
+import json
+
+import pytest
+
+from app.observability import audit_columnar
+from app.observability.audit_columnar import ColumnBatch, export_audit, read_columns, version_stats
+
+
+def _record(i, version, status="success", latency_ms=1):
+    return {
+        "timestamp": f"2026-01-01T00:00:{i:02d}+00:00",
+        "request_id": f"r-{i}",
+        "user_hash": f"u{i % 2}",
+        "route": "/predict",
+        "model_version": version,
+        "artifact_checksum_sha256": "a" * 64,
+        "num_inputs": 1,
+        "guardrails_triggered": ["policy_block"] if status == "blocked" else [],
+        "status": status,
+        "latency_ms": latency_ms,
+    }
+
+
+def _append(path, records):
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def test_batch_dictionary_encodes():
+    """Repeated strings become codes into one list of distinct values."""
+    batch = ColumnBatch()
+    for i, version in enumerate(["1.0.0", "2.0.0", "1.0.0"]):
+        batch.add(_record(i, version))
+    assert batch.rows == 3
+    assert list(batch.codes["model_version"]) == [0, 1, 0]
+    assert batch.values["model_version"] == ["1.0.0", "2.0.0"]
+    assert batch.values["guardrails"] == [""]
+    assert list(batch.ints["timestamp_us"])[1] == 1767225601000000
+
+
+@pytest.mark.parametrize("fmt", ["npz", "arrow"])
+def test_incremental_export_and_query(tmp_path, fmt):
+    """Each run converts only new complete lines; queries see all parts."""
+    if fmt == "arrow":
+        pytest.importorskip("pyarrow")
+    audit_file = tmp_path / "audit.jsonl"
+    out_dir = tmp_path / "columnar"
+    _append(audit_file, [_record(i, "1.0.0", latency_ms=i) for i in range(1, 11)])
+    _append(tmp_path / "audit.7.jsonl", [_record(20, "2.0.0", "blocked")])
+    assert len(export_audit(audit_file, out_dir, fmt)) == 2
+
+    assert export_audit(audit_file, out_dir, fmt) == []
+    _append(audit_file, [_record(30, "2.0.0", latency_ms=5)])
+    with open(audit_file, "a") as f:
+        f.write('{"timestamp": "2026-01-01T00:00:40+00:00"')  # still being written
+    assert len(export_audit(audit_file, out_dir, fmt)) == 1
+
+    stats = {row["model_version"]: row for row in version_stats(read_columns(out_dir))}
+    assert stats["1.0.0"]["requests"] == 10
+    assert (stats["1.0.0"]["p50_ms"], stats["1.0.0"]["p90_ms"]) == (5, 9)
+    assert stats["2.0.0"]["requests"] == 2
+    assert stats["2.0.0"]["block_rate"] == 0.5
+    assert stats["2.0.0"]["p99_ms"] == 5
+
+
+def test_missing_backends_are_reported(tmp_path, monkeypatch):
+    """Without pyarrow and numpy the exporter says what to install."""
+    monkeypatch.setattr(audit_columnar, "pa", None)
+    monkeypatch.setattr(audit_columnar, "np", None)
+    with pytest.raises(ValueError, match="pyarrow or numpy"):
+        export_audit(tmp_path / "audit.jsonl", tmp_path / "out")
@@ -0,0 +1,120 @@
+"""Cross-request micro-batching of scoring work."""
+
+import asyncio
+import json
+
+from app.config import AUDIT_LOG_FILE, MODEL_ARTIFACTS_DIR
+from app.models.batching import MicroBatcher
+from app.models.compiled import CompiledModel
+from app.models.schemas import InputItem
+from app.routes import predict as predict_route
+
+
+def _model(version="v1"):
+    artifact = json.loads((MODEL_ARTIFACTS_DIR / "model_v1.json").read_text())
+    return CompiledModel.compile(artifact, version=version, checksum="", artifact_path="")
+
+
+def _inputs(prefix, n):
+    return [
+        InputItem(id=f"{prefix}-{i}", text=f"urgent refund {i}", features={"price": 100.0 * i})
+        for i in range(n)
+    ]
+
+
+def test_concurrent_requests_share_one_batch():
+    """Requests within the window are scored together and fanned back in order."""
+    model = _model()
+    calls = []
+    original = model.score_batch
+
+    def score_batch(items):
+        calls.append(len(items))
+        return original(items)
+
+    model.score_batch = score_batch
+
+    async def main():
+        batcher = MicroBatcher(lambda _: model, window_ms=5, max_items=100)
+        return await asyncio.gather(
+            batcher.submit(_inputs("a", 2)), batcher.submit(_inputs("b", 3))
+        )
+
+    (model_a, preds_a), (model_b, preds_b) = asyncio.run(main())
+    assert calls == [5]
+    assert model_a is model_b is model
+    assert [p.id for p in preds_a] == ["a-0", "a-1"]
+    assert [p.id for p in preds_b] == ["b-0", "b-1", "b-2"]
+    expected = model.score_codes("urgent refund 2", 200.0, 0, "direct")
+    assert (preds_b[2].score, preds_b[2].label, preds_b[2].reason_codes) == expected
+
+
+def test_full_batch_flushes_without_waiting_for_window():
+    """Reaching max_items flushes immediately instead of waiting for the timer."""
+    model = _model()
+
+    async def main():
+        batcher = MicroBatcher(lambda _: model, window_ms=10_000, max_items=4)
+        result = await asyncio.wait_for(
+            asyncio.gather(batcher.submit(_inputs("a", 2)), batcher.submit(_inputs("b", 2))),
+            timeout=1,
+        )
+        assert batcher.pending_items == 0
+        return result
+
+    assert len(asyncio.run(main())) == 2
+
+
+def test_batch_uses_snapshot_taken_at_flush():
+    """Every request in a batch reports the single model version that scored it."""
+    models = iter([_model("v1"), _model("v2")])
+    current = {"model": next(models)}
+
+    async def main():
+        batcher = MicroBatcher(lambda _: current["model"], window_ms=5, max_items=100)
+        first = asyncio.ensure_future(batcher.submit(_inputs("a", 1)))
+        await asyncio.sleep(0)
+        current["model"] = next(models)
+        second = batcher.submit(_inputs("b", 1))
+        return await asyncio.gather(first, second)
+
+    results = asyncio.run(main())
+    assert [model.version for model, _ in results] == ["v2", "v2"]
+
+
+def test_batched_predict_keeps_per_request_audit(
+    client, predict_payload, predict_headers, monkeypatch
+):
+    """With batching on, each request gets its own response and audit record."""
+    batcher = MicroBatcher(predict_route._registry.route, window_ms=1, max_items=8)
+    monkeypatch.setattr(predict_route, "_batcher", batcher)
+    for i in range(3):
+        payload = dict(predict_payload, request_id=f"batch-{i}")
+        response = client.post("/predict", json=payload, headers=predict_headers)
+        assert response.status_code == 200
+        assert response.json()["predictions"][0]["id"] == "item-1"
+
+    records = [json.loads(line) for line in AUDIT_LOG_FILE.read_text().splitlines()]
+    assert [r["request_id"] for r in records] == [f"batch-{i}" for i in range(3)]
+    assert all(r["status"] == "success" for r in records)
+
+
+def test_malformed_batch_output_fails_every_request():
+    """An error while fanning results out is raised in each caller instead of hanging."""
+    model = _model()
+    model.score_batch = lambda items: [None for _ in items]
+
+    async def main():
+        batcher = MicroBatcher(lambda _: model, window_ms=1, max_items=100)
+        return await asyncio.wait_for(
+            asyncio.gather(
+                batcher.submit(_inputs("a", 1)),
+                batcher.submit(_inputs("b", 2)),
+                return_exceptions=True,
+            ),
+            timeout=1,
+        )
+
+    results = asyncio.run(main())
+    assert len(results) == 2
+    assert all(isinstance(r, Exception) for r in results)
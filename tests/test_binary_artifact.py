@@ -0,0 +1,81 @@
+"""Binary artifact format: conversion, memory-mapped loading and scoring parity."""
+
+import hashlib
+import json
+
+import pytest
+
+from app.config import BASE_DIR, MODEL_ARTIFACTS_DIR
+from app.models.binary_artifact import BinaryArtifact, convert_json_artifact
+from app.models.compiled import CompiledModel, build_keyword_matcher
+from app.models.loader import ModelRegistry
+from app.models.scorer import score_input
+from app.models.warmup import build_warmup_inputs
+
+JSON_ARTIFACTS = [
+    MODEL_ARTIFACTS_DIR / "model_v1.json",
+    MODEL_ARTIFACTS_DIR / "model_v2.json",
+    BASE_DIR / "model_artifacts_old" / "model_v1.json",
+]
+
+
+def _config(artifact):
+    return artifact.get("config") or artifact.get("rule_config")
+
+
+@pytest.mark.parametrize("src", JSON_ARTIFACTS, ids=lambda p: f"{p.parent.name}/{p.name}")
+def test_binary_round_trip_scores_identically(src, tmp_path):
+    """Decoded binary artifacts score exactly like their JSON source."""
+    dst = tmp_path / "model.rtcb"
+    checksum = convert_json_artifact(src, dst)
+    original = json.loads(src.read_text())
+
+    with BinaryArtifact(dst) as binary:
+        assert binary.checksum == checksum == hashlib.sha256(dst.read_bytes()).hexdigest()
+        decoded = binary.to_artifact()
+        matcher = binary.keyword_matcher()
+
+    assert decoded["model_version"] == original["model_version"]
+    assert matcher == build_keyword_matcher(_config(original)["text_rules"])
+
+    inputs = build_warmup_inputs(_config(original))
+    inputs += [("URGENT Refund", 1000.0, 500, "Amazon"), ("x", float("nan"), -1, "")]
+    for text, price, units, channel in inputs:
+        assert score_input(text, price, units, channel, _config(decoded)) == score_input(
+            text, price, units, channel, _config(original)
+        )
+
+
+def test_registry_loads_binary_artifact(tmp_path):
+    """A manifest can point at a binary artifact validated via CHECKSUMS.json."""
+    checksum = convert_json_artifact(MODEL_ARTIFACTS_DIR / "model_v1.json", tmp_path / "m1.rtcb")
+    (tmp_path / "model_manifest.json").write_text(
+        json.dumps(
+            {
+                "active_model_version": "1.0.0",
+                "available_versions": ["1.0.0"],
+                "paths": {"1.0.0": "m1.rtcb"},
+            }
+        )
+    )
+    (tmp_path / "CHECKSUMS.json").write_text(json.dumps({"m1.rtcb": checksum}))
+
+    registry = ModelRegistry(tmp_path)
+    registry.load()
+    assert registry.active_checksum == checksum
+    assert registry.get_model_info()["model_name"] == "risk_triad_classifier"
+    compiled: CompiledModel = registry.compiled
+    assert compiled.text_rule_mask("please REFUND and optimize") == 0b11
+    config = json.loads((MODEL_ARTIFACTS_DIR / "model_v1.json").read_text())["rule_config"]
+    assert compiled.score("refund", 250.0, 10, "amazon") == score_input(
+        "refund", 250.0, 10, "amazon", config
+    )
+
+
+def test_truncated_binary_artifact_rejected(tmp_path):
+    """A truncated file fails to open instead of yielding partial tables."""
+    dst = tmp_path / "model.rtcb"
+    convert_json_artifact(MODEL_ARTIFACTS_DIR / "model_v2.json", dst)
+    dst.write_bytes(dst.read_bytes()[:200])
+    with pytest.raises(ValueError, match="Truncated"):
+        BinaryArtifact(dst)
@@ -0,0 +1,42 @@
+"""Response checksum algorithm selection."""
+
+import hashlib
+import json
+
+import pytest
+
+from app import checksums
+from app.config import AUDIT_LOG_FILE
+
+
+@pytest.fixture
+def blake2b():
+    previous = checksums.algorithm()
+    yield checksums.set_algorithm("blake2b")
+    checksums.set_algorithm(previous)
+
+
+def test_digests_match_hashlib():
+    """One-shot and chunked digests agree with hashlib for every algorithm."""
+    data = b'{"request_id":"r"}' * 1000
+    assert checksums.digest(data, "sha256") == hashlib.sha256(data).hexdigest()
+    assert checksums.digest(data, "blake2b") == hashlib.blake2b(data, digest_size=32).hexdigest()
+    for name in checksums.available():
+        chunks = [data[i : i + 4096] for i in range(0, len(data), 4096)]
+        assert checksums.digest_chunks(chunks, name) == checksums.digest(data, name)
+
+
+def test_unknown_algorithm_rejected():
+    with pytest.raises(ValueError):
+        checksums.set_algorithm("md5")
+
+
+def test_audit_records_name_the_algorithm(client, predict_payload, predict_headers, blake2b):
+    """The audit record carries the algorithm; the SHA-256 field stays empty for others."""
+    response = client.post("/predict", json=predict_payload, headers=predict_headers)
+    assert response.status_code == 200
+
+    record = json.loads(AUDIT_LOG_FILE.read_text().strip().split("\n")[-1])
+    assert record["response_checksum_alg"] == "blake2b"
+    assert record["response_checksum"] == checksums.digest(response.content, "blake2b")
+    assert record["response_checksum_sha256"] == ""
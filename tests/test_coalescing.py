@@ -0,0 +1,136 @@
+"""Single-flight coalescing of identical concurrent predict payloads."""
+
+import asyncio
+import json
+
+import httpx
+
+from app.config import AUDIT_LOG_FILE
+from app.models.coalescing import SingleFlight
+from app.observability.metrics import predict_coalesced_requests_total
+from app.routes import predict as predict_route
+
+
+def test_concurrent_identical_keys_share_one_computation():
+    """Callers with the same key await one computation; other keys run separately."""
+    calls = []
+
+    async def compute(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return [key]
+
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(
+            *(flight.do("a", lambda: compute("a")) for _ in range(5)),
+            flight.do("b", lambda: compute("b")),
+        )
+        assert flight.inflight == 0
+        return results
+
+    results = asyncio.run(main())
+    assert calls == ["a", "b"]
+    assert results[:5] == [["a"]] * 5
+    assert results[0] is results[4]
+    assert results[5] == ["b"]
+
+
+def test_failure_propagates_to_all_waiters():
+    """An exception in the shared computation is raised in every caller."""
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("scoring failed")
+
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(
+            flight.do("k", boom), flight.do("k", boom), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_cancelled_leader_does_not_fail_followers():
+    """Cancelling the caller that started the computation leaves the others' results intact."""
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        flight = SingleFlight()
+        leader = asyncio.ensure_future(flight.do("k", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("k", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    leader_result, follower_result = asyncio.run(main())
+    assert isinstance(leader_result, asyncio.CancelledError)
+    assert follower_result == "done"
+
+
+def test_completed_results_are_not_cached():
+    """A key is recomputed once its previous flight has finished."""
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    async def main():
+        flight = SingleFlight()
+        return [await flight.do("k", compute), await flight.do("k", compute)]
+
+    assert asyncio.run(main()) == [1, 2]
+
+
+def test_coalesced_predict_keeps_per_request_audit(
+    client, predict_payload, predict_headers, monkeypatch
+):
+    """With coalescing on, every request still gets its own response and audit record."""
+    monkeypatch.setattr(predict_route, "PREDICT_COALESCING", True)
+    for i in range(3):
+        payload = dict(predict_payload, request_id=f"coalesce-{i}")
+        response = client.post("/predict", json=payload, headers=predict_headers)
+        assert response.status_code == 200
+        assert response.json()["request_id"] == f"coalesce-{i}"
+
+    records = [json.loads(line) for line in AUDIT_LOG_FILE.read_text().splitlines()]
+    assert [r["request_id"] for r in records] == [f"coalesce-{i}" for i in range(3)]
+
+
+def test_concurrent_identical_predicts_are_coalesced(
+    client, predict_payload, predict_headers, monkeypatch
+):
+    """Identical payloads in flight at the same time share one scoring pass."""
+    from app.main import app
+
+    monkeypatch.setattr(predict_route, "PREDICT_COALESCING", True)
+    before = predict_coalesced_requests_total._value.get()
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            return await asyncio.gather(
+                *(
+                    ac.post(
+                        "/predict",
+                        json=dict(predict_payload, request_id=f"storm-{i}"),
+                        headers=predict_headers,
+                    )
+                    for i in range(5)
+                )
+            )
+
+    responses = asyncio.run(main())
+    assert [r.status_code for r in responses] == [200] * 5
+    assert len({json.dumps(r.json()["predictions"]) for r in responses}) == 1
+    assert predict_coalesced_requests_total._value.get() > before
+
+    records = [json.loads(line) for line in AUDIT_LOG_FILE.read_text().splitlines()]
+    assert sorted(r["request_id"] for r in records) == [f"storm-{i}" for i in range(5)]
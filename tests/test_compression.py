@@ -0,0 +1,107 @@
+"""Negotiated response compression."""
+
+import threading
+
+import pytest
+
+from app import checksums, compression
+from app.config import AUDIT_LOG_FILE
+from app.observability.audit import read_audit_records
+from app.observability.metrics import response_compression_ratio
+
+
+@pytest.fixture
+def gzip_only():
+    previous = ",".join(compression.encodings()) or "off"
+    yield compression.set_encodings("gzip")
+    compression.set_encodings(previous)
+
+
+@pytest.fixture
+def bulk_payload(predict_payload):
+    """A 50-item request, whose response is well above the minimum size."""
+    item = predict_payload["inputs"][0]
+    return {**predict_payload, "inputs": [{**item, "id": f"item-{i}"} for i in range(50)]}
+
+
+def test_negotiation(gzip_only):
+    assert compression.negotiate("") == ""
+    assert compression.negotiate("gzip, deflate") == "gzip"
+    assert compression.negotiate("br, *;q=0.5") == "gzip"
+    assert compression.negotiate("gzip;q=0, *") == ""
+    assert compression.negotiate("identity") == ""
+
+
+def test_server_preference_breaks_ties():
+    pytest.importorskip("zstandard")
+    previous = ",".join(compression.encodings()) or "off"
+    try:
+        compression.set_encodings("zstd,gzip")
+        assert compression.negotiate("gzip, zstd") == "zstd"
+        assert compression.negotiate("gzip, zstd;q=0.5") == "gzip"
+    finally:
+        compression.set_encodings(previous)
+
+
+def test_unknown_encoding_rejected():
+    with pytest.raises(ValueError):
+        compression.set_encodings("br")
+
+
+def test_large_response_is_compressed(client, bulk_payload, predict_headers, gzip_only):
+    """The body is gzipped, and the audit checksum still covers the uncompressed bytes."""
+    before = response_compression_ratio.labels(encoding="gzip")._sum.get()
+    response = client.post(
+        "/predict", json=bulk_payload, headers={**predict_headers, "Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+    assert response.num_bytes_downloaded * 4 < len(response.content)
+    assert len(response.json()["predictions"]) == 50
+
+    [record] = read_audit_records(AUDIT_LOG_FILE)
+    assert record["response_checksum"] == checksums.digest(
+        response.content, record["response_checksum_alg"]
+    )
+    assert response_compression_ratio.labels(encoding="gzip")._sum.get() > before + 4
+
+
+def test_small_or_unaccepted_responses_are_not(client, predict_payload, bulk_payload,
+                                               predict_headers, gzip_only):
+    response = client.post(
+        "/predict", json=predict_payload, headers={**predict_headers, "Accept-Encoding": "gzip"}
+    )
+    assert len(response.content) < 1024
+    assert "content-encoding" not in response.headers
+
+    response = client.post(
+        "/predict", json=bulk_payload, headers={**predict_headers, "Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in response.headers
+    assert response.num_bytes_downloaded == len(response.content)
+
+
+def test_large_bodies_compress_off_the_event_loop(client, bulk_payload, predict_headers,
+                                                  gzip_only, monkeypatch):
+    threads = []
+    gzip = compression._COMPRESSORS["gzip"]
+
+    def recording_gzip(body):
+        threads.append(threading.current_thread().name)
+        return gzip(body)
+
+    monkeypatch.setitem(compression._COMPRESSORS, "gzip", recording_gzip)
+    headers = {**predict_headers, "Accept-Encoding": "gzip"}
+    client.post("/predict", json=bulk_payload, headers=headers)
+    monkeypatch.setattr(compression, "COMPRESSION_OFFLOAD_BYTES", 1024)
+    client.post("/predict", json=bulk_payload, headers=headers)
+
+    inline, offloaded = threads
+    assert offloaded != inline
+
+
+def test_metrics_endpoint_is_compressed(client, gzip_only):
+    response = client.get("/metrics", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert b"response_compression_ratio" in response.content
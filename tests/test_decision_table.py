@@ -0,0 +1,73 @@
+"""Decision-table scorer matches the interpreted scorer exactly."""
+
+import itertools
+import json
+import math
+
+import pytest
+
+from app.config import BASE_DIR, MODEL_ARTIFACTS_DIR
+from app.models.compiled import CompiledModel
+from app.models.scorer import rule_conditions, rule_thresholds, score_input
+
+ARTIFACTS = [
+    MODEL_ARTIFACTS_DIR / "model_v1.json",
+    MODEL_ARTIFACTS_DIR / "model_v2.json",
+    BASE_DIR / "model_artifacts_old" / "model_v1.json",
+]
+
+
+def _compile(artifact, **kwargs):
+    return CompiledModel.compile(artifact, version="test", checksum="", artifact_path="", **kwargs)
+
+
+@pytest.mark.parametrize("path", ARTIFACTS, ids=lambda p: f"{p.parent.name}/{p.name}")
+def test_table_matches_interpreter_at_every_boundary(path):
+    """Every threshold, its neighbours and odd values score identically."""
+    artifact = json.loads(path.read_text())
+    model = _compile(artifact)
+    assert model.decision_table is not None
+    config = model.config
+
+    prices = [-1.0, 0.0, 9.99, 10, 29.999, 30, 30.0001, 79.99, 80, 500, 500.5, 1000, 1e9]
+    prices += [math.inf, -math.inf]
+    units = [-1, 0, 4, 5, 99, 100, 101, 499, 500, 501, 10**6]
+    channels = ["amazon", "AMAZON", "walmart", "other", "direct", "wholesale", "unknown"]
+    texts = ["plain", "REFUND and growth", "urgent fraud rush", "lawsuit"]
+    for text, price, unit, channel in itertools.product(texts, prices, units, channels):
+        assert model.score(text, price, unit, channel) == score_input(
+            text, price, unit, channel, config
+        )
+
+
+def test_table_respects_size_cap():
+    """Models whose table would exceed the cap fall back to the interpreter."""
+    artifact = json.loads((MODEL_ARTIFACTS_DIR / "model_v2.json").read_text())
+    assert _compile(artifact, decision_table_max_entries=10).decision_table is None
+    assert _compile(artifact, decision_table_max_entries=0).decision_table is None
+    model = _compile(artifact, decision_table_max_entries=10)
+    assert model.score("refund", 100.0, 10, "amazon") == score_input(
+        "refund", 100.0, 10, "amazon", model.config
+    )
+
+
+def test_untabulable_rules_fall_back():
+    """Rules the table cannot represent are scored by the interpreter."""
+    artifact = json.loads((MODEL_ARTIFACTS_DIR / "model_v1.json").read_text())
+    artifact["rule_config"]["price_rules"][0]["if_price_gte"] = "80"
+    model = _compile(artifact)
+    assert model.decision_table is None
+
+
+def test_rule_conditions_parse_both_formats():
+    """One parser serves the table, warm-up and the binary converter."""
+    assert rule_conditions({"condition": "units >= 100"}, "units") == [(">=", 100)]
+    assert rule_conditions({"condition": "price < 9.5"}, "price") == [("<", 9.5)]
+    assert rule_conditions({"condition": "malformed"}, "price") == []
+    assert rule_conditions({"if_price_gte": 80, "if_price_lt": 5}, "price") == [
+        (">=", 80),
+        ("<", 5),
+    ]
+    assert rule_thresholds(
+        [{"condition": "units > 5"}, {"if_units_lte": 2.5}, {"if_units_gte": 5}], "units"
+    ) == [2.5, 5]
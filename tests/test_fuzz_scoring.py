@@ -0,0 +1,33 @@
+"""Differential fuzzing: every scoring engine reproduces score_input exactly."""
+
+import json
+import random
+
+import pytest
+
+from app.config import MODEL_ARTIFACTS_DIR
+from app.models import decision_table
+from app.models.scorer import finalize_score
+from app.tools.fuzz_scoring import check_artifact, random_cases, run_seed
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_engines_match_reference_on_random_configs(seed, tmp_path):
+    """Table, interpreter, batch, binary round-trip and encoder agree on random rules."""
+    cases, mismatches = run_seed(seed, 200, tmp_path)
+    assert cases == 400
+    assert mismatches == []
+
+
+def test_harness_detects_a_diverging_engine(tmp_path, monkeypatch):
+    """A perturbed decision table is reported by every table-backed engine only."""
+    def perturbed(score, thresholds):
+        return finalize_score(score + 1e-3, thresholds)
+
+    monkeypatch.setattr(decision_table, "finalize_score", perturbed)
+    artifact = json.loads((MODEL_ARTIFACTS_DIR / "model_v2.json").read_text())
+    cases = random_cases(random.Random(7), artifact["rule_config"], 50)
+
+    mismatches = check_artifact(artifact, cases, tmp_path)
+    assert mismatches
+    assert {line.split(":")[0] for line in mismatches} == {"table", "batch", "binary"}
@@ -15,3 +15,55 @@ def test_readyz_returns_200_when_model_loaded(client):
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "ready"
+
+
+def test_readiness_gate_hysteresis():
+    """A signal trips above its limit and clears only at the recovery ratio."""
+    from app.observability.readiness import ReadinessGate
+
+    gate = ReadinessGate({"in_flight": 10, "log_queue": 0}, recovery_ratio=0.5)
+    assert gate.limits == {"in_flight": 10}
+    assert gate.check({"in_flight": 10, "log_queue": 10**6}) == {}
+    assert gate.check({"in_flight": 11}) == {"in_flight": {"value": 11, "limit": 10}}
+    assert "in_flight" in gate.check({"in_flight": 8})
+    assert gate.check({"in_flight": 5}) == {}
+
+
+def test_readyz_reports_load_reasons(client, monkeypatch):
+    """Over a load limit /readyz answers 503 with the signal and its limit."""
+    from app.observability.loop_monitor import LoopMonitor
+    from app.observability.readiness import ReadinessGate
+    from app.routes import health
+
+    monitor = LoopMonitor()
+    monkeypatch.setattr(health, "_monitor", monitor)
+    monkeypatch.setattr(health, "_gate", ReadinessGate({"in_flight": 4, "loop_lag_ms": 50}))
+
+    monitor.in_flight, monitor.recent_lag_s = 3, 0.2
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json() == {
+        "status": "not_ready",
+        "reasons": {"loop_lag_ms": {"value": 200.0, "limit": 50}},
+    }
+
+    monitor.in_flight, monitor.recent_lag_s = 7, 0.045
+    assert client.get("/readyz").json()["reasons"] == {
+        "in_flight": {"value": 6, "limit": 4},
+        "loop_lag_ms": {"value": 45.0, "limit": 50},
+    }
+
+    monitor.in_flight, monitor.recent_lag_s = 2, 0.0
+    assert client.get("/readyz").status_code == 200
+
+
+def test_readyz_during_reload(client, monkeypatch):
+    """Optionally, a replica compiling a reload is taken out of rotation."""
+    from app.routes import health
+
+    monkeypatch.setattr(health, "READY_UNREADY_WHILE_RELOADING", True)
+    with health._registry._reload_lock:
+        response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["reasons"] == {"model_reload": {}}
+    assert client.get("/readyz").status_code == 200
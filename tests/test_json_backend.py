@@ -0,0 +1,60 @@
+"""JSON backends produce the exact bytes the checksums rely on."""
+
+import json
+import random
+
+import pytest
+
+from app import json_backend
+from app.models.schemas import Prediction
+
+BACKENDS = ["json"] + (["orjson"] if json_backend.orjson is not None else [])
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    previous = json_backend.backend()
+    yield json_backend.set_backend(request.param)
+    json_backend.set_backend(previous)
+
+
+def _random_text(rnd):
+    pools = [(0, 0x80), (0x80, 0x800), (0x800, 0xD800), (0xE000, 0x110000)]
+    return "".join(
+        chr(rnd.randrange(*rnd.choice(pools))) for _ in range(rnd.randrange(0, 16))
+    )
+
+
+def test_audit_record_bytes_match_stdlib(backend):
+    """Audit records encode exactly as json.dumps with compact separators."""
+    rnd = random.Random(3)
+    records = [
+        {"request_id": "r-1", "num_inputs": 3, "guardrails_triggered": [], "status": "success"},
+        {"request_id": "café", "latency_ms": 2, "ok": True, "missing": None},
+        {"request_id": "del\x7f", "guardrails_triggered": ["policy_block"]},
+        {"latency_us": 1.5e-05, "big": 2**70},
+    ]
+    records += [{"request_id": _random_text(rnd), "n": rnd.randrange(10**6)} for _ in range(500)]
+    for record in records:
+        assert json_backend.dumps_record(record) == json.dumps(record, separators=(",", ":"))
+
+
+def test_string_literals_match_pydantic(backend):
+    """Response string literals match pydantic's escaping."""
+    rnd = random.Random(5)
+    for _ in range(500):
+        text = _random_text(rnd)
+        expected = Prediction(id=text, label="", score=0.0, reasons=[]).model_dump_json()
+        assert expected.startswith('{"id":' + json_backend.dumps_str(text) + ",")
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        json_backend.set_backend("simdjson")
+
+
+def test_responses_use_fast_response_class(client):
+    """Non-predict endpoints render through the backend's response class."""
+    response = client.get("/healthz")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
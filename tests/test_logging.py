@@ -0,0 +1,72 @@
+"""Queued structured logging: drop policy, shutdown flush and sampling."""
+
+import io
+import queue
+import json
+import logging
+
+from app.observability.logging import (
+    BoundedQueueHandler,
+    RedactingFormatter,
+    SampleFilter,
+    start_log_pipeline,
+)
+from app.observability.metrics import logs_dropped_total
+
+
+def _logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def test_full_queue_drops_and_counts():
+    """With the drop policy a full queue discards records instead of blocking."""
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), block=False)
+    logger = _logger("test.logging.drop", handler)
+    before = logs_dropped_total.labels(reason="queue_full")._value.get()
+
+    logger.info("first")
+    logger.info("second")
+    logger.info("third")
+
+    assert handler.queue.qsize() == 1
+    assert logs_dropped_total.labels(reason="queue_full")._value.get() == before + 2
+
+
+def test_listener_formats_redacts_and_flushes_on_stop():
+    """Records are formatted on the listener thread and all written by stop()."""
+    stream = io.StringIO()
+    target = logging.StreamHandler(stream)
+    target.setFormatter(RedactingFormatter(fmt="%(name)s %(levelname)s %(message)s"))
+    handler, listener = start_log_pipeline(target, queue_size=1000, block=True)
+    logger = _logger("test.logging.flush", handler)
+
+    for i in range(200):
+        logger.info("Served %s", "user@example.com", extra={"seq": i})
+    listener.stop()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["seq"] for line in lines] == list(range(200))
+    assert all("user@example.com" not in line["message"] for line in lines)
+
+
+def test_prediction_line_sampling():
+    """SampleFilter only thins out the configured message."""
+    records = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            records.append(record.getMessage())
+
+    logger = _logger("test.logging.sample", Collect())
+    logger.addFilter(SampleFilter("Prediction served", 0.0))
+    before = logs_dropped_total.labels(reason="sampled")._value.get()
+
+    logger.info("Prediction served")
+    logger.info("Model reloaded")
+
+    assert records == ["Model reloaded"]
+    assert logs_dropped_total.labels(reason="sampled")._value.get() == before + 1
@@ -0,0 +1,48 @@
+"""Event-loop lag monitor and stall watchdog."""
+
+import asyncio
+import logging
+import time
+
+from prometheus_client import REGISTRY
+
+from app.observability.loop_monitor import LoopMonitor
+
+
+def _sample(name, labels=None):
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+def _block_the_loop(seconds):
+    time.sleep(seconds)
+
+
+def test_blocking_call_shows_as_lag_and_logs_its_stack(caplog):
+    """A synchronous sleep on the loop is measured and its stack logged once."""
+    lag_before = _sample("event_loop_lag_seconds_sum")
+    stalls_before = _sample("event_loop_stalls_total")
+
+    async def main():
+        monitor = LoopMonitor(interval_s=0.01, stall_threshold_s=0.05)
+        monitor.start()
+        await asyncio.sleep(0.03)
+        _block_the_loop(0.3)
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+    with caplog.at_level(logging.WARNING, logger="app.observability.loop_monitor"):
+        asyncio.run(main())
+
+    assert _sample("event_loop_lag_seconds_sum") - lag_before >= 0.2
+    assert _sample("event_loop_stalls_total") - stalls_before == 1
+    [stall] = [r for r in caplog.records if r.getMessage() == "Event loop stalled"]
+    assert "_block_the_loop" in stall.stack
+    assert stall.stalled_ms >= 50
+
+
+def test_in_flight_and_threadpool_gauges(client):
+    """In-flight requests are read at scrape time; thread usage is sampled."""
+    response = client.get("/metrics")
+    # The scrape itself is the one request in flight
+    assert "http_requests_in_flight 1.0" in response.text
+    assert "threadpool_waiting_tasks" in response.text
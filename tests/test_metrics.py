@@ -55,3 +55,16 @@ def test_metrics_contain_all_required_counters(client, predict_payload, predict_
     ]
     for metric_name in required_metrics:
         assert metric_name in text, f"Missing required metric: {metric_name}"
+
+
+def test_latency_buckets_resolve_microseconds(client, predict_payload, predict_headers):
+    """Latency histograms start at 10 us with 1-2-5 steps per decade."""
+    from app.observability.metrics import LATENCY_BUCKETS_MS, log_linear_buckets
+
+    assert log_linear_buckets(0.01, 1) == (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+    assert LATENCY_BUCKETS_MS[0] == 0.01 and LATENCY_BUCKETS_MS[-1] == 10_000
+
+    client.post("/predict", json=predict_payload, headers=predict_headers)
+    text = client.get("/metrics").text
+    assert 'http_request_latency_ms_bucket{le="0.01",route="/predict"}' in text
+    assert 'predict_version_latency_ms_bucket{le="0.05",model_version=' in text
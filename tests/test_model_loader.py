@@ -0,0 +1,120 @@
+"""Model registry: compiled models, warm-up and atomic publishing."""
+
+import asyncio
+import shutil
+
+import pytest
+
+from app.config import MODEL_ARTIFACTS_DIR
+from app.models import loader
+from app.models.compiled import CompiledModel
+from app.models.loader import ModelRegistry
+from app.models.warmup import build_warmup_inputs
+
+
+@pytest.fixture()
+def artifacts_dir(tmp_path):
+    """A private copy of the model artifacts."""
+    target = tmp_path / "artifacts"
+    shutil.copytree(MODEL_ARTIFACTS_DIR, target)
+    return target
+
+
+def test_registry_publishes_compiled_model(artifacts_dir):
+    """load() exposes one compiled snapshot consistent with the legacy attributes."""
+    registry = ModelRegistry(artifacts_dir)
+    registry.load()
+    compiled = registry.compiled
+    assert registry.is_loaded
+    assert compiled.version == registry.active_version == "2.0.0"
+    assert compiled.checksum == registry.checksums["model_v2.json"]
+    assert compiled.score("refund please", 100.0, 10, "amazon")[1] == "high_risk"
+
+
+def test_checksum_mismatch_rejected(artifacts_dir):
+    """A tampered artifact fails to load and nothing is published."""
+    artifact = artifacts_dir / "model_v2.json"
+    artifact.write_text(artifact.read_text().replace("0.12", "0.13", 1))
+    registry = ModelRegistry(artifacts_dir)
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        registry.load()
+    assert not registry.is_loaded
+    assert registry.compiled is None
+
+
+def test_warmup_runs_before_publish(artifacts_dir, monkeypatch):
+    """The registry is not ready until the warm-up pass has finished."""
+    seen = []
+
+    def fake_warmup(model, rounds):
+        seen.append((model.version, rounds, registry.is_loaded))
+        return 0.0
+
+    monkeypatch.setattr(loader, "run_warmup", fake_warmup)
+    registry = ModelRegistry(artifacts_dir, warmup_rounds=2)
+    registry.load()
+    assert seen == [("2.0.0", 2, False)]
+    assert registry.is_loaded
+
+
+@pytest.mark.parametrize("artifact_file", ["model_v1.json", "model_v2.json"])
+def test_warmup_inputs_cover_every_rule(artifact_file):
+    """Warm-up inputs trigger every reason and label the artifact can produce."""
+    artifact, _, _ = loader.read_artifact(MODEL_ARTIFACTS_DIR / artifact_file)
+    config = artifact["rule_config"]
+    model = CompiledModel.compile(
+        artifact, version=artifact["model_version"], checksum="", artifact_path=""
+    )
+    reasons = set()
+    for text, price, units, channel in build_warmup_inputs(config):
+        reasons.update(model.score(text, price, units, channel)[2])
+
+    expected = {f"channel_{c}" for c, w in config["channel_weights"].items() if w}
+    for key in ("price_rules", "units_rules", "text_rules"):
+        expected.update(rule["reason"] for rule in config[key])
+    assert reasons == expected
+
+
+def test_warmup_inputs_reach_closely_spaced_thresholds():
+    """Cells narrower than one unit between thresholds still get a warm-up input."""
+    config = {
+        "base_score": 0.0,
+        "channel_weights": {},
+        "price_rules": [
+            {"if_price_lte": 0.1, "add": 0.1, "reason": "tiny"},
+            {"if_price_lt": 0.5, "add": 0.2, "reason": "small"},
+            {"if_price_gte": 0.5, "add": 0.3, "reason": "regular"},
+        ],
+        "units_rules": [
+            {"if_units_lt": 1, "add": 0.1, "reason": "none"},
+            {"if_units_lte": 1, "add": 0.2, "reason": "single"},
+        ],
+        "text_rules": [],
+        "thresholds": {"low_risk_max": 0.3, "medium_risk_max": 0.6},
+    }
+    model = CompiledModel.compile(
+        {"rule_config": config}, version="test", checksum="", artifact_path=""
+    )
+    reasons = set()
+    for text, price, units, channel in build_warmup_inputs(config):
+        reasons.update(model.score(text, price, units, channel)[2])
+    assert reasons == {"tiny", "small", "regular", "none", "single"}
+
+
+def test_reload_endpoint_compiles_off_the_event_loop(client, monkeypatch):
+    """POST /model/reload runs the registry reload in a worker thread."""
+    from app.main import registry
+
+    calls = []
+
+    def fake_reload():
+        try:
+            asyncio.get_running_loop()
+            calls.append("event loop")
+        except RuntimeError:
+            calls.append("worker thread")
+
+    monkeypatch.setattr(registry, "reload", fake_reload)
+    response = client.post("/model/reload")
+    assert response.status_code == 200
+    assert calls == ["worker thread"]
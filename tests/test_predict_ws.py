@@ -0,0 +1,78 @@
+"""WebSocket scoring channel /predict/ws."""
+
+import json
+import time
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.config import AUDIT_LOG_FILE
+from app.observability.audit import read_audit_records
+
+
+def _item(item_id, text="Normal transaction for review"):
+    features = {"price": 250.0, "units": 10, "channel": "amazon"}
+    return {"id": item_id, "text": text, "features": features}
+
+
+def _ws_audit_records(count):
+    """/predict/ws audit records, once the server has flushed ``count`` of them."""
+    deadline = time.monotonic() + 2
+    while True:
+        records = [r for r in read_audit_records(AUDIT_LOG_FILE) if r["route"] == "/predict/ws"]
+        if len(records) >= count or time.monotonic() > deadline:
+            return records
+        time.sleep(0.01)
+
+
+def test_ws_matches_http_predictions(client, predict_payload, predict_headers):
+    """Pipelined messages get in-order replies with the same scores as /predict."""
+    expected = client.post("/predict", json=predict_payload, headers=predict_headers).json()
+    [prediction] = expected["predictions"]
+
+    with client.websocket_connect("/predict/ws", headers=predict_headers) as ws:
+        for i in range(3):
+            ws.send_text(json.dumps(_item(f"m{i}")))
+        replies = [ws.receive_json() for _ in range(3)]
+
+    assert [r["id"] for r in replies] == ["m0", "m1", "m2"]
+    for reply in replies:
+        assert reply["label"] == prediction["label"]
+        assert reply["score"] == prediction["score"]
+        assert reply["reasons"] == prediction["reasons"]
+        assert reply["model_version"] == expected["model"]["model_version"]
+
+    # Audit records are flushed in one batch at the latest on close
+    records = _ws_audit_records(3)
+    assert [r["request_id"].rsplit(":", 1)[1] for r in records] == ["m0", "m1", "m2"]
+    assert {r["status"] for r in records} == {"success"}
+    assert records[0]["user_hash"] == json.loads(AUDIT_LOG_FILE.read_text().split("\n")[0])["user_hash"]
+
+
+def test_ws_errors_keep_the_connection(client, predict_headers):
+    """Invalid and blocked messages get an error reply; the connection stays usable."""
+    with client.websocket_connect("/predict/ws", headers=predict_headers) as ws:
+        ws.send_text(json.dumps({"id": "bad", "text": "   "}))
+        assert ws.receive_json() == {
+            "id": "bad",
+            "error": "invalid_input",
+            "detail": "text: Value error, text must be non-empty",
+        }
+        ws.send_text("not json")
+        reply = ws.receive_json()
+        assert (reply["id"], reply["error"]) == (None, "invalid_input")
+        ws.send_text(json.dumps(_item("blocked", "Attempt to exfiltrate data")))
+        assert ws.receive_json()["error"] == "policy_block"
+        ws.send_text(json.dumps(_item("ok")))
+        assert ws.receive_json()["label"]
+
+    statuses = {r["request_id"].rsplit(":", 1)[1]: r["status"] for r in _ws_audit_records(2)}
+    assert statuses == {"blocked": "blocked", "ok": "success"}
+
+
+def test_ws_requires_identity(client):
+    """Without X-User-Email the handshake is refused with a policy violation."""
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect("/predict/ws") as ws:
+            ws.receive_text()
+    assert exc.value.code == 1008
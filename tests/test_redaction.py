@@ -3,7 +3,7 @@
 import json
 
 from app.config import AUDIT_LOG_FILE
-from app.guardrails.identity import hash_email
+from app.guardrails.identity import IdentityHasher, hash_email
 from app.guardrails.redaction import redact_pii
 
 
@@ -32,6 +32,33 @@ def test_email_hash_case_insensitive():
     assert h2 == h3
 
 
+def test_identity_cache_is_bounded_and_consistent():
+    """Cached hashes match fresh hashes and the cache never exceeds maxsize."""
+    hasher = IdentityHasher(maxsize=2)
+    variants = ["User@Example.COM", "user@example.com", "  user@example.com  "]
+    digests = {hasher.hash(v) for v in variants + variants}
+    assert digests == {hash_email("user@example.com")}
+    assert len(hasher) == 2
+
+
+def test_identity_cache_statistics():
+    """Repeated headers are served from the cache and counted as hits."""
+    hasher = IdentityHasher()
+    for _ in range(3):
+        hasher.hash("user@example.com")
+    info = hasher.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+
+
+def test_identity_hmac_mode():
+    """Keyed hashing differs from plain SHA-256 and depends on the secret."""
+    plain = IdentityHasher().hash("user@example.com")
+    keyed = IdentityHasher(secret="s3cret").hash(" USER@example.com")
+    assert keyed != plain
+    assert keyed == IdentityHasher(secret="s3cret").hash("user@example.com")
+    assert keyed != IdentityHasher(secret="other").hash("user@example.com")
+
+
 def test_audit_log_contains_no_raw_email(
     client, predict_payload, predict_headers
 ):
@@ -0,0 +1,75 @@
+"""Traffic capture and open-loop replay."""
+
+import asyncio
+import json
+
+import httpx
+
+from app.observability.capture import TrafficCapture
+from app.routes import predict as predict_route
+from app.tools.replay import diff_labels, load_capture, percentile, replay, schedule
+
+
+def test_capture_records_redacted_inputs_and_labels(client, predict_headers, monkeypatch, tmp_path):
+    """Sampled requests are captured with redacted text, timing and labels."""
+    capture_file = tmp_path / "capture.jsonl"
+    monkeypatch.setattr(predict_route, "_capture", TrafficCapture(capture_file))
+    payload = {
+        "request_id": "cap-1",
+        "inputs": [
+            {"id": "a", "text": "ping alice@example.com about the order"},
+            {"id": "b", "text": "bulk order", "features": {"price": 900.0, "units": 80, "channel": "amazon"}},
+        ],
+    }
+    response = client.post("/predict", json=payload, headers=predict_headers)
+    assert response.status_code == 200
+
+    (record,) = load_capture(capture_file)
+    assert record["request_id"] == "cap-1"
+    assert record["status"] == "success"
+    assert "alice@example.com" not in record["inputs"][0]["text"]
+    assert record["inputs"][1]["features"]["units"] == 80
+    assert record["labels"] == [p["label"] for p in response.json()["predictions"]]
+
+
+def test_capture_sampling_off(client, predict_payload, predict_headers, monkeypatch, tmp_path):
+    """A zero sample rate records nothing."""
+    capture_file = tmp_path / "capture.jsonl"
+    monkeypatch.setattr(predict_route, "_capture", TrafficCapture(capture_file, sample_rate=0.0))
+    assert client.post("/predict", json=predict_payload, headers=predict_headers).status_code == 200
+    assert not capture_file.exists()
+
+
+def test_schedule_and_percentile():
+    """Offsets follow the captured arrival gaps scaled by speed; max sends at once."""
+    records = [{"t": 100.0}, {"t": 100.5}, {"t": 102.0}]
+    assert schedule(records, 1.0) == [0.0, 0.5, 2.0]
+    assert schedule(records, 2.0) == [0.0, 0.25, 1.0]
+    assert schedule(records, None) == [0.0, 0.0, 0.0]
+    assert percentile([5.0, 1.0, 3.0, 2.0, 4.0], 50) == 3.0
+    assert percentile([float(i) for i in range(1, 101)], 99) == 99.0
+
+
+def test_replay_reports_label_diffs(client, predict_payload, predict_headers, monkeypatch, tmp_path):
+    """Replaying a capture reproduces its labels; a changed label shows up as a diff."""
+    from app.main import app
+
+    capture_file = tmp_path / "capture.jsonl"
+    monkeypatch.setattr(predict_route, "_capture", TrafficCapture(capture_file))
+    for i in range(3):
+        client.post("/predict", json=dict(predict_payload, request_id=f"r-{i}"), headers=predict_headers)
+    monkeypatch.setattr(predict_route, "_capture", None)
+
+    records = load_capture(capture_file)
+    records[2]["labels"] = ["not-a-label"]
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            return await replay(ac, records, speed=None)
+
+    results = asyncio.run(main())
+    assert [r.status_code for r in results] == [200, 200, 200]
+    assert all(r.response_ms >= r.service_ms for r in results)
+    assert diff_labels(results) == [f"r-2/item-1: not-a-label -> {results[2].labels[0]}"]
+    assert json.loads(capture_file.read_text().splitlines()[0])["user_hash"]
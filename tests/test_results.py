@@ -0,0 +1,87 @@
+"""Interned reason codes and the final response encoder."""
+
+import json
+
+import pytest
+
+from app.config import BASE_DIR, MODEL_ARTIFACTS_DIR
+from app.models.compiled import CompiledModel
+from app.models.results import ScoredItem, encode_predict_response, json_float
+from app.models.schemas import ModelBlock, Prediction, PredictResponse
+from app.models.scorer import score_input
+from app.models.warmup import build_warmup_inputs
+
+ARTIFACTS = [
+    MODEL_ARTIFACTS_DIR / "model_v1.json",
+    MODEL_ARTIFACTS_DIR / "model_v2.json",
+    BASE_DIR / "model_artifacts_old" / "model_v1.json",
+]
+
+
+def _compile(path, **kwargs):
+    artifact = json.loads(path.read_text())
+    return CompiledModel.compile(
+        artifact, version="1.0.0", checksum="ab" * 32, artifact_path="", **kwargs
+    )
+
+
+@pytest.mark.parametrize("table", [True, False], ids=["table", "interpreted"])
+@pytest.mark.parametrize("path", ARTIFACTS, ids=lambda p: f"{p.parent.name}/{p.name}")
+def test_reason_codes_match_reference_scorer(path, table):
+    """Codes decode to exactly the reasons the reference scorer emits."""
+    model = _compile(path, decision_table_max_entries=65536 if table else 0)
+    for text, price, units, channel in build_warmup_inputs(model.config):
+        score, label, codes = model.score_codes(text, price, units, channel)
+        assert (score, label, [model.reasons[c] for c in codes]) == score_input(
+            text, price, units, channel, model.config
+        )
+
+
+@pytest.mark.parametrize("path", ARTIFACTS, ids=lambda p: f"{p.parent.name}/{p.name}")
+def test_encoder_matches_pydantic_bytes(path):
+    """The encoded body is byte-identical to PredictResponse.model_dump_json()."""
+    model = _compile(path)
+    inputs = build_warmup_inputs(model.config)
+    ids = [f"item-{i}-ü\"\\\n " for i in range(len(inputs))]
+    items = [
+        ScoredItem(item_id, *outcome) for item_id, outcome in zip(ids, model.score_batch(inputs))
+    ]
+    expected = PredictResponse(
+        request_id="req/é\t1",
+        model=ModelBlock(model_version=model.version, artifact_checksum_sha256=model.checksum),
+        predictions=[
+            Prediction(
+                id=item.id,
+                label=item.label,
+                score=item.score,
+                reasons=[model.reasons[c] for c in item.reason_codes],
+            )
+            for item in items
+        ],
+        guardrails_triggered=["secret_scan"],
+        latency_ms=12,
+    ).model_dump_json()
+    body = encode_predict_response(
+        request_id="req/é\t1",
+        model=model,
+        items=items,
+        guardrails_triggered=["secret_scan"],
+        latency_ms=12,
+    )
+    assert body == expected.encode()
+
+
+@pytest.mark.parametrize(
+    "value",
+    [0.0, -0.0, 1.0, 0.5, 1e-4, 1e-5, 1.5e-5, -2.5e-5, 1e-6, 3e-7, 1e15, 1e16, 1.5e20, 0.1 + 0.2],
+)
+def test_json_float_matches_pydantic(value):
+    """Float formatting follows pydantic around the scientific-notation cut-offs."""
+    expected = Prediction(id="", label="", score=value, reasons=[]).model_dump_json()
+    assert f'"score":{json_float(value)},' in expected
+
+
+def test_scored_item_is_compact():
+    """Scored items carry no per-instance dict."""
+    item = ScoredItem("a", 0.5, "low_risk", ())
+    assert not hasattr(item, "__dict__")
@@ -0,0 +1,96 @@
+"""Canary traffic splits: sticky, weighted routing between model versions."""
+
+import json
+import shutil
+
+import pytest
+
+from app.config import AUDIT_LOG_FILE, MODEL_ARTIFACTS_DIR
+from app.guardrails.identity import hash_email
+from app.models.loader import ModelRegistry
+from app.models.routing import BUCKETS, bucket_counts, parse_traffic_split
+from app.observability.metrics import predict_version_requests_total
+from app.routes import predict as predict_route
+
+
+def _registry(tmp_path, split):
+    target = tmp_path / "artifacts"
+    shutil.copytree(MODEL_ARTIFACTS_DIR, target)
+    manifest_path = target / "model_manifest.json"
+    manifest = json.loads(manifest_path.read_text())
+    manifest["active_model_version"] = "1.0.0"
+    manifest["traffic_split"] = split
+    manifest_path.write_text(json.dumps(manifest))
+    registry = ModelRegistry(target)
+    registry.load()
+    return registry
+
+
+def _set_split(registry, split):
+    manifest_path = registry.artifacts_dir / "model_manifest.json"
+    manifest = json.loads(manifest_path.read_text())
+    manifest["traffic_split"] = split
+    manifest_path.write_text(json.dumps(manifest))
+    registry.reload()
+
+
+def test_bucket_counts_follow_weights():
+    """Weights are spread over all buckets in proportion."""
+    assert bucket_counts({"1.0.0": 95, "2.0.0": 5}) == {"1.0.0": 9500, "2.0.0": 500}
+    counts = bucket_counts({"a": 1, "b": 1, "c": 1})
+    assert sum(counts.values()) == BUCKETS
+    assert max(counts.values()) - min(counts.values()) <= 1
+
+
+@pytest.mark.parametrize(
+    "split, message",
+    [
+        ({"9.9.9": 100}, "not found"),
+        ({"1.0.0": -1}, "Invalid traffic_split weight"),
+        ({"2.0.0": 100}, "must be part of traffic_split"),
+        ({"1.0.0": 0}, "must not all be zero"),
+    ],
+)
+def test_invalid_splits_rejected(split, message):
+    """Unknown versions, bad weights and splits without the active version fail to load."""
+    manifest = {"active_model_version": "1.0.0", "traffic_split": split}
+    with pytest.raises(ValueError, match=message):
+        parse_traffic_split(manifest, ["1.0.0", "2.0.0"])
+
+
+def test_routing_is_weighted_and_sticky(tmp_path):
+    """Users are split by weight, keep their version, and keep it as the canary grows."""
+    registry = _registry(tmp_path, {"1.0.0": 95, "2.0.0": 5})
+    hashes = [hash_email(f"user{i}@example.com") for i in range(4000)]
+    first = {h: registry.route(h).version for h in hashes}
+    canary = {h for h, version in first.items() if version == "2.0.0"}
+    assert 120 < len(canary) < 280
+    assert all(registry.route(h).version == first[h] for h in hashes)
+
+    _set_split(registry, {"1.0.0": 80, "2.0.0": 20})
+    grown = {h for h in hashes if registry.route(h).version == "2.0.0"}
+    assert canary < grown
+    assert registry.active_version == "1.0.0"
+
+
+def test_predict_reports_routed_version(client, predict_payload, monkeypatch, tmp_path):
+    """Responses, audit records and per-version metrics name the version that served the user."""
+    registry = _registry(tmp_path, {"1.0.0": 50, "2.0.0": 50})
+    monkeypatch.setattr(predict_route, "_registry", registry)
+    emails = [f"user{i}@example.com" for i in range(20)]
+    expected = {email: registry.route(hash_email(email)).version for email in emails}
+    assert set(expected.values()) == {"1.0.0", "2.0.0"}
+    before = predict_version_requests_total.labels(model_version="2.0.0")._value.get()
+
+    served = {}
+    for email in emails:
+        response = client.post("/predict", json=predict_payload, headers={"X-User-Email": email})
+        assert response.status_code == 200
+        served[email] = response.json()["model"]["model_version"]
+
+    assert served == expected
+    records = [json.loads(line) for line in AUDIT_LOG_FILE.read_text().splitlines()]
+    assert [r["model_version"] for r in records] == [expected[e] for e in emails]
+    canary_requests = sum(1 for v in expected.values() if v == "2.0.0")
+    after = predict_version_requests_total.labels(model_version="2.0.0")._value.get()
+    assert after == before + canary_requests
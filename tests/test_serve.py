@@ -0,0 +1,121 @@
+"""Pre-fork launcher: workers, coordinated reload, respawn and shutdown."""
+
+import json
+import os
+import select
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+
+
+def _wait_for_log(process, message, timeout=15.0):
+    """The first JSON log line of ``process`` with this message."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        ready, _, _ = select.select([process.stdout], [], [], 0.1)
+        if not ready:
+            continue
+        line = process.stdout.readline()
+        if not line:
+            break
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if record.get("message") == message:
+            return record
+    raise AssertionError(f"launcher did not log {message!r}")
+
+
+def _post(url):
+    request = urllib.request.Request(url, method="POST")
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.loads(response.read())
+
+
+def _reload_until(base, predicate, timeout=10.0):
+    """Reload until the per-worker outcome satisfies ``predicate``."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            result = _post(f"{base}/model/reload")
+        except urllib.error.HTTPError:
+            # 500 while the killed worker is still counted: "worker exited"
+            result = None
+        if result is not None and predicate(result["workers"]):
+            return result
+        assert time.monotonic() < deadline, "workers did not recover"
+        time.sleep(0.2)
+
+
+@pytest.fixture
+def launcher(tmp_path):
+    env = {**os.environ, "AUDIT_LOG_DIR": str(tmp_path), "AUDIT_SHARDING": "1"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--host", "127.0.0.1", "--port", "0", "--workers", "2"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env=env,
+        text=True,
+    )
+    try:
+        ready = _wait_for_log(process, "Launcher ready")
+        for _ in range(2):
+            _wait_for_log(process, "Application startup complete.")
+        yield process, f"http://127.0.0.1:{ready['port']}"
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+def test_reload_reaches_every_worker_and_dead_workers_are_replaced(launcher):
+    process, base = launcher
+    result = _post(f"{base}/model/reload")
+    assert result["status"] == "reloaded"
+    workers = result["workers"]
+    assert len(workers) == 2
+    assert {outcome["model_version"] for outcome in workers.values()} == {result["model_version"]}
+
+    # A killed worker is forked again and takes part in the next reload
+    victim = int(next(iter(workers)))
+    os.kill(victim, signal.SIGKILL)
+    result = _reload_until(
+        base, lambda current: len(current) == 2 and str(victim) not in current
+    )
+    assert len(result["workers"]) == 2
+    assert str(victim) not in result["workers"]
+
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=15) == 0
+
+
+def test_malformed_control_message_is_skipped():
+    """A bad line on a worker's channel is logged and the next one still handled."""
+    from app.serve import Launcher, _Reload, _Worker
+
+    launcher = Launcher("127.0.0.1", 0, workers=1)
+    ours, theirs = socket.socketpair()
+    try:
+        worker = _Worker(slot=0, pid=4242, channel=ours)
+        launcher._selector.register(ours, selectors.EVENT_READ, worker)
+        launcher._reloads[1] = _Reload(None, {4242}, time.monotonic() + 30)
+        reply = {"op": "reloaded", "id": 1, "model_version": "v1"}
+        theirs.sendall(b"not json\n" + json.dumps(reply).encode() + b"\n")
+        launcher._read(worker)
+        assert launcher._reloads[1].results == {"4242": {"model_version": "v1"}}
+        assert not launcher._reloads[1].waiting
+    finally:
+        launcher._selector.close()
+        launcher.sock.close()
+        ours.close()
+        theirs.close()
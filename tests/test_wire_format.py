@@ -0,0 +1,107 @@
+"""MessagePack negotiation on /predict."""
+
+import json
+
+import pytest
+
+from app import checksums, wire_format
+from app.config import AUDIT_LOG_FILE
+from app.observability.audit import read_audit_records
+
+
+def test_json_without_msgpack(client, predict_payload, predict_headers, monkeypatch):
+    """Without msgpack installed JSON is always served and MessagePack bodies get 415."""
+    monkeypatch.setattr(wire_format, "msgpack", None)
+    response = client.post(
+        "/predict",
+        json=predict_payload,
+        headers={**predict_headers, "Accept": wire_format.MSGPACK},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+
+    response = client.post(
+        "/predict",
+        content=b"\x80",
+        headers={**predict_headers, "Content-Type": wire_format.MSGPACK},
+    )
+    assert response.status_code == 415
+
+
+def test_accept_negotiation():
+    pytest.importorskip("msgpack")
+    assert wire_format.negotiate("") == wire_format.JSON
+    assert wire_format.negotiate("*/*") == wire_format.JSON
+    assert wire_format.negotiate("application/msgpack") == wire_format.MSGPACK
+    assert wire_format.negotiate("application/x-msgpack, */*;q=0.1") == wire_format.MSGPACK
+    assert wire_format.negotiate("application/msgpack, application/json") == wire_format.MSGPACK
+    assert wire_format.negotiate("application/json, application/msgpack") == wire_format.JSON
+    assert wire_format.negotiate("application/msgpack;q=0.5, */*") == wire_format.JSON
+    assert wire_format.negotiate("application/msgpack;q=0, */*") == wire_format.JSON
+    assert wire_format.negotiate("text/html") == wire_format.JSON
+
+
+def test_msgpack_round_trip_matches_json(client, predict_payload, predict_headers):
+    """A MessagePack request and response carry exactly what the JSON path does."""
+    msgpack = pytest.importorskip("msgpack")
+    predict_payload["inputs"].append(
+        {"id": "item-2", "text": "Bulk order", "features": {"price": 12.5, "units": 400}}
+    )
+    json_response = client.post("/predict", json=predict_payload, headers=predict_headers)
+    packed_response = client.post(
+        "/predict",
+        content=msgpack.packb(predict_payload),
+        headers={
+            **predict_headers,
+            "Content-Type": wire_format.MSGPACK,
+            "Accept": wire_format.MSGPACK,
+        },
+    )
+    assert packed_response.status_code == 200
+    assert packed_response.headers["content-type"] == wire_format.MSGPACK
+    expected = json_response.json()
+    unpacked = msgpack.unpackb(packed_response.content)
+    expected.pop("latency_ms")
+    assert unpacked.pop("latency_ms") >= 0
+    assert unpacked == expected
+    assert list(unpacked) == list(expected)
+    assert len(packed_response.content) < len(json_response.content)
+
+    # The audit checksum covers the bytes that were sent, in the recorded format
+    json_record, packed_record = read_audit_records(AUDIT_LOG_FILE)
+    assert json_record["response_format"] == wire_format.JSON
+    assert packed_record["response_format"] == wire_format.MSGPACK
+    for record, response in ((json_record, json_response), (packed_record, packed_response)):
+        assert record["response_checksum"] == checksums.digest(
+            response.content, record["response_checksum_alg"]
+        )
+
+
+def test_msgpack_request_with_json_response(client, predict_payload, predict_headers):
+    msgpack = pytest.importorskip("msgpack")
+    response = client.post(
+        "/predict",
+        content=msgpack.packb(predict_payload),
+        headers={**predict_headers, "Content-Type": "application/x-msgpack"},
+    )
+    assert response.status_code == 200
+    assert response.json()["request_id"] == predict_payload["request_id"]
+
+
+def test_invalid_msgpack_is_a_validation_error(client, predict_headers):
+    msgpack = pytest.importorskip("msgpack")
+    headers = {**predict_headers, "Content-Type": wire_format.MSGPACK}
+
+    response = client.post("/predict", content=b"\xc1", headers=headers)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "msgpack_invalid"
+
+    response = client.post("/predict", content=msgpack.packb({"inputs": []}), headers=headers)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "inputs"]
+
+
+def test_openapi_lists_both_formats(client):
+    operation = json.loads(client.get("/openapi.json").content)["paths"]["/predict"]["post"]
+    assert set(operation["requestBody"]["content"]) == {wire_format.JSON, wire_format.MSGPACK}
+    assert set(operation["responses"]["200"]["content"]) == {wire_format.JSON, wire_format.MSGPACK}